@@ -17,12 +17,18 @@ Usage:
     python academic_papers_demo.py
 """
 
-import os
+import argparse
 from gemini_tts_example import (
     text_to_speech_multi_speaker,
     create_full_paper_presentation,
+    require_credentials,
 )
 from dialogues import get_dialogue
+from audio_cache import print_cache_stats
+from key_pool import print_key_pool_stats
+from metrics import print_summary_table
+from planner import add_plan_arguments, plan_from_args, script_requests
+from run_manifest import run_demo_jobs
 
 
 def demo_gneiss_web():
@@ -101,26 +107,61 @@ def demo_refined_web():
     print()
 
 
+DEFAULT_MANIFEST = "academic_papers_demo.manifest.json"
+
+
+def demo_jobs():
+    """Return (job_id, demo function, output file, inputs) for every demo, in run order."""
+    return [
+        ("gneiss_web", demo_gneiss_web, "gneiss_web_paper.wav",
+         get_dialogue("academic_papers_demo", "gneiss_web")),
+        ("code_comment_classification", demo_code_comment_classification, "code_comment_paper.wav",
+         get_dialogue("academic_papers_demo", "code_comment_classification")),
+        ("fineweb_datasets", demo_fineweb_datasets, "fineweb_paper.wav",
+         get_dialogue("academic_papers_demo", "fineweb_datasets")),
+        ("datacomp_lm", demo_datacomp_lm, "datacomp_lm_paper.wav",
+         get_dialogue("academic_papers_demo", "datacomp_lm")),
+        ("refined_web", demo_refined_web, "refined_web_paper.wav",
+         get_dialogue("academic_papers_demo", "refined_web")),
+    ]
+
+
 def main():
     """Run academic papers multi-speaker TTS demo."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip demos whose output still matches the run manifest")
+    parser.add_argument("--verify", action="store_true",
+                        help="Check existing WAVs against the run manifest without synthesizing")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST,
+                        help=f"Run manifest path (default: {DEFAULT_MANIFEST})")
+    add_plan_arguments(parser)
+    args = parser.parse_args()
+    
+    if args.verify:
+        run_demo_jobs(demo_jobs(), args.manifest, verify=True)
+        return
+    if args.plan:
+        # Demos run one after another; voices are only known inside each demo
+        plan_from_args(args, [(output, script_requests(inputs)) for _, _, output, inputs in demo_jobs()],
+                       request_concurrency=1)
+        return
+    
     print("🎓 Academic Papers Multi-Speaker TTS Demo")
     print("=" * 60)
     print("Converting research paper presentations to audio...")
     print()
     
     # Check if API key is available
-    if not os.getenv("GEMINI_API_KEY"):
+    try:
+        require_credentials()
+    except ValueError:
         print("❌ Error: GEMINI_API_KEY environment variable not set!")
         print("Please set your API key and try again.")
         return
     
     try:
-        # Run shorter demo versions of each paper
-        demo_gneiss_web()
-        demo_code_comment_classification()
-        demo_fineweb_datasets()
-        demo_datacomp_lm()
-        demo_refined_web()
+        run_demo_jobs(demo_jobs(), args.manifest, resume=args.resume)
         
         print("🎉 Academic paper demos completed!")
         print("\n📂 Generated audio files:")
@@ -147,6 +188,11 @@ def main():
         print("\n📝 Note: This demo uses shortened excerpts.")
         print("To generate full paper presentations, use the complete scripts")
         print("provided in your input with the create_full_paper_presentation() function.")
+        print()
+        print_cache_stats()
+        print_key_pool_stats()
+        print()
+        print_summary_table()
         
     except Exception as e:
         print(f"❌ Error running academic papers demo: {e}")
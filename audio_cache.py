@@ -0,0 +1,211 @@
+"""Content-addressed on-disk cache for synthesized PCM audio.
+
+Entries are keyed by a SHA-256 of (model, prompt text, voice config, output
+format), written atomically, and evicted least-recently-used once the cache
+grows past its size cap.
+
+Environment variables:
+- GEMINI_TTS_CACHE: set to "0" to disable the default cache
+- GEMINI_TTS_CACHE_DIR: cache directory (default: ".tts_cache")
+- GEMINI_TTS_CACHE_MAX_MB: size cap in megabytes (default: 1024)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+
+PCM_FORMAT = "pcm_s16le/24000/1"
+DEFAULT_CACHE_DIR = ".tts_cache"
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+_SUFFIX = ".pcm"
+
+
+def cache_key(model, contents, voices, audio_format=PCM_FORMAT):
+    """
+    Return the content hash identifying one synthesis request.
+
+    Args:
+        model (str): TTS model name
+        contents (str): Full prompt text sent to the model
+        voices (str | tuple): Voice name or ((speaker, voice), ...) tuple
+        audio_format (str): Description of the returned audio encoding
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    if not isinstance(voices, str):
+        voices = [list(pair) for pair in voices]
+    payload = json.dumps([model, contents, voices, audio_format], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """Directory of PCM blobs with atomic writes, LRU eviction and hit/miss stats."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            directory (str): Directory holding the cache entries
+            max_bytes (int): Total size cap; least recently used entries are
+                             evicted once it is exceeded
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._entries())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + _SUFFIX)
+
+    def _entries(self):
+        """Yield (path, size, last_used) for every cache entry."""
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(_SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield path, st.st_size, st.st_mtime
+
+    def __contains__(self, key):
+        """True if a key is cached (without counting a hit or refreshing it)."""
+        return os.path.exists(self._path(key))
+
+    def get(self, key):
+        """
+        Return cached PCM for a key, or None on a miss.
+
+        A hit refreshes the entry's modification time, which is what LRU
+        eviction orders by.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """Store PCM under a key using a temp file + rename, then enforce the size cap."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            previous = os.path.getsize(path)
+        except OSError:
+            previous = 0
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            self.writes += 1
+            self._total_bytes += len(data) - previous
+            over_cap = self._total_bytes > self.max_bytes
+        if over_cap:
+            self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda entry: entry[2])
+            total = sum(size for _, size, _ in entries)
+            for path, size, _ in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self.evictions += 1
+            self._total_bytes = total
+
+    def clear(self):
+        """Delete every entry and reset the size counter."""
+        with self._lock:
+            for path, _, _ in list(self._entries()):
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+            self._total_bytes = 0
+
+    def stats(self):
+        """Return a dict of hit/miss/write/eviction counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+_default_cache_loaded = False
+
+
+def get_default_cache():
+    """Return the process-wide cache configured from the environment, or None if disabled."""
+    global _default_cache, _default_cache_loaded
+    if not _default_cache_loaded:
+        with _default_cache_lock:
+            if not _default_cache_loaded:
+                if os.getenv("GEMINI_TTS_CACHE", "1") != "0":
+                    max_mb = float(os.getenv("GEMINI_TTS_CACHE_MAX_MB", DEFAULT_MAX_BYTES / (1024 * 1024)))
+                    _default_cache = AudioCache(
+                        os.getenv("GEMINI_TTS_CACHE_DIR", DEFAULT_CACHE_DIR),
+                        int(max_mb * 1024 * 1024),
+                    )
+                _default_cache_loaded = True
+    return _default_cache
+
+
+def set_default_cache(cache):
+    """Replace the process-wide cache (pass None to disable caching)."""
+    global _default_cache, _default_cache_loaded
+    with _default_cache_lock:
+        _default_cache = cache
+        _default_cache_loaded = True
+
+
+def print_cache_stats(cache=None):
+    """Print a one-line summary of the cache counters."""
+    cache = cache or get_default_cache()
+    if cache is None:
+        return
+    stats = cache.stats()
+    print(f"💾 Audio cache: {stats['hits']} hits, {stats['misses']} misses, "
+          f"{stats['bytes'] / (1024 * 1024):.1f} MB on disk")
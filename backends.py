@@ -0,0 +1,231 @@
+"""
+Pluggable synthesis backends.
+
+A backend performs exactly one synthesis request per call; caching,
+retries and stitching live in gemini_tts_example and are shared by every
+backend. The Gemini backend lives in gemini_tts_example next to the client
+registry; this module holds the interface and a local fake for offline
+tests and benchmarks.
+
+Select the fake for a whole process with GEMINI_TTS_BACKEND=fake.
+"""
+
+import asyncio
+import math
+import random
+import re
+import struct
+import threading
+import time
+from types import SimpleNamespace
+
+from metrics import phase
+
+
+SAMPLE_RATE = 24000
+SAMPLE_WIDTH = 2
+# A bracketed pause direction on a line of its own, e.g. "[pause]" or "[long pause]"
+_PAUSE_LINE = re.compile(r"^[ \t]*\[[^\]\n]*pause[^\]\n]*\][ \t]*$", re.MULTILINE | re.IGNORECASE)
+
+
+class TTSBackend:
+    """Interface every synthesis backend implements."""
+
+    name = "base"
+
+    def check_credentials(self):
+        """Raise ValueError if the backend cannot make requests (e.g. missing API key)."""
+
+    def generate(self, contents, voices, model):
+        """
+        Synthesize one request.
+
+        Args:
+            contents (str): Prompt text (including any style instruction)
+            voices (str | tuple): Voice name or ((speaker, voice), ...) tuple
+            model (str): TTS model name
+
+        Returns:
+            bytes-like: 16-bit mono PCM at 24 kHz
+        """
+        raise NotImplementedError
+
+    async def generate_async(self, contents, voices, model):
+        """Async counterpart of generate(); defaults to running it in the executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.generate, contents, voices, model)
+
+    def stream(self, contents, voices, model):
+        """Yield PCM chunks as they are produced; defaults to one chunk."""
+        yield self.generate(contents, voices, model)
+
+
+class FakeBackendError(Exception):
+    """HTTP-style error injected by FakeBackend; classified like SDK APIErrors."""
+
+    def __init__(self, code, retry_after=None):
+        self.code = code
+        self.status = "RESOURCE_EXHAUSTED" if code == 429 else "UNAVAILABLE"
+        headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+        self.response = SimpleNamespace(status_code=code, headers=headers)
+        self.details = None
+        super().__init__(f"{code} {self.status}. Injected by FakeBackend")
+
+
+class LatencyModel:
+    """
+    Request latency distribution for FakeBackend.
+
+    latency = base + per_char * len(contents), multiplied by a random factor
+    drawn from the chosen distribution ("fixed", "uniform" or "lognormal").
+    A tail_probability fraction of requests is additionally slowed down by
+    tail_multiplier, to mimic occasional slow calls.
+    """
+
+    def __init__(self, base=0.05, per_char=0.0, distribution="lognormal", sigma=0.25,
+                 tail_probability=0.0, tail_multiplier=5.0):
+        self.base = base
+        self.per_char = per_char
+        self.distribution = distribution
+        self.sigma = sigma
+        self.tail_probability = tail_probability
+        self.tail_multiplier = tail_multiplier
+
+    def sample(self, chars, rng):
+        """Return one latency in seconds for a request of the given size."""
+        latency = self.base + self.per_char * chars
+        if self.distribution == "uniform":
+            latency *= rng.uniform(1 - self.sigma, 1 + self.sigma)
+        elif self.distribution == "lognormal":
+            latency *= rng.lognormvariate(-self.sigma ** 2 / 2, self.sigma)
+        if self.tail_probability and rng.random() < self.tail_probability:
+            latency *= self.tail_multiplier
+        return max(0.0, latency)
+
+
+def _tone_period(frequency=240, amplitude=3000):
+    """One period of a sine tone as int16 PCM (240 Hz divides 24 kHz evenly)."""
+    samples = SAMPLE_RATE // frequency
+    return struct.pack(
+        f"<{samples}h",
+        *(int(amplitude * math.sin(2 * math.pi * i / samples)) for i in range(samples))
+    )
+
+
+class FakeBackend(TTSBackend):
+    """
+    Local stand-in for the Gemini API.
+
+    Returns a synthetic 24 kHz tone whose duration scales with the input text,
+    after a configurable latency, and can inject 429/5xx failures. A pause
+    direction on its own line ("[pause]") is rendered as pause_seconds of
+    silence between tones.
+    """
+
+    name = "fake"
+
+    def __init__(self, chars_per_second=15.0, latency=None, failure_rate=0.0, failure_codes=(429, 503),
+                 retry_after=None, stream_chunk_seconds=0.5, pause_seconds=1.0, seed=None, sleep=time.sleep):
+        """
+        Args:
+            chars_per_second (float): Speaking rate used to size the output audio
+            latency (LatencyModel): Request latency distribution (default: ~50 ms lognormal)
+            failure_rate (float): Fraction of requests that raise FakeBackendError
+            failure_codes (tuple): HTTP codes to pick injected failures from
+            retry_after (float): Retry-After seconds attached to injected 429s
+            stream_chunk_seconds (float): Audio per chunk yielded by stream()
+            pause_seconds (float): Silence rendered for each "[pause]" line
+            seed (int): Seed for latency and failure randomness
+            sleep (callable): Sleep function used for simulated latency
+        """
+        self.chars_per_second = chars_per_second
+        self.latency = latency or LatencyModel()
+        self.failure_rate = failure_rate
+        self.failure_codes = failure_codes
+        self.retry_after = retry_after
+        self.stream_chunk_seconds = stream_chunk_seconds
+        self.pause_seconds = pause_seconds
+        self.sleep = sleep
+        self.requests = 0
+        self.failures = 0
+        self.bytes_returned = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._period = _tone_period()
+
+    def _tone_bytes(self, text):
+        """Bytes of tone for a piece of text (whole tone periods, at least one)."""
+        seconds = len(text) / self.chars_per_second
+        periods = max(1, int(seconds * SAMPLE_RATE / (len(self._period) // SAMPLE_WIDTH)))
+        return periods * len(self._period)
+
+    def _pieces(self, contents):
+        """Split a prompt at pause lines into the texts that are spoken."""
+        pieces = _PAUSE_LINE.split(contents)
+        if len(pieces) == 1:
+            return pieces
+        return [piece.strip() for piece in pieces if piece.strip()]
+
+    def _pause_bytes(self):
+        return int(self.pause_seconds * SAMPLE_RATE) * SAMPLE_WIDTH
+
+    def audio_bytes_for(self, contents):
+        """Number of PCM bytes returned for a prompt."""
+        pieces = self._pieces(contents)
+        return sum(self._tone_bytes(piece) for piece in pieces) + (len(pieces) - 1) * self._pause_bytes()
+
+    def _plan(self, contents):
+        """Draw latency and failure for one request under the lock."""
+        with self._lock:
+            self.requests += 1
+            latency = self.latency.sample(len(contents), self._rng)
+            failure = None
+            if self.failure_rate and self._rng.random() < self.failure_rate:
+                self.failures += 1
+                code = self._rng.choice(self.failure_codes)
+                failure = FakeBackendError(code, self.retry_after if code == 429 else None)
+        return latency, failure
+
+    def _render(self, contents):
+        silence = bytes(self._pause_bytes())
+        audio = silence.join(
+            self._period * (self._tone_bytes(piece) // len(self._period)) for piece in self._pieces(contents)
+        )
+        with self._lock:
+            self.bytes_returned += len(audio)
+        return audio
+
+    def generate(self, contents, voices, model):
+        latency, failure = self._plan(contents)
+        with phase("request"):
+            self.sleep(latency)
+            if failure is not None:
+                raise failure
+        with phase("extract"):
+            return self._render(contents)
+
+    async def generate_async(self, contents, voices, model):
+        latency, failure = self._plan(contents)
+        with phase("request"):
+            await asyncio.sleep(latency)
+            if failure is not None:
+                raise failure
+        with phase("extract"):
+            return self._render(contents)
+
+    def stream(self, contents, voices, model):
+        latency, failure = self._plan(contents)
+        audio = self._render(contents)
+        chunk_bytes = max(len(self._period), int(self.stream_chunk_seconds * SAMPLE_RATE) * SAMPLE_WIDTH)
+        chunks = max(1, math.ceil(len(audio) / chunk_bytes))
+        if failure is not None:
+            self.sleep(latency / chunks)
+            raise failure
+        view = memoryview(audio)
+        for start in range(0, len(audio), chunk_bytes):
+            self.sleep(latency / chunks)
+            yield view[start:start + chunk_bytes]
+
+    def stats(self):
+        with self._lock:
+            return {"requests": self.requests, "failures": self.failures, "bytes": self.bytes_returned}
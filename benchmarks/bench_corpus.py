@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Lookup latency/memory benchmark for dialogue corpus backends.
+
+Generates a large synthetic corpus (sections of "Speaker: text" scripts)
+in three layouts - one JSON file, one indexed .jsonl file and a sharded
+directory - then measures, each in its own subprocess:
+
+- cold: time from opening the corpus to the first get_dialogue() result
+  (full parse for JSON, index load for JSON Lines)
+- warm p50/p95: random single lookups after the first one
+- peak Python heap allocated by the loader (tracemalloc)
+
+Usage:
+    python benchmarks/bench_corpus.py [--records 20000] [--shard-records 2000]
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+LAYOUTS = ["json", "jsonl", "sharded"]
+WORDS = ("data", "model", "quality", "filter", "token", "web", "dataset", "training", "scale", "benchmark")
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+def generate_records(count, sections=20, seed=0):
+    """Yield (section, key, script) records of a few hundred to a few thousand characters."""
+    rng = random.Random(seed)
+    for index in range(count):
+        turns = [
+            f"{'Host' if turn % 2 == 0 else 'Guest'}: " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(10, 60)))
+            for turn in range(rng.randint(4, 16))
+        ]
+        yield f"section_{index % sections:02d}", f"dialogue_{index:06d}", "\n".join(turns)
+
+
+def write_layouts(records, out_dir, shard_records):
+    from dialogues import write_corpus
+
+    records = list(records)
+    data = {}
+    for section, key, script in records:
+        data.setdefault(section, {})[key] = script
+    paths = {
+        "json": os.path.join(out_dir, "corpus.json"),
+        "jsonl": os.path.join(out_dir, "corpus.jsonl"),
+        "sharded": os.path.join(out_dir, "corpus_shards"),
+    }
+    with open(paths["json"], "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    write_corpus(records, paths["jsonl"])
+    write_corpus(records, paths["sharded"], shard_records=shard_records)
+    return paths, [(section, key) for section, key, _ in records]
+
+
+def run_layout(path, keys_file, lookups):
+    from dialogues import _load_dialogues, get_dialogue, open_corpus, set_corpus
+
+    with open(keys_file, "r", encoding="utf-8") as f:
+        keys = json.load(f)
+    rng = random.Random(1)
+    sample = [rng.choice(keys) for _ in range(lookups + 1)]
+
+    start = time.perf_counter()
+    set_corpus(open_corpus(path))
+    get_dialogue(*sample[0])
+    cold = time.perf_counter() - start
+
+    latencies = []
+    for section, key in sample[1:]:
+        start = time.perf_counter()
+        get_dialogue(section, key)
+        latencies.append(time.perf_counter() - start)
+    # Measure memory on a second cold start; tracemalloc would distort the timings above
+    _load_dialogues.cache_clear()
+    tracemalloc.start()
+    set_corpus(open_corpus(path))
+    get_dialogue(*sample[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(json.dumps({
+        "cold": cold,
+        "p50": _percentile(latencies, 50),
+        "p95": _percentile(latencies, 95),
+        "heap": peak,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dialogue corpus loader benchmark")
+    parser.add_argument("--records", type=int, default=20000, help="Dialogues to generate (default: 20000)")
+    parser.add_argument("--shard-records", type=int, default=2000, help="Records per shard (default: 2000)")
+    parser.add_argument("--lookups", type=int, default=2000, help="Random lookups per layout (default: 2000)")
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    parser.add_argument("--keys-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.path:
+        run_layout(args.path, args.keys_file, args.lookups)
+        return
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        paths, keys = write_layouts(generate_records(args.records), out_dir, args.shard_records)
+        keys_file = os.path.join(out_dir, "keys.json")
+        with open(keys_file, "w", encoding="utf-8") as f:
+            json.dump(keys, f)
+        size = os.path.getsize(paths["json"])
+        print(f"📚 {args.records} dialogues, {size / (1024 * 1024):.1f} MB as JSON, {args.lookups} random lookups")
+        print(f"{'layout':<8} {'cold ms':>9} {'p50 us':>8} {'p95 us':>8} {'peak heap':>10}")
+        for layout in LAYOUTS:
+            result = subprocess.run(
+                [sys.executable, __file__, "--path", paths[layout], "--keys-file", keys_file,
+                 "--lookups", str(args.lookups)],
+                check=True, capture_output=True, text=True,
+            )
+            stats = json.loads(result.stdout)
+            print(f"{layout:<8} {stats['cold'] * 1000:>9.1f} {stats['p50'] * 1e6:>8.1f} "
+                  f"{stats['p95'] * 1e6:>8.1f} {stats['heap'] / (1024 * 1024):>7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
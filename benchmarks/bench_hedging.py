@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tail latency of short single-speaker requests with and without hedging.
+
+The fake backend draws lognormal latencies and slows a --tail fraction of
+requests down by --tail-multiplier, like the occasional generate_content
+call that takes several times the median. Each mode runs in its own
+subprocess:
+
+- plain: one synthesize_pcm() call per request
+- hedged: synthesize_pcm(hedge=True), which sends a duplicate once a call
+  runs past the recent p95 latency (budget: 5% extra requests)
+
+Usage:
+    python benchmarks/bench_hedging.py [--requests 400] [--tail 0.05] [--workers 8]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+MODES = ["plain", "hedged"]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+def run_mode(mode, args):
+    from audio_cache import set_default_cache
+    from backends import FakeBackend, LatencyModel
+    from gemini_tts_example import set_backend, synthesize_pcm
+    from hedging import get_hedger
+
+    set_default_cache(None)
+    backend = FakeBackend(
+        latency=LatencyModel(base=args.base, tail_probability=args.tail, tail_multiplier=args.tail_multiplier),
+        seed=3,
+    )
+    set_backend(backend)
+    hedge = mode == "hedged"
+
+    def request(index):
+        start = time.perf_counter()
+        synthesize_pcm(f"Your table for {index % 8 + 2} is ready.", "kore", hedge=hedge)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        latencies = list(executor.map(request, range(args.requests)))
+    wall = time.perf_counter() - start
+    hedger = get_hedger().stats()
+
+    print(json.dumps({
+        "wall": wall,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "backend_requests": backend.stats()["requests"],
+        "hedges_fired": hedger["hedges_fired"] if hedge else 0,
+        "hedges_won": hedger["hedges_won"] if hedge else 0,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hedged request benchmark (fake backend)")
+    parser.add_argument("--requests", type=int, default=400, help="Requests to send (default: 400)")
+    parser.add_argument("--workers", type=int, default=8, help="Requests in flight (default: 8)")
+    parser.add_argument("--base", type=float, default=0.05, help="Median seconds per request (default: 0.05)")
+    parser.add_argument("--tail", type=float, default=0.05,
+                        help="Fraction of requests slowed down (default: 0.05)")
+    parser.add_argument("--tail-multiplier", type=float, default=8.0,
+                        help="Slowdown of tail requests (default: 8)")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args)
+        return
+
+    print(f"🔀 {args.requests} requests, {args.tail:.0%} of them {args.tail_multiplier:g}x slower, "
+          f"{args.workers} workers")
+    print(f"{'mode':<7} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'requests':>8} {'hedges':>6} {'won':>4}")
+    results = {}
+    for mode in MODES:
+        result = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--requests", str(args.requests),
+             "--workers", str(args.workers), "--base", str(args.base), "--tail", str(args.tail),
+             "--tail-multiplier", str(args.tail_multiplier)],
+            check=True, capture_output=True, text=True,
+        )
+        stats = results[mode] = json.loads(result.stdout)
+        print(f"{mode:<7} {stats['p50'] * 1000:>7.0f} {stats['p95'] * 1000:>7.0f} {stats['p99'] * 1000:>7.0f} "
+              f"{stats['backend_requests']:>8} {stats['hedges_fired']:>6} {stats['hedges_won']:>4}")
+    print(f"⚡ With hedging: p95 {results['plain']['p95'] / results['hedged']['p95']:.1f}x lower, "
+          f"p99 {results['plain']['p99'] / results['hedged']['p99']:.1f}x lower, "
+          f"{results['hedged']['backend_requests'] / args.requests - 1:.1%} extra requests")
+
+
+if __name__ == "__main__":
+    main()
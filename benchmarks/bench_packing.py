@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Request packing benchmark against the fake Gemini backend.
+
+Synthesizes a batch of short IVR-style prompts for one voice in two modes,
+each in its own subprocess:
+
+- single: one synthesize_pcm() call per prompt (max_workers in flight)
+- packed: synthesize_packed(), which sends up to --max-items prompts per
+  request and splits the audio at the pauses
+
+The fake backend's latency is a fixed round trip plus a per-character
+cost, so packing saves the round trips but not the generation time.
+
+Usage:
+    python benchmarks/bench_packing.py [--items 96] [--round-trip 0.3] [--max-items 16]
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+MODES = ["single", "packed"]
+OPTIONS = ("one", "two", "three", "four", "five", "six", "seven", "eight", "nine")
+TOPICS = ("sales", "support", "billing", "opening hours", "your account", "a new order", "an operator")
+
+
+def generate_prompts(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        f"For {rng.choice(TOPICS)}, press {rng.choice(OPTIONS)}."
+        if rng.random() < 0.7 else f"Please hold while we connect you to {rng.choice(TOPICS)}."
+        for _ in range(count)
+    ]
+
+
+def run_mode(mode, args):
+    from audio_cache import set_default_cache
+    from backends import FakeBackend, LatencyModel
+    from gemini_tts_example import set_backend, synthesize_pcm
+    from packing import synthesize_packed
+
+    set_default_cache(None)
+    backend = FakeBackend(
+        latency=LatencyModel(base=args.round_trip, per_char=args.per_char, distribution="fixed"), seed=1
+    )
+    set_backend(backend)
+    prompts = generate_prompts(args.items)
+
+    start = time.perf_counter()
+    if mode == "single":
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            clips = list(executor.map(lambda text: synthesize_pcm(text, "kore"), prompts))
+        fallback_packs = 0
+    else:
+        clips, report = synthesize_packed(prompts, "kore", max_items=args.max_items, max_workers=args.workers)
+        fallback_packs = report["fallback_packs"]
+    wall = time.perf_counter() - start
+
+    print(json.dumps({
+        "wall": wall,
+        "requests": backend.stats()["requests"],
+        "clips": len(clips),
+        "audio_seconds": sum(len(clip) for clip in clips) / 48000,
+        "fallback_packs": fallback_packs,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Request packing benchmark (fake backend)")
+    parser.add_argument("--items", type=int, default=96, help="Prompts to synthesize (default: 96)")
+    parser.add_argument("--round-trip", type=float, default=0.3,
+                        help="Fixed seconds per request (default: 0.3)")
+    parser.add_argument("--per-char", type=float, default=0.002,
+                        help="Generation seconds per prompt character (default: 0.002)")
+    parser.add_argument("--max-items", type=int, default=16, help="Prompts per packed request (default: 16)")
+    parser.add_argument("--workers", type=int, default=4, help="Requests in flight (default: 4)")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args)
+        return
+
+    print(f"📦 {args.items} prompts, {args.round_trip * 1000:.0f} ms round trip, {args.workers} workers")
+    print(f"{'mode':<8} {'requests':>8} {'wall s':>8} {'clips/s':>8} {'audio s':>8} {'fallbacks':>9}")
+    results = {}
+    for mode in MODES:
+        result = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--items", str(args.items),
+             "--round-trip", str(args.round_trip), "--per-char", str(args.per_char),
+             "--max-items", str(args.max_items), "--workers", str(args.workers)],
+            check=True, capture_output=True, text=True,
+        )
+        stats = results[mode] = json.loads(result.stdout)
+        print(f"{mode:<8} {stats['requests']:>8} {stats['wall']:>8.2f} {stats['clips'] / stats['wall']:>8.1f} "
+              f"{stats['audio_seconds']:>8.1f} {stats['fallback_packs']:>9}")
+    print(f"⚡ Packing speedup: {results['single']['wall'] / results['packed']['wall']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
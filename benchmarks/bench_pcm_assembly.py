@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Memory/copy benchmark for assembling PCM from many segments.
+
+"join_chunks" is the path stitched outputs actually take: chunk results
+collected in a list, joined by join_chunks() and written by save_wave_file().
+Each strategy runs in its own subprocess so peak RSS (ru_maxrss) is
+measured independently. Segments are generated on the fly, the way
+response parts or chunk results arrive, and the result is written to a
+WAV file in a temporary directory.
+
+Usage:
+    python benchmarks/bench_pcm_assembly.py [--mb 64] [--chunk-kb 256]
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+STRATEGIES = ["concat", "join", "pcm_buffer", "join_chunks", "writev"]
+
+
+def _peak_rss_bytes():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _segments(total_bytes, chunk_bytes):
+    produced = 0
+    while produced < total_bytes:
+        size = min(chunk_bytes, total_bytes - produced)
+        # os.urandom returns a fresh bytes object, like a decoded response part
+        yield os.urandom(size)
+        produced += size
+
+
+def run_strategy(strategy, total_bytes, chunk_bytes, out_dir):
+    from gemini_tts_example import join_chunks, save_wave_file
+    from pcm_buffer import PCMBuffer, write_wave_segments
+
+    output = os.path.join(out_dir, f"{strategy}.wav")
+    baseline = _peak_rss_bytes()
+    start = time.perf_counter()
+    if strategy == "concat":
+        audio = b""
+        for segment in _segments(total_bytes, chunk_bytes):
+            audio = audio + segment
+        save_wave_file(output, audio)
+    elif strategy == "join":
+        audio = b"".join(list(_segments(total_bytes, chunk_bytes)))
+        save_wave_file(output, audio)
+    elif strategy == "pcm_buffer":
+        buffer = PCMBuffer(total_bytes)
+        buffer.extend(_segments(total_bytes, chunk_bytes))
+        buffer.write_wave(output)
+    elif strategy == "join_chunks":
+        segments = list(_segments(total_bytes, chunk_bytes))
+        save_wave_file(output, join_chunks(segments))
+    elif strategy == "writev":
+        write_wave_segments(output, list(_segments(total_bytes, chunk_bytes)))
+    elapsed = time.perf_counter() - start
+    assert os.path.getsize(output) == total_bytes + 44
+    print(f"{_peak_rss_bytes() - baseline} {elapsed}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PCM assembly memory/copy benchmark")
+    parser.add_argument("--mb", type=int, default=64, help="Synthetic payload size in MB (default: 64)")
+    parser.add_argument("--chunk-kb", type=int, default=256, help="Segment size in KB (default: 256)")
+    parser.add_argument("--strategy", choices=STRATEGIES, help=argparse.SUPPRESS)
+    parser.add_argument("--out-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    total_bytes = args.mb * 1024 * 1024
+    chunk_bytes = args.chunk_kb * 1024
+    if args.strategy:
+        run_strategy(args.strategy, total_bytes, chunk_bytes, args.out_dir)
+        return
+
+    print(f"📦 Assembling {args.mb} MB of PCM from {args.chunk_kb} KB segments")
+    print(f"{'strategy':<12} {'peak RSS delta':>15} {'x audio':>8} {'seconds':>8}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        for strategy in STRATEGIES:
+            result = subprocess.run(
+                [sys.executable, __file__, "--mb", str(args.mb), "--chunk-kb", str(args.chunk_kb),
+                 "--strategy", strategy, "--out-dir", out_dir],
+                check=True, capture_output=True, text=True,
+            )
+            peak, elapsed = result.stdout.split()
+            peak = int(peak)
+            print(f"{strategy:<12} {peak / (1024 * 1024):>12.1f} MB {peak / total_bytes:>7.2f}x "
+                  f"{float(elapsed):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
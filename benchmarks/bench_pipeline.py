@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Sequential vs pipelined multi-file runs against the fake Gemini backend.
+
+Renders --files chunked scripts to WAV files with post-processing, each
+mode in its own subprocess:
+
+- sequential: fetch, post-process and write one file after another
+  (what full_papers_generator --all does with --jobs 1)
+- pipelined: the same steps as fetch -> assemble -> write stages with
+  bounded queues in between (full_papers_generator --all --pipeline)
+
+Usage:
+    python benchmarks/bench_pipeline.py [--files 8] [--turns 40] [--round-trip 0.2]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+MODES = ["sequential", "pipelined"]
+VOICES = (("Narrator 1", "kore"), ("Narrator 2", "charon"))
+
+
+def script_for(index, turns):
+    return "\n".join(
+        f"Narrator {turn % 2 + 1}: File {index}, turn {turn}, walks through one more part of the method "
+        f"and what the experiments showed."
+        for turn in range(turns)
+    )
+
+
+def run_mode(mode, args):
+    from audio_cache import set_default_cache
+    from backends import FakeBackend, LatencyModel
+    from gemini_tts_example import fetch_chunks, join_chunks, save_wave_file, set_backend
+    from pipeline import Pipeline, Stage
+    from postprocess import PostProcessor
+
+    set_default_cache(None)
+    set_backend(FakeBackend(latency=LatencyModel(base=args.round_trip, distribution="fixed"), seed=1))
+    processor = PostProcessor()
+    scripts = [script_for(index, args.turns) for index in range(args.files)]
+
+    def fetch(index):
+        return index, fetch_chunks(scripts[index], VOICES)[0]
+
+    def assemble(item):
+        index, segments = item
+        return index, join_chunks(segments, processor)
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        def write(item):
+            index, audio = item
+            save_wave_file(os.path.join(out_dir, f"file_{index}.wav"), audio)
+            return len(audio)
+
+        start = time.perf_counter()
+        stats = []
+        if mode == "sequential":
+            sizes = [write(assemble(fetch(index))) for index in range(args.files)]
+        else:
+            pipeline = Pipeline([Stage("fetch", fetch), Stage("assemble", assemble), Stage("write", write)])
+            sizes = pipeline.run(range(args.files))
+            stats = pipeline.stats()
+        wall = time.perf_counter() - start
+
+    print(json.dumps({"wall": wall, "audio_seconds": sum(sizes) / 48000, "stages": stats}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipelined multi-file benchmark (fake backend)")
+    parser.add_argument("--files", type=int, default=8, help="Files to render (default: 8)")
+    parser.add_argument("--turns", type=int, default=40, help="Speaker turns per file (default: 40)")
+    parser.add_argument("--round-trip", type=float, default=0.2,
+                        help="Fixed seconds per chunk request (default: 0.2)")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args)
+        return
+
+    print(f"🏭 {args.files} files x {args.turns} turns, {args.round_trip * 1000:.0f} ms per request")
+    results = {}
+    for mode in MODES:
+        result = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--files", str(args.files), "--turns", str(args.turns),
+             "--round-trip", str(args.round_trip)],
+            check=True, capture_output=True, text=True,
+        )
+        results[mode] = json.loads(result.stdout)
+        print(f"{mode:<11} {results[mode]['wall']:>6.2f}s wall, {results[mode]['audio_seconds']:.0f}s of audio")
+    print(f"{'stage':<9} {'busy s':>7} {'starved s':>9} {'blocked s':>9}")
+    for row in results["pipelined"]["stages"]:
+        print(f"{row['stage']:<9} {row['busy_seconds']:>7.2f} {row['starved_seconds']:>9.2f} "
+              f"{row['blocked_seconds']:>9.2f}")
+    print(f"⚡ Pipelining speedup: {results['sequential']['wall'] / results['pipelined']['wall']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
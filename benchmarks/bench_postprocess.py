@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Throughput/memory benchmark for the audio post-processing stage.
+
+Builds a synthetic narration (tone bursts separated by silences, with
+uneven loudness) split into segments, then runs it through
+PostProcessor.process (in memory) and process_wave_file (block-wise,
+file to file). Each mode runs in its own subprocess so peak RSS is
+measured independently. Throughput is audio-seconds per CPU-second.
+
+Usage:
+    python benchmarks/bench_postprocess.py [--minutes 30] [--segments 60]
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+MODES = ["in_memory", "wave_file"]
+RATE = 24000
+
+
+def _peak_rss_bytes():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _segments(minutes, count):
+    import numpy as np
+
+    samples = int(minutes * 60 * RATE / count)
+    t = np.arange(samples, dtype=np.float32) / RATE
+    rng = np.random.default_rng(0)
+    for index in range(count):
+        amplitude = 2000 + 6000 * (index % 3)
+        audio = amplitude * np.sin(2 * np.pi * 180 * t) + rng.normal(0, 50, samples)
+        # Half a second of near-silence at each end, like a TTS clip
+        audio[:RATE // 2] *= 0.002
+        audio[-RATE // 2:] *= 0.002
+        yield audio.astype("<i2").tobytes()
+
+
+def write_source(path, minutes, count):
+    from wav_writer import IncrementalWavWriter
+
+    with IncrementalWavWriter(path, flush_each_write=False) as writer:
+        for segment in _segments(minutes, count):
+            writer.write(segment)
+
+
+def run_mode(mode, source, out_dir, block_seconds):
+    import wave
+
+    from gemini_tts_example import save_wave_file
+    from postprocess import PostProcessor, process_wave_file
+
+    processor = PostProcessor(block_seconds=block_seconds)
+    output = os.path.join(out_dir, f"{mode}.wav")
+    if mode == "in_memory":
+        with wave.open(source, "rb") as wf:
+            audio = wf.readframes(wf.getnframes())
+    baseline = _peak_rss_bytes()
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    if mode == "in_memory":
+        save_wave_file(output, processor.process(audio))
+    else:
+        process_wave_file(source, output, processor)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    print(f"{_peak_rss_bytes() - baseline} {elapsed} {cpu}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audio post-processing throughput benchmark")
+    parser.add_argument("--minutes", type=float, default=30, help="Synthetic audio length (default: 30)")
+    parser.add_argument("--segments", type=int, default=60, help="Number of segments (default: 60)")
+    parser.add_argument("--block-seconds", type=float, default=10.0, help="Block size (default: 10)")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--source", help=argparse.SUPPRESS)
+    parser.add_argument("--out-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.source, args.out_dir, args.block_seconds)
+        return
+
+    audio_seconds = args.minutes * 60
+    audio_bytes = audio_seconds * RATE * 2
+    print(f"🎚️  Post-processing {args.minutes:g} min of PCM in {args.segments} segments "
+          f"({args.block_seconds:g}s blocks)")
+    print(f"{'mode':<10} {'peak RSS delta':>15} {'x audio':>8} {'seconds':>8} {'audio-s/CPU-s':>14}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        source = os.path.join(out_dir, "source.wav")
+        write_source(source, args.minutes, args.segments)
+        for mode in MODES:
+            result = subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--source", source, "--out-dir", out_dir,
+                 "--block-seconds", str(args.block_seconds)],
+                check=True, capture_output=True, text=True,
+            )
+            peak, elapsed, cpu = result.stdout.split()
+            peak = int(peak)
+            print(f"{mode:<10} {peak / (1024 * 1024):>12.1f} MB {peak / audio_bytes:>7.2f}x "
+                  f"{float(elapsed):>8.2f} {audio_seconds / float(cpu):>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
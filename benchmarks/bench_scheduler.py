@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Interactive latency under a bulk batch, against the fake Gemini backend.
+
+A bulk job renders long chunked papers while short interactive requests
+arrive at a steady rate, all sharing one process and --slots request
+slots. Each mode runs in its own subprocess:
+
+- fifo: every request in the same priority class (first come, first served)
+- priority: papers in the bulk class, short requests in the interactive class
+
+Usage:
+    python benchmarks/bench_scheduler.py [--slots 4] [--papers 4] [--interactive 40]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+MODES = ["fifo", "priority"]
+
+
+def paper_script(index, turns=60):
+    return "\n".join(
+        f"Narrator {turn % 2 + 1}: Paper {index}, paragraph {turn}, discusses results in some detail "
+        f"and compares them with the previous section."
+        for turn in range(turns)
+    )
+
+
+def run_mode(mode, args):
+    from audio_cache import set_default_cache
+    from backends import FakeBackend, LatencyModel
+    from gemini_tts_example import set_backend, synthesize_chunked, synthesize_pcm
+    from scheduler import SynthesisScheduler, priority, set_scheduler
+
+    set_default_cache(None)
+    set_backend(FakeBackend(latency=LatencyModel(base=args.round_trip, per_char=args.per_char,
+                                                 distribution="fixed"), seed=1))
+    scheduler = SynthesisScheduler(max_concurrency=args.slots)
+    set_scheduler(scheduler)
+    bulk, interactive = ("bulk", "interactive") if mode == "priority" else ("default", "default")
+    voices = (("Narrator 1", "kore"), ("Narrator 2", "charon"))
+
+    def render(index):
+        with priority(bulk):
+            synthesize_chunked(paper_script(index), voices, max_workers=args.slots)
+
+    start = time.perf_counter()
+    batch = ThreadPoolExecutor(max_workers=args.papers)
+    papers = [batch.submit(render, index) for index in range(args.papers)]
+    latencies = []
+    lock = threading.Lock()
+
+    def request(index):
+        sent = time.perf_counter()
+        with priority(interactive):
+            synthesize_pcm(f"Your order number {index} is ready for pickup.", "kore")
+        with lock:
+            latencies.append(time.perf_counter() - sent)
+
+    with ThreadPoolExecutor(max_workers=args.interactive) as clients:
+        for index in range(args.interactive):
+            clients.submit(request, index)
+            time.sleep(args.interval)
+    for paper in papers:
+        paper.result()
+    batch.shutdown()
+    latencies.sort()
+
+    print(json.dumps({
+        "wall": time.perf_counter() - start,
+        "p50": statistics.median(latencies),
+        "p95": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        "bulk_wait": scheduler.stats()[bulk]["wait_seconds_total"],
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Priority scheduler benchmark (fake backend)")
+    parser.add_argument("--slots", type=int, default=4, help="Requests in flight (default: 4)")
+    parser.add_argument("--papers", type=int, default=4, help="Papers in the bulk batch (default: 4)")
+    parser.add_argument("--interactive", type=int, default=40, help="Interactive requests (default: 40)")
+    parser.add_argument("--interval", type=float, default=0.05,
+                        help="Seconds between interactive requests (default: 0.05)")
+    parser.add_argument("--round-trip", type=float, default=0.05,
+                        help="Fixed seconds per request (default: 0.05)")
+    parser.add_argument("--per-char", type=float, default=0.0002,
+                        help="Generation seconds per prompt character (default: 0.0002)")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args)
+        return
+
+    print(f"🚦 {args.papers} papers + {args.interactive} interactive requests on {args.slots} slots")
+    print(f"{'mode':<9} {'wall s':>7} {'p50 ms':>7} {'p95 ms':>7}")
+    results = {}
+    for mode in MODES:
+        result = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--slots", str(args.slots), "--papers", str(args.papers),
+             "--interactive", str(args.interactive), "--interval", str(args.interval),
+             "--round-trip", str(args.round_trip), "--per-char", str(args.per_char)],
+            check=True, capture_output=True, text=True,
+        )
+        stats = results[mode] = json.loads(result.stdout)
+        print(f"{mode:<9} {stats['wall']:>7.2f} {stats['p50'] * 1000:>7.0f} {stats['p95'] * 1000:>7.0f}")
+    print(f"⚡ Interactive p95: {results['fifo']['p95'] / results['priority']['p95']:.1f}x lower with priority")
+
+
+if __name__ == "__main__":
+    main()
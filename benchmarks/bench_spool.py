@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Peak memory of assembling a book-length output, in memory vs spilled to disk.
+
+Renders one long two-narrator script with create_full_paper_presentation()
+against the fake Gemini backend, each mode in its own subprocess:
+
+- memory: every chunk's PCM is joined in RAM and written with save_wave_file
+- spooled: chunks beyond --budget MB are spilled to a temp file and the WAV
+  is assembled with kernel-side copies (copy_file_range / sendfile)
+
+Peak RSS is the process's ru_maxrss, so it includes the interpreter
+(reported separately as the baseline after imports).
+
+Usage:
+    python benchmarks/bench_spool.py [--turns 600] [--budget 16]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+MODES = ["memory", "spooled"]
+
+
+def _rss_mb():
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+
+
+def run_mode(mode, args):
+    from audio_cache import set_default_cache
+    from backends import FakeBackend, LatencyModel
+    from gemini_tts_example import PAPER_SPEAKERS, create_full_paper_presentation, set_backend
+
+    set_default_cache(None)
+    set_backend(FakeBackend(latency=LatencyModel(base=0.0)))
+    names = [speaker["name"] for speaker in PAPER_SPEAKERS]
+    script = "\n".join(
+        f"{names[turn % 2]}: Chapter {turn // 20}, passage {turn}, continues the story a little further."
+        for turn in range(args.turns)
+    )
+    baseline = _rss_mb()
+    budget = False if mode == "memory" else int(args.budget * 2**20)
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        output = os.path.join(out_dir, "book.wav")
+        start = time.perf_counter()
+        create_full_paper_presentation("Book", script, output, verbose=False, postprocess=False,
+                                       memory_budget=budget)
+        wall = time.perf_counter() - start
+        size = os.path.getsize(output)
+
+    print(json.dumps({"wall": wall, "baseline_mb": baseline, "peak_mb": _rss_mb(), "output_mb": size / 2**20}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spill-to-disk assembly benchmark (fake backend)")
+    parser.add_argument("--turns", type=int, default=600, help="Speaker turns in the script (default: 600)")
+    parser.add_argument("--budget", type=float, default=16, help="In-memory budget in MB (default: 16)")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args)
+        return
+
+    print(f"💽 {args.turns}-turn script, {args.budget:g} MB in-memory budget for the spooled mode")
+    print(f"{'mode':<8} {'output MB':>9} {'baseline MB':>11} {'peak MB':>8} {'wall s':>7}")
+    results = {}
+    for mode in MODES:
+        result = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--turns", str(args.turns), "--budget", str(args.budget)],
+            check=True, capture_output=True, text=True,
+        )
+        stats = results[mode] = json.loads(result.stdout)
+        print(f"{mode:<8} {stats['output_mb']:>9.0f} {stats['baseline_mb']:>11.0f} {stats['peak_mb']:>8.0f} "
+              f"{stats['wall']:>7.2f}")
+    growth = {mode: results[mode]["peak_mb"] - results[mode]["baseline_mb"] for mode in MODES}
+    print(f"⚡ Memory above baseline: {growth['memory']:.0f} MB in memory vs {growth['spooled']:.0f} MB spooled")
+
+
+if __name__ == "__main__":
+    main()
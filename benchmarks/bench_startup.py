@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the command line tools.
+
+Runs every CLI path that never synthesizes (--help, --list, --plan) in a
+fresh interpreter, many times, in two modes:
+
+- lazy: the CLI as shipped (google.genai is imported on first synthesis)
+- eager: the same CLI with google.genai imported up front, i.e. the cost
+  every one of these paths paid when the SDK was a module-level import
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 15]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+COMMANDS = [
+    ("full_papers_generator.py", ["--help"]),
+    ("full_papers_generator.py", ["--list"]),
+    ("full_papers_generator.py", ["--all", "--plan"]),
+    ("multi_speaker_demo.py", ["--help"]),
+    ("academic_papers_demo.py", ["--plan"]),
+    ("tts_server.py", ["--help"]),
+]
+MODES = ["lazy", "eager"]
+_EAGER = (
+    "import sys, runpy; import google.genai; "
+    "sys.argv = sys.argv[1:]; runpy.run_path(sys.argv[0], run_name='__main__')"
+)
+
+
+def command_line(mode, script, args):
+    path = os.path.abspath(os.path.join(ROOT, script))
+    if mode == "eager":
+        return [sys.executable, "-c", _EAGER, path, *args]
+    return [sys.executable, path, *args]
+
+
+def time_command(argv, runs, cwd, env):
+    """Return wall-clock seconds of every run of argv in a fresh process."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, cwd=cwd, env=env, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=15, help="Cold starts per command and mode (default: 15)")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.pop("GEMINI_API_KEY", None)
+    env["PYTHONPATH"] = os.path.abspath(ROOT)
+    baseline = statistics.median(time_command([sys.executable, "-c", "pass"], args.runs, ROOT, env))
+    print(f"🚀 {args.runs} cold starts per command; bare interpreter: {baseline * 1000:.0f} ms")
+    print(f"{'command':<44} {'lazy ms':>8} {'eager ms':>9} {'saved':>7}")
+    with tempfile.TemporaryDirectory() as cwd:
+        for script, cli_args in COMMANDS:
+            medians = {
+                mode: statistics.median(time_command(command_line(mode, script, cli_args), args.runs, cwd, env))
+                for mode in MODES
+            }
+            label = " ".join([script, *cli_args])
+            print(f"{label:<44} {medians['lazy'] * 1000:>8.0f} {medians['eager'] * 1000:>9.0f} "
+                  f"{(medians['eager'] - medians['lazy']) * 1000:>5.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Offline synthesis benchmark against the fake Gemini backend.
+
+Replays every sample_dialogues.json entry and every full paper script from
+full_papers_generator.PAPERS through the real synthesis paths (multi-speaker,
+N-speaker dialogue engine, chunked paper rendering), writing WAVs to a
+temporary directory. Reports requests/sec, p50/p95/p99 backend latency,
+bytes written and peak memory. Results can be saved as JSON and compared
+against a previous run to catch regressions between releases.
+
+Usage:
+    python benchmarks/bench_synthesis.py [--concurrency 8] [--repeat 3]
+    python benchmarks/bench_synthesis.py --json bench.json
+    python benchmarks/bench_synthesis.py --baseline bench.json --tolerance 0.15
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from audio_cache import set_default_cache  # noqa: E402
+from backends import FakeBackend, LatencyModel, TTSBackend  # noqa: E402
+from dialogue_engine import as_script_lines, synthesize_dialogue  # noqa: E402
+from dialogues import iter_dialogues  # noqa: E402
+from full_papers_generator import PAPERS  # noqa: E402
+from gemini_tts_example import (  # noqa: E402
+    PAPER_SPEAKERS,
+    PAPER_STYLE_PREAMBLE,
+    create_dialogue_from_script,
+    save_wave_file,
+    set_backend,
+    speaker_voices,
+    synthesize_chunked,
+    synthesize_pcm,
+)
+from retry import CircuitBreaker, RetryPolicy, configure_retries  # noqa: E402
+
+VOICES = ["kore", "puck", "charon", "leda", "aoede", "orus"]
+# Metric -> True when a higher value is better
+REGRESSION_METRICS = {"requests_per_sec": True, "p95_ms": False, "p99_ms": False, "peak_rss_mb": False}
+
+
+class TimedBackend(TTSBackend):
+    """Wraps a backend and records the latency of every request it serves."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.name = f"timed-{inner.name}"
+        self.latencies = []
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def generate(self, contents, voices, model):
+        start = time.perf_counter()
+        try:
+            return self.inner.generate(contents, voices, model)
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self.latencies.append(time.perf_counter() - start)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def build_jobs():
+    """Return (name, callable(output_file) -> pcm) for every dialogue and paper."""
+    jobs = []
+    for section, key, script in iter_dialogues():
+        lines = as_script_lines(script)
+        names = list(dict.fromkeys(speaker for speaker, _ in lines))
+        speakers = [{"name": name, "voice": VOICES[i % len(VOICES)]} for i, name in enumerate(names)]
+        text = script if isinstance(script, str) else create_dialogue_from_script(script)
+
+        if len(names) == 2:
+            def job(voices=speaker_voices(speakers), text=text):
+                return synthesize_pcm(text, voices)
+        else:
+            def job(lines=lines, speakers=speakers):
+                return synthesize_dialogue(lines, speakers)[0]
+        jobs.append((f"{section}/{key}", job))
+
+    for key, paper in PAPERS.items():
+        def job(script=paper["script"]):
+            return synthesize_chunked(script, speaker_voices(PAPER_SPEAKERS), preamble=PAPER_STYLE_PREAMBLE)[0]
+        jobs.append((f"papers/{key}", job))
+    return jobs
+
+
+def run_benchmark(concurrency=8, repeat=3, latency_ms=50.0, per_char_ms=0.02, failure_rate=0.0, seed=0):
+    """Run the workload and return a dict of metrics."""
+    fake = FakeBackend(
+        latency=LatencyModel(base=latency_ms / 1000, per_char=per_char_ms / 1000, tail_probability=0.02),
+        failure_rate=failure_rate,
+        seed=seed,
+    )
+    timed = TimedBackend(fake)
+    set_backend(timed)
+    set_default_cache(None)
+    configure_retries(RetryPolicy(max_attempts=6, base_delay=0.01, max_delay=0.2),
+                      CircuitBreaker(min_calls=1000))
+
+    jobs = build_jobs() * repeat
+    bytes_written = 0
+    failed_jobs = 0
+    with tempfile.TemporaryDirectory() as out_dir:
+        def run(index):
+            name, job = jobs[index]
+            output = os.path.join(out_dir, f"{index}_{name.replace('/', '_')}.wav")
+            audio = job()
+            save_wave_file(output, audio)
+            return os.path.getsize(output)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(run, index) for index in range(len(jobs))]
+            for future in futures:
+                try:
+                    bytes_written += future.result()
+                except Exception:
+                    failed_jobs += 1
+        wall = time.perf_counter() - start
+
+    set_backend(None)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_bytes = peak if sys.platform == "darwin" else peak * 1024
+    latencies = timed.latencies
+    return {
+        "jobs": len(jobs),
+        "failed_jobs": failed_jobs,
+        "requests": len(latencies),
+        "request_errors": timed.errors,
+        "wall_seconds": wall,
+        "requests_per_sec": len(latencies) / wall if wall else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "bytes_written": bytes_written,
+        "peak_rss_mb": peak_bytes / (1024 * 1024),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of human-readable regressions beyond the tolerance."""
+    regressions = []
+    for metric, higher_is_better in REGRESSION_METRICS.items():
+        old, new = baseline.get(metric), results.get(metric)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+            regressions.append(f"{metric}: {old:.2f} -> {new:.2f} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline TTS throughput/latency benchmark")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent jobs (default: 8)")
+    parser.add_argument("--repeat", type=int, default=3, help="Times to replay the workload (default: 3)")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Base fake request latency (default: 50)")
+    parser.add_argument("--per-char-ms", type=float, default=0.02, help="Extra latency per input char (default: 0.02)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Injected 429/503 rate (default: 0)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against a previous --json result")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative regression (default: 0.15)")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.concurrency, args.repeat, args.latency_ms, args.per_char_ms,
+                            args.failure_rate, args.seed)
+
+    print("📊 Offline synthesis benchmark (fake backend)")
+    print(f"   Jobs: {results['jobs']} ({results['failed_jobs']} failed)")
+    print(f"   Requests: {results['requests']} ({results['request_errors']} injected errors)")
+    print(f"   Throughput: {results['requests_per_sec']:.1f} requests/sec over {results['wall_seconds']:.2f}s")
+    print(f"   Latency: p50 {results['p50_ms']:.1f} ms | p95 {results['p95_ms']:.1f} ms | "
+          f"p99 {results['p99_ms']:.1f} ms")
+    print(f"   Bytes written: {results['bytes_written'] / (1024 * 1024):.1f} MB")
+    print(f"   Peak RSS: {results['peak_rss_mb']:.1f} MB")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("❌ Regressions against baseline:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            sys.exit(1)
+        print("✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
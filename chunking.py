@@ -0,0 +1,32 @@
+"""Split long dialogue scripts into request-sized chunks at speaker-turn boundaries."""
+
+from dialogue_model import CHARS_PER_TOKEN, DEFAULT_MAX_CHARS, Dialogue
+
+
+def estimate_tokens(text):
+    """Rough token estimate used for chunk budgets (about 4 characters per token)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def chunk_script(script, max_chars=DEFAULT_MAX_CHARS, max_tokens=None, speakers=None):
+    """
+    Group consecutive turns into chunks that stay under a size budget.
+
+    Turns come from Dialogue.parse(), so chunks agree with every other
+    consumer of the script on where turns start. Chunks are only ever split
+    between turns, so a single turn longer than the budget becomes a chunk
+    of its own. Text without any speaker label is returned as one chunk.
+
+    Args:
+        script (str | Dialogue): Dialogue script
+        max_chars (int): Character budget per chunk
+        max_tokens (int): Optional token budget per chunk (converted to characters)
+        speakers (iterable): Optional speaker names passed to Dialogue.parse
+
+    Returns:
+        list: Chunk strings in script order, turns separated by blank lines
+    """
+    dialogue = script if isinstance(script, Dialogue) else Dialogue.parse(script, speakers)
+    if not dialogue.turns:
+        return [dialogue.preamble] if dialogue.preamble else []
+    return [chunk.to_text("\n\n") for chunk in dialogue.chunks(max_chars=max_chars, max_tokens=max_tokens)]
@@ -0,0 +1,217 @@
+"""
+Dialogue engine for scripts with more than two speakers.
+
+Gemini multi-speaker TTS accepts at most two voices per request, so an
+N-speaker script is split into consecutive runs of turns that involve at
+most two speakers. Two-speaker runs use the multi-speaker path, single-speaker
+runs use the single-voice path, and the runs are synthesized in parallel and
+stitched back into one timeline in script order. Every speaker keeps the
+same voice in every run.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dialogue_model import Dialogue
+from gemini_tts_example import (
+    DEFAULT_MODEL,
+    _resolve_verbose,
+    create_dialogue_from_script,
+    join_chunks,
+    require_credentials,
+    save_wave_file,
+    synthesize_pcm,
+)
+from postprocess import get_default_postprocessor, print_postprocess_report
+from scheduler import with_priority
+
+
+def as_script_lines(script):
+    """
+    Normalize a script to a list of (speaker, text) tuples.
+
+    Args:
+        script (str | list | Dialogue): "Speaker: text" dialogue text, (speaker, text) pairs
+                                        or a parsed Dialogue
+
+    Returns:
+        list: (speaker, text) tuples in script order
+    """
+    return Dialogue.coerce(script).lines()
+
+
+def build_voice_map(speakers_config, script_lines):
+    """
+    Map every speaker label used in a script to its configured voice.
+
+    Labels are matched case-insensitively, so "NARRATOR 1" in a script picks
+    up the voice configured for "Narrator 1".
+
+    Args:
+        speakers_config (list): {"name": ..., "voice": ...} dicts
+        script_lines (list): (speaker, text) tuples
+
+    Returns:
+        dict: speaker label as written in the script -> voice name
+    """
+    voices = {speaker["name"].casefold(): speaker["voice"] for speaker in speakers_config}
+    missing = sorted({speaker for speaker, _ in script_lines if speaker.casefold() not in voices})
+    if missing:
+        raise ValueError(f"No voice configured for speaker(s): {', '.join(missing)}")
+    return {speaker: voices[speaker.casefold()] for speaker, _ in script_lines}
+
+
+def plan_runs(script_lines, max_speakers=2):
+    """
+    Split a script into consecutive runs with at most max_speakers speakers.
+
+    Runs are grown greedily, so a new run only starts when the next turn
+    would introduce one speaker too many.
+
+    Args:
+        script_lines (list): (speaker, text) tuples
+        max_speakers (int): Maximum distinct speakers per run
+
+    Returns:
+        list: Runs, each a list of (speaker, text) tuples
+    """
+    runs = []
+    current = []
+    speakers = []
+    for speaker, text in script_lines:
+        if speaker not in speakers and len(speakers) == max_speakers:
+            runs.append(current)
+            current = []
+            speakers = []
+        if speaker not in speakers:
+            speakers.append(speaker)
+        current.append((speaker, text))
+    if current:
+        runs.append(current)
+    return runs
+
+
+def _run_speakers(run):
+    """Return the distinct speakers of a run in order of first appearance."""
+    speakers = []
+    for speaker, _ in run:
+        if speaker not in speakers:
+            speakers.append(speaker)
+    return speakers
+
+
+def _run_request(run, voice_map, preamble=""):
+    """Return (contents, voices) for one run, with the script's preamble in front of every run."""
+    speakers = _run_speakers(run)
+    if len(speakers) == 1:
+        # Single voice: read the lines without speaker labels
+        text = " ".join(text for _, text in run)
+        return (f"{preamble} {text}" if preamble else text), voice_map[speakers[0]]
+    dialogue = create_dialogue_from_script(run)
+    contents = f"{preamble}\n{dialogue}" if preamble else dialogue
+    return contents, tuple((name, voice_map[name]) for name in speakers)
+
+
+def _plan_dialogue(script, speakers_config):
+    dialogue = Dialogue.for_speakers(script, speakers_config).validate(speakers_config)
+    script_lines = dialogue.lines()
+    voice_map = build_voice_map(speakers_config, script_lines)
+    runs = plan_runs(script_lines)
+    return runs, [_run_request(run, voice_map, dialogue.preamble) for run in runs]
+
+
+def dialogue_requests(script, speakers_config):
+    """
+    Return the (contents, voices) of every request synthesize_dialogue() would send.
+
+    Raises:
+        ValueError: If the script uses a speaker without a configured voice
+    """
+    return _plan_dialogue(script, speakers_config)[1]
+
+
+def synthesize_dialogue(script, speakers_config, model=DEFAULT_MODEL, max_workers=4, postprocess=None):
+    """
+    Synthesize an N-speaker script into one ordered PCM timeline.
+
+    Text before the first speaker label (e.g. a style instruction) is
+    prepended to every run's request, as synthesize_chunked() does with its
+    preamble.
+
+    Args:
+        script (str | list | Dialogue): "Speaker: text" dialogue text, (speaker, text) pairs
+                                        or a parsed Dialogue
+        speakers_config (list): {"name": ..., "voice": ...} for every speaker in the script
+        model (str): TTS model name
+        max_workers (int): Maximum number of runs synthesized at once
+        postprocess (PostProcessor): Optional stage that trims, crossfades and
+                                     normalizes the runs instead of a plain join
+
+    Returns:
+        tuple: (pcm, report) where pcm is a bytes-like view of the stitched
+               audio and report lists "speakers", "turns" and "latency" per run
+    """
+    runs, requests = _plan_dialogue(script, speakers_config)
+
+    def run_one(index):
+        start = time.perf_counter()
+        contents, voices = requests[index]
+        audio = synthesize_pcm(contents, voices, model)
+        return audio, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(runs)))) as executor:
+        results = list(executor.map(with_priority(run_one), range(len(runs))))
+
+    report = [
+        {"speakers": _run_speakers(run), "turns": len(run), "latency": latency}
+        for run, (_, latency) in zip(runs, results)
+    ]
+    segments = [audio for audio, _ in results]
+    # Drop the (audio, latency) pairs so join_chunks can free each run as it copies it
+    del results
+    return join_chunks(segments, postprocess), report
+
+
+def text_to_speech_dialogue(script, speakers_config, output_file="dialogue.wav", model=DEFAULT_MODEL,
+                            max_workers=4, verbose=None, postprocess=None):
+    """
+    Convert a dialogue with any number of speakers to one WAV file.
+
+    Args:
+        script (str | list | Dialogue): "Speaker: text" dialogue text, (speaker, text) pairs
+                                        or a parsed Dialogue
+        speakers_config (list): [{"name": "Narrator", "voice": "Achird"}, ...]
+        output_file (str): Output filename
+        model (str): TTS model name
+        max_workers (int): Maximum number of runs synthesized at once
+        verbose (bool): Print progress and the per-run report (default: module
+                        setting, see set_verbose)
+        postprocess (PostProcessor): Trim/crossfade/normalize stage (default:
+                                     get_default_postprocessor(); False disables it)
+
+    Returns:
+        bytes-like: The PCM audio that was written
+    """
+    verbose = _resolve_verbose(verbose)
+    require_credentials()
+    if postprocess is None:
+        postprocess = get_default_postprocessor()
+    try:
+        audio_data, report = synthesize_dialogue(script, speakers_config, model, max_workers,
+                                                 postprocess=postprocess or None)
+        save_wave_file(output_file, audio_data)
+
+        if verbose:
+            print(f"✅ Dialogue with {len(speakers_config)} speakers generated successfully!")
+            for index, run in enumerate(report, 1):
+                print(f"   🧩 Run {index}/{len(report)}: {' & '.join(run['speakers'])} "
+                      f"({run['turns']} turns) in {run['latency']:.2f}s")
+            if postprocess:
+                print_postprocess_report(postprocess.last_report)
+            print(f"💾 Saved to: {output_file}")
+        return audio_data
+
+    except Exception as e:
+        if verbose:
+            print(f"❌ Error generating dialogue: {e}")
+        raise
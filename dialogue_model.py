@@ -0,0 +1,294 @@
+"""
+Compiled representation of "Speaker: text" dialogues.
+
+A Dialogue is parsed once and then passed around instead of the raw string:
+turns are __slots__ objects with interned speaker names and precomputed
+character counts, and prefix sums over those counts make slicing, chunking
+and cost estimates cheap. validate() checks the speaker labels against a
+speakers config before any request is made, and rewrites labels to the
+configured spelling ("NARRATOR 1" -> "Narrator 1"); for_speakers() parses
+raw text so that only configured names start a turn.
+
+Every entry point that takes dialogue text (text_to_speech_multi_speaker,
+synthesize_chunked, text_to_speech_dialogue, render_incremental, the HTTP
+service) also accepts a Dialogue.
+"""
+
+import re
+import sys
+from array import array
+
+
+# Default chunk budget, and the characters-per-token ratio used for budgets
+DEFAULT_MAX_CHARS = 1000
+CHARS_PER_TOKEN = 4
+
+_TURN_START = re.compile(r"^([^:\n]{1,40}):\s")
+# A label that reads like a name ("Carol", "NARRATOR") rather than prose ("Step 1", "Read this warmly")
+_NAME_LABEL = re.compile(r"^[A-Z][A-Za-z'.-]*$")
+# Length of the ": " between a label and its text
+_LABEL_SEPARATOR = 2
+
+
+class Turn:
+    """One speaker turn."""
+
+    __slots__ = ("speaker", "text", "chars")
+
+    def __init__(self, speaker, text):
+        self.speaker = sys.intern(speaker)
+        self.text = text
+        # Characters this turn adds to a prompt ("Speaker: text")
+        self.chars = len(speaker) + _LABEL_SEPARATOR + len(text)
+
+    def __repr__(self):
+        return f"Turn({self.speaker!r}, {self.text!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, Turn) and (self.speaker, self.text) == (other.speaker, other.text)
+
+
+class Dialogue:
+    """
+    Immutable sequence of turns with an optional leading instruction.
+
+    Usage:
+        dialogue = Dialogue.parse(text).validate(speakers_config)
+        for chunk in dialogue.chunks(max_chars=1000):
+            synthesize_pcm(chunk.to_text("\\n\\n"), voices)
+    """
+
+    __slots__ = ("preamble", "turns", "_offsets", "_source")
+
+    def __init__(self, turns, preamble="", source=None):
+        """
+        Args:
+            turns (list): Turn objects in order
+            preamble (str): Unlabeled text before the first turn (e.g. a style instruction)
+            source (str): Original text, returned verbatim by to_text() when unchanged
+        """
+        self.preamble = preamble
+        self.turns = turns
+        offsets = array("q", [0])
+        total = 0
+        for turn in turns:
+            total += turn.chars
+            offsets.append(total)
+        self._offsets = offsets
+        self._source = source
+
+    @classmethod
+    def parse(cls, text, speakers=None):
+        """
+        Parse "Speaker: text" dialogue in a single pass over its lines.
+
+        A turn starts at a line beginning with a speaker label; following
+        lines without a label belong to that turn. Text before the first
+        label is kept as the preamble.
+
+        Args:
+            text (str): Dialogue text
+            speakers (iterable): Optional speaker names; when given, only these
+                                 labels (compared case-insensitively) start a turn
+
+        Returns:
+            Dialogue: The parsed dialogue
+        """
+        names = {name.casefold() for name in speakers} if speakers is not None else None
+        preamble = []
+        turns = []
+        speaker = None
+        lines = preamble
+        for line in text.splitlines():
+            match = _TURN_START.match(line)
+            if match and (names is None or match.group(1).strip().casefold() in names):
+                if speaker is not None:
+                    turns.append(Turn(speaker, "\n".join(lines).strip()))
+                speaker = match.group(1).strip()
+                lines = [line[match.end():]]
+            else:
+                lines.append(line)
+        if speaker is not None:
+            turns.append(Turn(speaker, "\n".join(lines).strip()))
+        return cls(turns, "\n".join(preamble).strip(), text)
+
+    @classmethod
+    def from_lines(cls, script_lines, preamble=""):
+        """Build a dialogue from (speaker, text) pairs."""
+        return cls([Turn(speaker.strip(), text.strip()) for speaker, text in script_lines], preamble)
+
+    @classmethod
+    def coerce(cls, script):
+        """Return script as a Dialogue (accepts a Dialogue, text, or (speaker, text) pairs)."""
+        if isinstance(script, Dialogue):
+            return script
+        if isinstance(script, str):
+            return cls.parse(script)
+        return cls.from_lines(script)
+
+    @classmethod
+    def for_speakers(cls, script, speakers_config):
+        """
+        Coerce a script and check it against a speakers config.
+
+        Text is parsed so that only configured names (case-insensitively)
+        start a turn: other "Label: text" lines, such as "Step 1: buy bread"
+        or a leading "Read this warmly: ..." instruction, stay part of the
+        text, and text without any configured label comes back with no turns
+        and is rendered verbatim. Unconfigured labels are reported only when
+        they look like speaker names: a single capitalized word, or a label
+        used on more than one line.
+
+        Args:
+            script (str | list | Dialogue): Dialogue text, (speaker, text) pairs or a Dialogue
+            speakers_config (list): {"name": ..., "voice": ...} dicts
+
+        Returns:
+            Dialogue: The dialogue with canonical labels (see validate())
+
+        Raises:
+            ValueError: If a speaker-like label has no configured voice, or
+                        pairs / a Dialogue fail validate()
+        """
+        if not isinstance(script, str):
+            return cls.coerce(script).validate(speakers_config)
+        names = [speaker["name"] for speaker in speakers_config]
+        known = {name.casefold() for name in names}
+        counts = {}
+        for line in script.splitlines():
+            match = _TURN_START.match(line)
+            if match and match.group(1).strip().casefold() not in known:
+                label = match.group(1).strip()
+                counts[label] = counts.get(label, 0) + 1
+        missing = sorted(label for label, count in counts.items() if count > 1 or _NAME_LABEL.match(label))
+        if missing:
+            raise ValueError(f"No voice configured for speaker(s): {', '.join(missing)} "
+                             f"(configured: {', '.join(names)})")
+        dialogue = cls.parse(script, names)
+        return dialogue.validate(speakers_config) if dialogue.turns else dialogue
+
+    def __len__(self):
+        return len(self.turns)
+
+    def __iter__(self):
+        return iter(self.turns)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self.turns))
+            preamble = self.preamble if start == 0 and step == 1 else ""
+            return Dialogue(self.turns[index], preamble)
+        return self.turns[index]
+
+    def __repr__(self):
+        return f"<Dialogue {len(self.turns)} turns, {len(self.speakers)} speakers, {self.chars} chars>"
+
+    @property
+    def speakers(self):
+        """Distinct speaker labels in order of first appearance."""
+        return tuple(dict.fromkeys(turn.speaker for turn in self.turns))
+
+    @property
+    def chars(self):
+        """Characters of all turns rendered as "Speaker: text" (excluding separators)."""
+        return self._offsets[-1]
+
+    def chars_between(self, start, stop):
+        """Characters of turns[start:stop], in O(1)."""
+        return self._offsets[stop] - self._offsets[start]
+
+    def chars_by_speaker(self):
+        """Return speaker -> characters spoken (text only), for cost estimates."""
+        totals = {}
+        for turn in self.turns:
+            totals[turn.speaker] = totals.get(turn.speaker, 0) + len(turn.text)
+        return totals
+
+    def estimate_tokens(self):
+        """Rough prompt token count (about 4 characters per token, like chunk budgets)."""
+        size = len(self.to_text())
+        return (size + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+    def lines(self):
+        """Return the turns as (speaker, text) tuples."""
+        return [(turn.speaker, turn.text) for turn in self.turns]
+
+    def to_text(self, separator="\n"):
+        """
+        Render as "Speaker: text" lines.
+
+        With the default separator, a dialogue parsed from text and not
+        modified since is returned verbatim, so prompts (and cache keys) do
+        not change. Any other separator always re-renders the turns.
+        """
+        if self._source is not None and separator == "\n":
+            return self._source
+        body = separator.join(f"{turn.speaker}: {turn.text}" for turn in self.turns)
+        return f"{self.preamble}\n{body}" if self.preamble else body
+
+    def validate(self, speakers_config):
+        """
+        Check every speaker label against a speakers config.
+
+        Labels are matched case-insensitively and rewritten to the configured
+        spelling.
+
+        Args:
+            speakers_config (list): {"name": ..., "voice": ...} dicts
+
+        Returns:
+            Dialogue: self when every label already matches exactly, otherwise
+                      a copy with canonical labels
+
+        Raises:
+            ValueError: If the dialogue has no turns, or uses a speaker with no
+                        configured voice
+        """
+        if not self.turns:
+            raise ValueError("Dialogue has no 'Speaker: text' turns")
+        names = {speaker["name"].casefold(): speaker["name"] for speaker in speakers_config}
+        missing = sorted({speaker for speaker in self.speakers if speaker.casefold() not in names})
+        if missing:
+            configured = ", ".join(speaker["name"] for speaker in speakers_config)
+            raise ValueError(f"No voice configured for speaker(s): {', '.join(missing)} "
+                             f"(configured: {configured})")
+        if all(names[speaker.casefold()] == speaker for speaker in self.speakers):
+            return self
+        turns = [Turn(names[turn.speaker.casefold()], turn.text) for turn in self.turns]
+        return Dialogue(turns, self.preamble)
+
+    def chunks(self, max_chars=DEFAULT_MAX_CHARS, max_tokens=None, separator="\n\n"):
+        """
+        Split into consecutive slices that stay under a size budget.
+
+        Slices only break between turns, so a turn longer than the budget
+        becomes a chunk of its own. The preamble counts towards the first
+        slice, which renders it. Sizes come from the prefix sums, so no
+        text is rendered while planning.
+
+        Args:
+            max_chars (int): Character budget per chunk (as rendered with separator)
+            max_tokens (int): Optional token budget per chunk (converted to characters)
+            separator (str): Separator the chunks will be rendered with
+
+        Returns:
+            list: Dialogue slices in order
+        """
+        budget = max_chars
+        if max_tokens is not None:
+            budget = min(budget, max_tokens * CHARS_PER_TOKEN)
+
+        # The preamble is rendered on its own line in front of the first slice
+        preamble = len(self.preamble) + 1 if self.preamble else 0
+        chunks = []
+        start = 0
+        for stop in range(1, len(self.turns) + 1):
+            size = self.chars_between(start, stop) + len(separator) * (stop - start - 1)
+            if start == 0:
+                size += preamble
+            if stop - start > 1 and size > budget:
+                chunks.append(self[start:stop - 1])
+                start = stop - 1
+        if start < len(self.turns):
+            chunks.append(self[start:])
+        return chunks
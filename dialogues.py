@@ -1,20 +1,290 @@
-"""Helper to load sample dialogue text from JSON."""
+"""
+Dialogue corpus loading.
 
+Two backends serve get_dialogue(section, key):
+
+- JsonCorpus: the original single JSON file ({section: {key: dialogue}}),
+  parsed in full on first use. Used for the bundled sample_dialogues.json.
+- CorpusStore: JSON Lines records ({"section", "key", "dialogue"}) in one
+  .jsonl file or a directory of *.jsonl shards, with a prebuilt offset
+  index. A lookup reads exactly one record with os.pread, and sections can
+  be iterated lazily for batch jobs. The index is rebuilt automatically
+  when a shard changes size or modification time.
+
+Point GEMINI_TTS_CORPUS at a .jsonl file or a shard directory to use a
+large corpus. Convert a JSON corpus with:
+
+    python dialogues.py convert sample_dialogues.json corpus/ --shard-records 5000
+"""
+
+import argparse
 import json
 import os
+import threading
 from functools import lru_cache
 
 
 _FILE = os.path.join(os.path.dirname(__file__), "sample_dialogues.json")
+INDEX_VERSION = 1
+INDEX_NAME = "index.json"
 
 
 @lru_cache(maxsize=None)
-def _load_dialogues():
-    with open(_FILE, "r", encoding="utf-8") as f:
+def _load_dialogues(path=_FILE):
+    with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
 
+class JsonCorpus:
+    """Whole-file JSON corpus, parsed once and kept in memory."""
+
+    def __init__(self, path=_FILE):
+        self.path = path
+
+    def get(self, section, key):
+        return _load_dialogues(self.path)[section][key]
+
+    def sections(self):
+        return list(_load_dialogues(self.path))
+
+    def keys(self, section):
+        return list(_load_dialogues(self.path)[section])
+
+    def iter_section(self, section):
+        yield from _load_dialogues(self.path)[section].items()
+
+
+def _shard_stat(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class CorpusStore:
+    """JSON Lines corpus (single file or sharded directory) with an offset index."""
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): A .jsonl file, or a directory of *.jsonl shards
+        """
+        self.path = path
+        if os.path.isdir(path):
+            self.shards = sorted(
+                os.path.join(path, name) for name in os.listdir(path) if name.endswith(".jsonl")
+            )
+            self.index_path = os.path.join(path, INDEX_NAME)
+        else:
+            self.shards = [path]
+            self.index_path = f"{path}.index.json"
+        self._index = None
+        self._fds = {}
+        self._lock = threading.Lock()
+
+    def _shard_names(self):
+        return [os.path.basename(shard) for shard in self.shards]
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if index.get("version") != INDEX_VERSION or [s["name"] for s in index["shards"]] != self._shard_names():
+            return None
+        for shard, recorded in zip(self.shards, index["shards"]):
+            if _shard_stat(shard) != {"size": recorded["size"], "mtime_ns": recorded["mtime_ns"]}:
+                return None
+        return index
+
+    def build_index(self):
+        """
+        Scan every shard once and write the offset index atomically.
+
+        Returns:
+            dict: The index ({"sections": {section: {key: [shard, offset, length]}}, ...})
+        """
+        sections = {}
+        shards = []
+        for shard_number, shard in enumerate(self.shards):
+            shards.append({"name": os.path.basename(shard), **_shard_stat(shard)})
+            offset = 0
+            with open(shard, "rb") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        sections.setdefault(record["section"], {})[record["key"]] = [
+                            shard_number, offset, len(line)
+                        ]
+                    offset += len(line)
+        index = {"version": INDEX_VERSION, "shards": shards, "sections": sections}
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(tmp_path, self.index_path)
+        return index
+
+    @property
+    def index(self):
+        """The offset index, loaded (or rebuilt if missing or stale) on first use."""
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._load_index() or self.build_index()
+        return self._index
+
+    def _fd(self, shard_number):
+        fd = self._fds.get(shard_number)
+        if fd is None:
+            with self._lock:
+                fd = self._fds.get(shard_number)
+                if fd is None:
+                    flags = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+                    fd = self._fds[shard_number] = os.open(self.shards[shard_number], flags)
+        return fd
+
+    def _read(self, location):
+        shard_number, offset, length = location
+        fd = self._fd(shard_number)
+        if hasattr(os, "pread"):
+            data = os.pread(fd, length, offset)
+        else:
+            # No positional reads (Windows): seek and read under the lock
+            with self._lock:
+                os.lseek(fd, offset, os.SEEK_SET)
+                data = os.read(fd, length)
+        return json.loads(data)
+
+    def get(self, section, key):
+        """Read one record; raises KeyError if the section or key does not exist."""
+        return self._read(self.index["sections"][section][key])["dialogue"]
+
+    def sections(self):
+        return list(self.index["sections"])
+
+    def keys(self, section):
+        return list(self.index["sections"][section])
+
+    def iter_section(self, section):
+        """Lazily yield (key, dialogue) for a section, reading records in file order."""
+        entries = sorted(self.index["sections"][section].items(), key=lambda item: item[1])
+        for key, location in entries:
+            yield key, self._read(location)["dialogue"]
+
+    def close(self):
+        with self._lock:
+            for fd in self._fds.values():
+                os.close(fd)
+            self._fds.clear()
+
+
+def open_corpus(path):
+    """Return the backend for a corpus path (.json -> JsonCorpus, otherwise CorpusStore)."""
+    if path.endswith(".json") and not os.path.isdir(path):
+        return JsonCorpus(path)
+    return CorpusStore(path)
+
+
+def write_corpus(records, path, shard_records=None):
+    """
+    Write (section, key, dialogue) records as JSON Lines and build the index.
+
+    Args:
+        records (iterable): (section, key, dialogue) tuples
+        path (str): Output .jsonl file, or a directory when shard_records is set
+        shard_records (int): Records per shard (None writes a single file)
+
+    Returns:
+        CorpusStore: The written corpus
+    """
+    def open_shard(number):
+        if shard_records is None:
+            return open(path, "w", encoding="utf-8")
+        return open(os.path.join(path, f"shard-{number:05d}.jsonl"), "w", encoding="utf-8")
+
+    if shard_records is not None:
+        os.makedirs(path, exist_ok=True)
+    shard_number = 0
+    count = 0
+    f = open_shard(shard_number)
+    try:
+        for section, key, dialogue in records:
+            if shard_records is not None and count == shard_records:
+                f.close()
+                shard_number += 1
+                count = 0
+                f = open_shard(shard_number)
+            record = {"section": section, "key": key, "dialogue": dialogue}
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    finally:
+        f.close()
+    store = CorpusStore(path)
+    store.build_index()
+    return store
+
+
+_corpus = None
+
+
+def get_corpus():
+    """Return the default corpus (GEMINI_TTS_CORPUS, or the bundled sample_dialogues.json)."""
+    global _corpus
+    if _corpus is None:
+        _corpus = open_corpus(os.getenv("GEMINI_TTS_CORPUS", _FILE))
+    return _corpus
+
+
+def set_corpus(corpus):
+    """Replace the default corpus (None re-reads GEMINI_TTS_CORPUS on next use)."""
+    global _corpus
+    _corpus = corpus
+
+
 def get_dialogue(section, key):
-    """Return dialogue text or script from the JSON file."""
-    data = _load_dialogues()
-    return data[section][key]
+    """Return dialogue text or script from the default corpus."""
+    return get_corpus().get(section, key)
+
+
+def iter_dialogues(section=None):
+    """
+    Lazily yield (section, key, dialogue) from the default corpus.
+
+    Args:
+        section (str): Only this section (default: every section)
+    """
+    corpus = get_corpus()
+    for name in [section] if section is not None else corpus.sections():
+        for key, dialogue in corpus.iter_section(name):
+            yield name, key, dialogue
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dialogue corpus tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    convert = commands.add_parser("convert", help="Convert a JSON corpus to indexed JSON Lines")
+    convert.add_argument("source", help="Source corpus (.json, .jsonl or shard directory)")
+    convert.add_argument("target", help="Target .jsonl file, or directory with --shard-records")
+    convert.add_argument("--shard-records", type=int, help="Records per shard")
+    index = commands.add_parser("index", help="Rebuild the offset index of a JSON Lines corpus")
+    index.add_argument("path", help=".jsonl file or shard directory")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        source = open_corpus(args.source)
+        records = (
+            (section, key, dialogue)
+            for section in source.sections()
+            for key, dialogue in source.iter_section(section)
+        )
+        store = write_corpus(records, args.target, args.shard_records)
+        total = sum(len(keys) for keys in store.index["sections"].values())
+        print(f"✅ Wrote {total} dialogues in {len(store.shards)} shard(s) to {args.target}")
+    else:
+        store = CorpusStore(args.path)
+        built = store.build_index()
+        total = sum(len(keys) for keys in built["sections"].values())
+        print(f"✅ Indexed {total} dialogues in {len(store.shards)} shard(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,15 +7,44 @@ full-length audio versions using multi-speaker TTS.
 
 Usage:
     python full_papers_generator.py --paper [paper_name]
-    python full_papers_generator.py --all
+    python full_papers_generator.py --all [--jobs N]
+    python full_papers_generator.py --all --pipeline # overlap fetch, post-processing and disk writes
+    python full_papers_generator.py --all --resume   # skip papers finished by an earlier run
+    python full_papers_generator.py --verify         # check existing WAVs without synthesizing
+    python full_papers_generator.py --all --plan --rpm 10   # estimate the run without synthesizing
 """
 
-import os
 import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from gemini_tts_example import (
+    DEFAULT_MODEL,
+    PAPER_SPEAKERS,
+    PAPER_STYLE_PREAMBLE,
+    PAPER_TURN_STYLE_PREAMBLE,
+    chunk_requests,
+    fetch_chunks,
+    join_chunks,
+    save_wave_file,
+    set_verbose,
+    speaker_voices,
     text_to_speech_multi_speaker,
     create_full_paper_presentation,
+    require_credentials,
+    write_spooled_wave,
 )
+from audio_cache import print_cache_stats
+from key_pool import print_key_pool_stats
+from chunking import DEFAULT_MAX_CHARS
+from incremental_render import print_render_report, render_incremental
+from metrics import JsonLinesSink, PrometheusSink, add_sink, print_summary_table
+from pipeline import Pipeline, Stage, print_pipeline_stats
+from planner import add_plan_arguments, plan_from_args
+from postprocess import PostProcessor, get_default_postprocessor, set_default_postprocessor
+from run_manifest import OK, RunManifest, input_hash, print_verify_report
+from scheduler import priority, print_scheduler_stats, with_priority
+from spool import PCMSpool, get_memory_budget, set_memory_budget
 
 
 # Full paper scripts
@@ -125,8 +154,44 @@ PAPERS = {
 }
 
 
-def generate_paper_audio(paper_key):
-    """Generate audio for a specific paper."""
+DEFAULT_MANIFEST = "full_papers.manifest.json"
+
+
+def paper_job_hash(paper_key):
+    """Hash every input that determines a paper's audio."""
+    postprocess = get_default_postprocessor()
+    parts = [
+        DEFAULT_MODEL,
+        PAPER_SPEAKERS,
+        PAPER_STYLE_PREAMBLE,
+        DEFAULT_MAX_CHARS,
+        postprocess.settings() if postprocess else None,
+        PAPERS[paper_key]["script"],
+    ]
+    if postprocess and get_memory_budget() is not None:
+        # Post-processing a spooled WAV skips the chunk crossfades, so the audio differs
+        parts.append("spooled")
+    return input_hash(*parts)
+
+
+def paper_requests(paper_key):
+    """Return the (contents, voices) of every chunk request a paper would send."""
+    voices = speaker_voices(PAPER_SPEAKERS)
+    prompts = chunk_requests(PAPERS[paper_key]["script"], voices, PAPER_STYLE_PREAMBLE, DEFAULT_MAX_CHARS)
+    return [(contents, voices) for contents in prompts]
+
+
+def plan_papers(args, manifest):
+    """Print a dry-run plan for the papers selected on the command line."""
+    paper_keys = [args.paper] if args.paper else list(PAPERS)
+    if args.resume:
+        paper_keys = [key for key in paper_keys if manifest.check(key, paper_job_hash(key)) != OK]
+    jobs = [(PAPERS[key]["output"], paper_requests(key)) for key in paper_keys]
+    return plan_from_args(args, jobs, job_concurrency=args.jobs)
+
+
+def generate_paper_audio(paper_key, verbose=None, manifest=None):
+    """Generate audio for a specific paper, recording it in the manifest if given."""
     if paper_key not in PAPERS:
         print(f"❌ Error: Paper '{paper_key}' not found!")
         print(f"Available papers: {', '.join(PAPERS.keys())}")
@@ -138,32 +203,232 @@ def generate_paper_audio(paper_key):
             paper["title"],
             paper["script"],
             paper["output"],
+            verbose=verbose,
         )
+        if manifest is not None:
+            manifest.record(paper_key, paper_job_hash(paper_key), paper["output"])
         return True
     except Exception as e:
         print(f"❌ Error generating {paper['output']}: {e}")
         return False
 
 
-def generate_all_papers():
-    """Generate audio for all papers."""
+def render_paper_incremental(paper_key):
+    """Re-render a paper turn by turn, resynthesizing only edited or new turns."""
+    paper = PAPERS[paper_key]
+    print(f"📄 Incrementally rendering: {paper['title']}")
+    try:
+        report = render_incremental(
+            paper["script"],
+            PAPER_SPEAKERS,
+            paper["output"],
+            preamble=PAPER_TURN_STYLE_PREAMBLE,
+        )
+    except Exception as e:
+        print(f"❌ Error generating {paper['output']}: {e}")
+        return False
+    print_render_report(report)
+    print(f"✅ Presentation saved as: {paper['output']}")
+    return True
+
+
+def _run_paper_job(paper_key, manifest=None, verbose=False):
+    """Generate one paper (quietly by default) and return (success, elapsed_seconds, error)."""
+    paper = PAPERS[paper_key]
+    start = time.perf_counter()
+    try:
+        create_full_paper_presentation(
+            paper["title"],
+            paper["script"],
+            paper["output"],
+            verbose=verbose,
+        )
+        if manifest is not None:
+            # Checkpoint as soon as the paper is done, not when it is reported
+            manifest.record(paper_key, paper_job_hash(paper_key), paper["output"])
+        return True, time.perf_counter() - start, None
+    except Exception as e:
+        return False, time.perf_counter() - start, e
+
+
+def paper_pipeline(manifest=None, fetch_workers=1):
+    """Build the fetch -> assemble -> write pipeline for paper keys.
+
+    Fetching a paper waits on the network, assembling it (joining or
+    post-processing the chunks) is CPU work and writing it is disk I/O, so
+    each stage runs in its own threads and paper N is written while paper
+    N+1 is still being fetched.
+
+    With a memory budget (see spool.get_memory_budget()) each paper's chunks
+    go into a PCMSpool as they arrive and the write stage assembles the WAV
+    on disk, exactly as create_full_paper_presentation() does.
+
+    Args:
+        manifest (RunManifest): Checkpoint manifest updated after every written paper.
+        fetch_workers (int): Papers fetched concurrently.
+
+    Returns:
+        Pipeline: Its run() returns the seconds from fetch start to written WAV per paper.
+    """
+    postprocess = get_default_postprocessor() or None
+    memory_budget = get_memory_budget()
+    voices = speaker_voices(PAPER_SPEAKERS)
+
+    def fetch(paper_key):
+        start = time.perf_counter()
+        if memory_budget is None:
+            segments, _ = fetch_chunks(PAPERS[paper_key]["script"], voices, PAPER_STYLE_PREAMBLE)
+            return paper_key, start, segments
+        output = os.path.abspath(PAPERS[paper_key]["output"])
+        spool = PCMSpool(memory_budget, os.path.dirname(output))
+        try:
+            fetch_chunks(PAPERS[paper_key]["script"], voices, PAPER_STYLE_PREAMBLE, spool=spool)
+        except BaseException:
+            spool.close()
+            raise
+        return paper_key, start, spool
+
+    def assemble(item):
+        paper_key, start, segments = item
+        if isinstance(segments, PCMSpool):
+            # Spooled papers are assembled (and post-processed) file to file by the write stage
+            return item
+        return paper_key, start, join_chunks(segments, postprocess)
+
+    def write(item):
+        paper_key, start, audio = item
+        if isinstance(audio, PCMSpool):
+            with audio:
+                write_spooled_wave(audio, PAPERS[paper_key]["output"], postprocess)
+        else:
+            save_wave_file(PAPERS[paper_key]["output"], audio)
+        if manifest is not None:
+            manifest.record(paper_key, paper_job_hash(paper_key), PAPERS[paper_key]["output"])
+        return time.perf_counter() - start
+
+    return Pipeline([
+        Stage("fetch", fetch, workers=fetch_workers),
+        Stage("assemble", assemble),
+        Stage("write", write),
+    ])
+
+
+def generate_all_papers(jobs=1, manifest=None, resume=False, pipeline=False):
+    """Generate audio for all papers.
+
+    Args:
+        jobs (int): Maximum number of papers synthesized concurrently.
+        manifest (RunManifest): Checkpoint manifest updated after every finished paper.
+        resume (bool): Skip papers whose manifest entry still matches their inputs and output.
+        pipeline (bool): Run fetch, assembly and disk writes as overlapping stages
+            (see paper_pipeline()) and report per-stage busy and idle time.
+
+    Returns:
+        dict: paper_key -> {"success", "elapsed", "error", "skipped"} for every paper.
+    """
     print("🎓 Generating Full Academic Paper Presentations")
     print("=" * 60)
     
-    success_count = 0
+    results = {}
     total_count = len(PAPERS)
+    wall_start = time.perf_counter()
     
-    for paper_key in PAPERS.keys():
-        if generate_paper_audio(paper_key):
-            success_count += 1
+    pending = []
+    for paper_key, paper in PAPERS.items():
+        if resume and manifest is not None and manifest.check(paper_key, paper_job_hash(paper_key)) == OK:
+            print(f"⏭️  Skipping {paper['output']} (unchanged since last run)")
+            results[paper_key] = {"success": True, "elapsed": 0.0, "error": None, "skipped": True}
+        else:
+            pending.append(paper_key)
+    if len(pending) < total_count:
         print()
     
+    stages = None
+    if pipeline:
+        print(f"🏭 Pipelined run: {jobs} fetch worker(s), then assemble, then write")
+        print()
+        stages = paper_pipeline(manifest, fetch_workers=max(1, jobs))
+        outcomes = stages.run(pending, return_exceptions=True)
+        for paper_key, outcome in zip(pending, outcomes):
+            failed = isinstance(outcome, Exception)
+            results[paper_key] = {
+                "success": not failed,
+                "elapsed": 0.0 if failed else outcome,
+                "error": outcome if failed else None,
+                "skipped": False,
+            }
+            paper = PAPERS[paper_key]
+            if failed:
+                print(f"❌ Error generating {paper['output']}: {outcome}")
+            else:
+                print(f"✅ {paper['output']} - {paper['title']} ({outcome:.1f}s)")
+        print()
+    elif jobs <= 1:
+        for paper_key in pending:
+            success, elapsed, error = _run_paper_job(paper_key, manifest, verbose=None)
+            results[paper_key] = {"success": success, "elapsed": elapsed, "error": error, "skipped": False}
+            if not success:
+                print(f"❌ Error generating {PAPERS[paper_key]['output']}: {error}")
+            print()
+    else:
+        print(f"⚡ Running with {jobs} concurrent jobs")
+        print()
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                (paper_key, executor.submit(with_priority(_run_paper_job), paper_key, manifest))
+                for paper_key in pending
+            ]
+            # Report in PAPERS order regardless of completion order
+            for paper_key, future in futures:
+                success, elapsed, error = future.result()
+                results[paper_key] = {"success": success, "elapsed": elapsed, "error": error, "skipped": False}
+                paper = PAPERS[paper_key]
+                if success:
+                    print(f"✅ {paper['output']} - {paper['title']} ({elapsed:.1f}s)")
+                else:
+                    print(f"❌ Error generating {paper['output']}: {error} ({elapsed:.1f}s)")
+        print()
+    
+    wall_time = time.perf_counter() - wall_start
+    request_time = sum(result["elapsed"] for result in results.values())
+    success_count = sum(1 for result in results.values() if result["success"])
+    skipped_count = sum(1 for result in results.values() if result["skipped"])
+    results = {paper_key: results[paper_key] for paper_key in PAPERS}
+    
     print(f"🎉 Completed: {success_count}/{total_count} papers generated successfully!")
+    if skipped_count:
+        print(f"⏭️  {skipped_count} unchanged papers reused from the previous run")
+    speedup = request_time / wall_time if wall_time > 0 else 1.0
+    print(f"⏱️  Wall time: {wall_time:.1f}s | Summed request time: {request_time:.1f}s "
+          f"| Speedup: {speedup:.2f}x")
     
     if success_count > 0:
         print("\n📂 Generated files:")
-        for paper in PAPERS.values():
-            print(f"   • {paper['output']} - {paper['title']}")
+        for paper_key, paper in PAPERS.items():
+            if results[paper_key]["success"]:
+                print(f"   • {paper['output']} - {paper['title']}")
+    
+    failed = [key for key, result in results.items() if not result["success"]]
+    if failed:
+        print(f"\n⚠️  Failed papers: {', '.join(failed)}")
+    
+    print()
+    print_cache_stats()
+    print_key_pool_stats()
+    print_scheduler_stats()
+    if stages is not None:
+        print_pipeline_stats(stages)
+    print()
+    print_summary_table()
+    return results
+
+
+def verify_papers(manifest):
+    """Check every paper's WAV against the manifest without synthesizing anything."""
+    print("🔍 Verifying paper outputs against the manifest")
+    results = manifest.verify({paper_key: paper_job_hash(paper_key) for paper_key in PAPERS})
+    print_verify_report(results, {paper_key: paper["output"] for paper_key, paper in PAPERS.items()})
+    return results
 
 
 def main():
@@ -175,32 +440,97 @@ def main():
                        help="Generate all paper presentations")
     parser.add_argument("--list", "-l", action="store_true", 
                        help="List available papers")
+    parser.add_argument("--incremental", "-i", action="store_true",
+                       help="Render turn by turn and only resynthesize turns that changed")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                       help="Number of papers to generate concurrently with --all (default: 1)")
+    parser.add_argument("--pipeline", action="store_true",
+                       help="With --all, overlap network fetch, post-processing and disk writes in stages")
+    parser.add_argument("--resume", action="store_true",
+                       help="Skip papers whose output still matches the run manifest")
+    parser.add_argument("--verify", action="store_true",
+                       help="Check existing WAVs against the run manifest without synthesizing")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST,
+                       help=f"Run manifest path (default: {DEFAULT_MANIFEST})")
+    parser.add_argument("--postprocess", action="store_true",
+                       help="Trim silences, crossfade chunk joins and peak-normalize the output")
+    parser.add_argument("--memory-budget", type=float, metavar="MB",
+                       help="Keep at most MB of chunk audio in memory per paper and assemble the rest on disk")
+    parser.add_argument("--quiet", "-q", action="store_true",
+                       help="Suppress per-call output; print a metrics summary table at the end")
+    parser.add_argument("--metrics-jsonl", metavar="PATH",
+                       help="Append one JSON line of timing metrics per synthesis call to PATH")
+    parser.add_argument("--prometheus", metavar="PATH",
+                       help="Write Prometheus text-format metrics to PATH at the end of the run")
+    parser.add_argument("--priority", choices=["interactive", "default", "bulk"], default="bulk",
+                       help="Scheduler priority class for this run's requests (default: bulk)")
+    add_plan_arguments(parser)
     
     args = parser.parse_args()
     
-    # Check if API key is available
-    if not os.getenv("GEMINI_API_KEY"):
-        print("❌ Error: GEMINI_API_KEY environment variable not set!")
-        print("Please set your API key and try again.")
+    if args.postprocess:
+        set_default_postprocessor(PostProcessor())
+    if args.memory_budget is not None:
+        set_memory_budget(int(args.memory_budget * 1024 * 1024))
+    manifest = RunManifest(args.manifest)
+    if args.verify:
+        verify_papers(manifest)
+        return
+    if args.plan:
+        plan_papers(args, manifest)
         return
-    
     if args.list:
         print("📚 Available Papers:")
         for key, paper in PAPERS.items():
             print(f"   • {key}: {paper['title']}")
         return
     
-    if args.paper:
-        generate_paper_audio(args.paper)
+    # Check if API key is available
+    try:
+        require_credentials()
+    except ValueError:
+        print("❌ Error: GEMINI_API_KEY environment variable not set!")
+        print("Please set your API key and try again.")
+        return
+    
+    if args.quiet:
+        set_verbose(False)
+    if args.metrics_jsonl:
+        add_sink(JsonLinesSink(args.metrics_jsonl))
+    prometheus = add_sink(PrometheusSink()) if args.prometheus else None
+    
+    if args.incremental and (args.paper or args.all):
+        with priority(args.priority):
+            for paper_key in ([args.paper] if args.paper else PAPERS.keys()):
+                render_paper_incremental(paper_key)
+                print()
+    elif args.paper:
+        if args.resume and manifest.check(args.paper, paper_job_hash(args.paper)) == OK:
+            print(f"⏭️  Skipping {PAPERS[args.paper]['output']} (unchanged since last run)")
+        else:
+            with priority(args.priority):
+                generate_paper_audio(args.paper, manifest=manifest)
     elif args.all:
-        generate_all_papers()
+        with priority(args.priority):
+            generate_all_papers(jobs=args.jobs, manifest=manifest, resume=args.resume, pipeline=args.pipeline)
     else:
         print("🎓 Full Academic Papers TTS Generator")
         print("Use --help for usage options")
         print("Examples:")
         print("  python full_papers_generator.py --all")
+        print("  python full_papers_generator.py --all --jobs 4")
+        print("  python full_papers_generator.py --all --pipeline")
+        print("  python full_papers_generator.py --all --memory-budget 32")
+        print("  python full_papers_generator.py --all --resume")
+        print("  python full_papers_generator.py --verify")
+        print("  python full_papers_generator.py --all --plan --rpm 10 --tpm 100000")
+        print("  python full_papers_generator.py --all --quiet --prometheus tts.prom")
+        print("  python full_papers_generator.py --paper fineweb --incremental")
         print("  python full_papers_generator.py --paper gneiss_web")
         print("  python full_papers_generator.py --list")
+    
+    if prometheus is not None:
+        prometheus.write(args.prometheus)
 
 
 if __name__ == "__main__":
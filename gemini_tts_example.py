@@ -7,21 +7,445 @@ and save the output as a WAV file. Supports both single-speaker and multi-speake
 
 Requirements:
 - pip install google-genai
-- Set your GEMINI_API_KEY environment variable
+- Set your GEMINI_API_KEY environment variable (or GEMINI_API_KEYS /
+  GEMINI_TTS_KEY_POOL to spread requests over several keys, see key_pool.py)
 
 Supported models:
 - gemini-2.5-flash-preview-tts
 - gemini-2.5-pro-preview-tts
 """
 
+import asyncio
+import atexit
 import os
+import tempfile
+import threading
+import time
 import wave
-from google import genai
-from google.genai import types
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from audio_cache import cache_key, get_default_cache, print_cache_stats
+from backends import FakeBackend, TTSBackend
+from chunking import DEFAULT_MAX_CHARS, chunk_script, estimate_tokens
+from dialogue_model import Dialogue
 from dialogues import get_dialogue
+from hedging import print_hedge_stats, resolve_hedger
+from key_pool import get_key_pool, print_key_pool_stats
+from metrics import phase, print_summary_table, synthesis_span
+from pcm_buffer import PCMBuffer, iter_audio_parts
+from postprocess import get_default_postprocessor, print_postprocess_report, process_wave_file
+from retry import CallStats, call_with_retry, call_with_retry_async
+from scheduler import get_scheduler, with_priority
+from spool import PCMSpool, get_memory_budget
+from wav_writer import IncrementalWavWriter
 
 
-def save_wave_file(filename, pcm_data, channels=1, rate=24000, sample_width=2):
+DEFAULT_MODEL = "gemini-2.5-flash-preview-tts"
+
+# Per-call progress output; GEMINI_TTS_QUIET=1 or set_verbose(False) turns it
+# off so batch runs can print a metrics summary table instead
+_verbose = os.getenv("GEMINI_TTS_QUIET") != "1"
+
+# One long-lived client per API key so the underlying HTTP connection pool
+# (and its TLS sessions) is reused across calls instead of rebuilt each time.
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def set_verbose(verbose):
+    """Set the default for the verbose argument of the text_to_speech_* helpers."""
+    global _verbose
+    _verbose = bool(verbose)
+
+
+def _resolve_verbose(verbose):
+    return _verbose if verbose is None else verbose
+
+
+def _genai():
+    """
+    Import the Gemini SDK on first use.
+
+    google.genai and its dependency tree take several hundred milliseconds
+    to import, so CLI paths that never synthesize (--help, --list, --plan,
+    argument and credential errors) do not pay for it.
+
+    Returns:
+        tuple: (genai, types) modules
+    """
+    try:
+        from google import genai
+        from google.genai import types
+    except ImportError as e:
+        raise ImportError("Gemini synthesis requires the SDK: pip install google-genai") from e
+    return genai, types
+
+
+def _get_api_key():
+    """Return the API key from the environment or raise ValueError."""
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise ValueError("Please set the GEMINI_API_KEY environment variable")
+    return api_key
+
+
+def get_client(api_key=None):
+    """
+    Return the shared Gemini client for an API key, creating it on first use.
+
+    Args:
+        api_key (str): API key to use (default: GEMINI_API_KEY from the environment)
+
+    Returns:
+        genai.Client: Client reused by every call made with the same key
+    """
+    if api_key is None:
+        api_key = _get_api_key()
+    client = _clients.get(api_key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(api_key)
+            if client is None:
+                genai, _ = _genai()
+                client = genai.Client(api_key=api_key)
+                _clients[api_key] = client
+    return client
+
+
+def close_clients():
+    """Close every pooled client and empty the registry."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
+
+
+atexit.register(close_clients)
+
+
+def speaker_voices(speakers_config):
+    """
+    Convert a speakers_config list into a hashable speaker->voice tuple.
+
+    Args:
+        speakers_config (list): [{"name": "Alice", "voice": "Kore"}, ...]
+
+    Returns:
+        tuple: ((name, voice), ...) in the original speaker order
+    """
+    return tuple((speaker["name"], speaker["voice"]) for speaker in speakers_config)
+
+
+@lru_cache(maxsize=256)
+def get_speech_config(model, voices):
+    """
+    Return an interned GenerateContentConfig for a model and voice setup.
+
+    Args:
+        model (str): Model name the config is used with
+        voices (str | tuple): A single voice name, or a ((speaker, voice), ...)
+                              tuple as returned by speaker_voices()
+
+    Returns:
+        types.GenerateContentConfig: Shared config object; treat it as read-only
+    """
+    _, types = _genai()
+    if isinstance(voices, str):
+        speech_config = types.SpeechConfig(
+            voice_config=types.VoiceConfig(
+                prebuilt_voice_config=types.PrebuiltVoiceConfig(
+                    voice_name=voices,
+                )
+            )
+        )
+    else:
+        speech_config = types.SpeechConfig(
+            multi_speaker_voice_config=types.MultiSpeakerVoiceConfig(
+                speaker_voice_configs=[
+                    types.SpeakerVoiceConfig(
+                        speaker=name,
+                        voice_config=types.VoiceConfig(
+                            prebuilt_voice_config=types.PrebuiltVoiceConfig(
+                                voice_name=voice
+                            )
+                        )
+                    )
+                    for name, voice in voices
+                ]
+            )
+        )
+    return types.GenerateContentConfig(
+        response_modalities=["AUDIO"],
+        speech_config=speech_config,
+    )
+
+
+def extract_audio(response):
+    """
+    Return the PCM carried by a response, across every candidate and part.
+
+    Single-part responses are returned as-is; multi-part responses are
+    assembled into one preallocated buffer.
+
+    Args:
+        response: GenerateContentResponse from a TTS model
+
+    Returns:
+        bytes-like: 16-bit mono PCM at 24 kHz
+    """
+    parts = list(iter_audio_parts(response))
+    if not parts:
+        raise ValueError("Response did not contain any audio data")
+    if len(parts) == 1:
+        return parts[0]
+    buffer = PCMBuffer(sum(len(part) for part in parts))
+    buffer.extend(parts)
+    return buffer.view()
+
+
+def _validate_speakers(speakers_config):
+    """Raise ValueError unless exactly two speakers are configured."""
+    if len(speakers_config) > 2:
+        raise ValueError("Multi-speaker TTS supports maximum 2 speakers")
+    if len(speakers_config) < 2:
+        raise ValueError("Multi-speaker TTS requires at least 2 speakers")
+
+
+@contextmanager
+def _pooled_client(contents):
+    """
+    Lease a key from the key pool for one request and yield its client.
+
+    Quota errors raised inside the block drain the leased key (see
+    key_pool.py). With no pooled keys, the default client is used.
+    """
+    pool = get_key_pool()
+    if not pool:
+        yield get_client()
+        return
+    with pool.lease(estimate_tokens(contents)) as key:
+        yield get_client(key.api_key)
+
+
+class GeminiBackend(TTSBackend):
+    """Backend that calls the Gemini API through the pooled clients."""
+
+    name = "gemini"
+
+    def check_credentials(self):
+        if not get_key_pool():
+            raise ValueError("Please set the GEMINI_API_KEY environment variable")
+
+    def generate(self, contents, voices, model):
+        with _pooled_client(contents) as client:
+            with phase("config"):
+                config = get_speech_config(model, voices)
+            with phase("request"):
+                response = client.models.generate_content(model=model, contents=contents, config=config)
+        with phase("extract"):
+            return extract_audio(response)
+
+    async def generate_async(self, contents, voices, model):
+        with _pooled_client(contents) as client:
+            with phase("config"):
+                config = get_speech_config(model, voices)
+            with phase("request"):
+                response = await client.aio.models.generate_content(model=model, contents=contents, config=config)
+        with phase("extract"):
+            return extract_audio(response)
+
+    def stream(self, contents, voices, model):
+        with _pooled_client(contents) as client:
+            for response in client.models.generate_content_stream(
+                model=model,
+                contents=contents,
+                config=get_speech_config(model, voices),
+            ):
+                yield from iter_audio_parts(response)
+
+
+_backend = None
+
+
+def get_backend():
+    """Return the active synthesis backend (GEMINI_TTS_BACKEND=fake selects FakeBackend)."""
+    global _backend
+    if _backend is None:
+        _backend = FakeBackend() if os.getenv("GEMINI_TTS_BACKEND") == "fake" else GeminiBackend()
+    return _backend
+
+
+def set_backend(backend):
+    """Replace the active synthesis backend (pass None to go back to the default)."""
+    global _backend
+    _backend = backend
+
+
+def require_credentials():
+    """Raise ValueError early if the active backend cannot make requests."""
+    get_backend().check_credentials()
+
+
+def _scheduled_generate(contents, voices, model):
+    # One scheduler slot per attempt, so retry backoff never holds a slot
+    with get_scheduler().slot(cost=len(contents)):
+        return get_backend().generate(contents, voices, model)
+
+
+async def _scheduled_generate_async(contents, voices, model):
+    async with get_scheduler().slot_async(cost=len(contents)):
+        return await get_backend().generate_async(contents, voices, model)
+
+
+def _hedge_admission(scheduler, cost):
+    """Return an admit() for Hedger: a hedge takes a free slot of its own or is not sent."""
+    def admit():
+        ticket = scheduler.try_acquire(cost=cost)
+        return None if ticket is None else lambda: scheduler.release(ticket)
+
+    return admit
+
+
+def _hedged_generate(hedger, contents, voices, model):
+    # The primary queues for its slot before the hedger starts timing it, and
+    # each attempt gives its slot back when it finishes, even after losing
+    scheduler = get_scheduler()
+    with phase("queue"):
+        ticket = scheduler.acquire(cost=len(contents))
+    return hedger.call(get_backend().generate, contents, voices, model, size=len(contents),
+                       admit=_hedge_admission(scheduler, len(contents)), release=lambda: scheduler.release(ticket))
+
+
+async def _hedged_generate_async(hedger, contents, voices, model):
+    scheduler = get_scheduler()
+    with phase("queue"):
+        ticket = await scheduler.acquire_async(cost=len(contents))
+    return await hedger.call_async(get_backend().generate_async, contents, voices, model, size=len(contents),
+                                   admit=_hedge_admission(scheduler, len(contents)),
+                                   release=lambda: scheduler.release(ticket))
+
+
+def synthesize_pcm(contents, voices, model=DEFAULT_MODEL, cache=None, stats=None, hedge=None):
+    """
+    Run one TTS request through the active backend and return raw PCM.
+
+    Identical requests are served from the on-disk audio cache without
+    touching the network. Every attempt waits for a slot in the current
+    priority class (see scheduler.py). Retryable and rate-limited errors are
+    retried with backoff behind the shared circuit breaker (see retry.py).
+
+    Args:
+        contents (str): Prompt text (including any style instruction)
+        voices (str | tuple): Voice name or ((speaker, voice), ...) tuple
+        model (str): TTS model name
+        cache (AudioCache): Cache to use (default: the process-wide cache;
+                            pass False to bypass caching)
+        stats (CallStats): Optional object that receives retry counts and
+                           time spent backing off
+        hedge (bool | Hedger): Send a duplicate of attempts slower than the
+                               hedge delay (True: the process-wide Hedger,
+                               see hedging.py)
+
+    Returns:
+        bytes: 16-bit mono PCM at 24 kHz
+    """
+    if cache is None:
+        cache = get_default_cache()
+    if stats is None:
+        stats = CallStats()
+    with synthesis_span("synthesize", model, voices, len(contents)) as span:
+        key = None
+        if cache:
+            key = cache_key(model, contents, voices)
+            cached = cache.get(key)
+            if cached is not None:
+                span.record_request(cached, cache_hit=True)
+                return cached
+
+        hedger = resolve_hedger(hedge)
+        if hedger:
+            audio_data = call_with_retry(_hedged_generate, hedger, contents, voices, model, stats=stats)
+        else:
+            audio_data = call_with_retry(_scheduled_generate, contents, voices, model, stats=stats)
+        span.record_request(audio_data, retries=stats.retries)
+        if cache:
+            cache.put(key, audio_data)
+        return audio_data
+
+
+def stream_pcm(contents, voices, model=DEFAULT_MODEL):
+    """
+    Stream synthesized PCM as it is generated.
+
+    Uses the SDK's streaming generate call, so the first chunk is available
+    long before the whole clip has been generated. Streaming bypasses the
+    audio cache; the stream holds one scheduler slot until it is closed.
+
+    Args:
+        contents (str): Prompt text (including any style instruction)
+        voices (str | tuple): Voice name or ((speaker, voice), ...) tuple
+        model (str): TTS model name
+
+    Yields:
+        bytes: Consecutive chunks of 16-bit mono PCM at 24 kHz
+    """
+    with get_scheduler().slot(cost=len(contents)):
+        yield from get_backend().stream(contents, voices, model)
+
+
+def stream_to_wave_file(contents, voices, output_file, model=DEFAULT_MODEL, on_chunk=None):
+    """
+    Stream synthesis straight into a WAV file, appending frames as they arrive.
+
+    Args:
+        contents (str): Prompt text (including any style instruction)
+        voices (str | tuple): Voice name or ((speaker, voice), ...) tuple
+        output_file (str | file): Output filename or binary file object
+        model (str): TTS model name
+        on_chunk (callable): Optional callback invoked with each PCM chunk
+
+    Returns:
+        dict: "bytes", "duration" (audio seconds), "first_chunk_latency" and
+              "total_latency" (seconds)
+    """
+    start = time.perf_counter()
+    first_chunk_latency = None
+    with synthesis_span("stream", model, voices, len(contents)) as span, \
+            IncrementalWavWriter(output_file) as writer:
+        chunks = stream_pcm(contents, voices, model)
+        while True:
+            with phase("request"):
+                chunk = next(chunks, None)
+            if chunk is None:
+                break
+            if first_chunk_latency is None:
+                first_chunk_latency = time.perf_counter() - start
+            with phase("write"):
+                writer.write(chunk)
+            if on_chunk is not None:
+                on_chunk(chunk)
+        span.bytes = writer.bytes_written
+    return {
+        "bytes": writer.bytes_written,
+        "duration": writer.duration,
+        "first_chunk_latency": first_chunk_latency,
+        "total_latency": time.perf_counter() - start,
+    }
+
+
+def _print_retry_stats(stats):
+    """Print retry/backoff counts for a call that needed more than one attempt."""
+    if stats.retries or stats.breaker_wait_seconds:
+        print(f"🔁 Retries: {stats.retries} ({stats.backoff_seconds:.1f}s backing off, "
+              f"{stats.breaker_wait_seconds:.1f}s paused by circuit breaker)")
+
+
+def save_wave_file(filename, pcm_data, channels=1, rate=24000, sample_width=2, postprocess=None):
     """
     Save PCM audio data to a WAV file.
     
@@ -31,15 +455,24 @@ def save_wave_file(filename, pcm_data, channels=1, rate=24000, sample_width=2):
         channels (int): Number of audio channels (default: 1 for mono)
         rate (int): Sample rate in Hz (default: 24000)
         sample_width (int): Sample width in bytes (default: 2)
+        postprocess (PostProcessor): Optional trim/normalize stage applied before writing
+    
+    Returns:
+        bytes-like: The PCM that was written
     """
+    if postprocess:
+        with phase("postprocess"):
+            pcm_data = postprocess.process(pcm_data)
     with wave.open(filename, "wb") as wf:
         wf.setnchannels(channels)
         wf.setsampwidth(sample_width)
         wf.setframerate(rate)
         wf.writeframes(pcm_data)
+    return pcm_data
 
 
-def text_to_speech_simple(text, voice_name="kore", output_file="output.wav"):
+def text_to_speech_simple(text, voice_name="kore", output_file="output.wav", model=DEFAULT_MODEL,
+                          verbose=None, hedge=None):
     """
     Convert text to speech using Gemini API.
     
@@ -47,54 +480,50 @@ def text_to_speech_simple(text, voice_name="kore", output_file="output.wav"):
         text (str): Text to convert to speech
         voice_name (str): Voice to use (default: "Kore")
         output_file (str): Output filename (default: "output.wav")
+        model (str): TTS model name (default: DEFAULT_MODEL)
+        verbose (bool): Print progress and errors (default: module setting, see set_verbose)
+        hedge (bool | Hedger): Hedge slow requests with a duplicate (see hedging.py)
     
     Available voices include:
     - Kore (Firm), Zephyr (Bright), Puck (Upbeat), Charon (Informative)
     - Fenrir (Excitable), Aoede (Breezy), Enceladus (Breathy), etc.
+    
+    Returns:
+        bytes: The PCM audio that was written (served from the audio cache
+               when the same request was synthesized before)
     """
     
-    # Get API key from environment variable
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("Please set the GEMINI_API_KEY environment variable")
+    verbose = _resolve_verbose(verbose)
     
-    # Initialize the Gemini client
-    client = genai.Client(api_key=api_key)
+    # Fail fast on a missing API key before doing any work
+    require_credentials()
     
     try:
-        # Generate speech from text
-        response = client.models.generate_content(
-            model="gemini-2.5-flash-preview-tts",
-            contents=text,
-            config=types.GenerateContentConfig(
-                response_modalities=["AUDIO"],
-                speech_config=types.SpeechConfig(
-                    voice_config=types.VoiceConfig(
-                        prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                            voice_name=voice_name,
-                        )
-                    )
-                ),
-            )
-        )
+        with synthesis_span("text_to_speech_simple", model, voice_name, len(text)):
+            # Generate speech from text using the shared client and config
+            stats = CallStats()
+            audio_data = synthesize_pcm(text, voice_name, model, stats=stats, hedge=hedge)
+            
+            # Save to WAV file
+            with phase("write"):
+                save_wave_file(output_file, audio_data)
         
-        # Extract audio data from response
-        audio_data = response.candidates[0].content.parts[0].inline_data.data
-        
-        # Save to WAV file
-        save_wave_file(output_file, audio_data)
-        
-        print(f"✅ Speech generated successfully!")
-        print(f"📄 Text: {text}")
-        print(f"🎤 Voice: {voice_name}")
-        print(f"💾 Saved to: {output_file}")
+        if verbose:
+            print(f"✅ Speech generated successfully!")
+            print(f"📄 Text: {text}")
+            print(f"🎤 Voice: {voice_name}")
+            print(f"💾 Saved to: {output_file}")
+            _print_retry_stats(stats)
+        return audio_data
         
     except Exception as e:
-        print(f"❌ Error generating speech: {e}")
+        if verbose:
+            print(f"❌ Error generating speech: {e}")
         raise
 
 
-def text_to_speech_with_style(text, style_instruction, voice_name="kore", output_file="styled_output.wav"):
+def text_to_speech_with_style(text, style_instruction, voice_name="kore", output_file="styled_output.wav",
+                              model=DEFAULT_MODEL, verbose=None, hedge=None):
     """
     Convert text to speech with style control using natural language prompts.
     
@@ -103,131 +532,538 @@ def text_to_speech_with_style(text, style_instruction, voice_name="kore", output
         style_instruction (str): Style instruction (e.g., "Say cheerfully:", "Say in a whisper:")
         voice_name (str): Voice to use
         output_file (str): Output filename
+        model (str): TTS model name
+        verbose (bool): Print progress and errors
+        hedge (bool | Hedger): Hedge slow requests with a duplicate (see hedging.py)
+    
+    Returns:
+        bytes: The PCM audio that was written
     """
     
     # Combine style instruction with text
     full_prompt = f"{style_instruction} {text}"
     
-    text_to_speech_simple(full_prompt, voice_name, output_file)
+    return text_to_speech_simple(full_prompt, voice_name, output_file, model, verbose, hedge)
 
 
-def text_to_speech_multi_speaker(dialogue_text, speakers_config, output_file="multi_speaker.wav"):
+def text_to_speech_multi_speaker(dialogue_text, speakers_config, output_file="multi_speaker.wav",
+                                 model=DEFAULT_MODEL, verbose=None):
     """
     Convert dialogue text to speech with multiple speakers (up to 2 speakers).
     
     Args:
-        dialogue_text (str): Dialogue text with speaker names (e.g., "Speaker1: Hello! Speaker2: Hi there!")
+        dialogue_text (str | Dialogue): Dialogue text with speaker names (e.g., "Speaker1: Hello! Speaker2: Hi there!")
         speakers_config (list): List of dictionaries with speaker configuration
                                [{"name": "Speaker1", "voice": "Kore"}, {"name": "Speaker2", "voice": "Puck"}]
         output_file (str): Output filename
+        model (str): TTS model name
+        verbose (bool): Print progress and errors (default: module setting, see set_verbose)
     
     Example speakers_config:
         [
             {"name": "Alice", "voice": "Kore", "style": "friendly"},
             {"name": "Bob", "voice": "Puck", "style": "excited"}
         ]
+    
+    Returns:
+        bytes: The PCM audio that was written (served from the audio cache
+               when the same request was synthesized before)
     """
     
-    # Get API key from environment variable
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("Please set the GEMINI_API_KEY environment variable")
+    verbose = _resolve_verbose(verbose)
     
-    # Validate speakers (max 2 for multi-speaker TTS)
-    if len(speakers_config) > 2:
-        raise ValueError("Multi-speaker TTS supports maximum 2 speakers")
-    if len(speakers_config) < 2:
-        raise ValueError("Multi-speaker TTS requires at least 2 speakers")
+    # Validate speakers (max 2 for multi-speaker TTS) and the labels used in the text
+    _validate_speakers(speakers_config)
+    dialogue_text = Dialogue.for_speakers(dialogue_text, speakers_config).to_text()
     
-    # Initialize the Gemini client
-    client = genai.Client(api_key=api_key)
-    
-    # Build speaker voice configurations
-    speaker_voice_configs = []
-    for speaker in speakers_config:
-        speaker_voice_configs.append(
-            types.SpeakerVoiceConfig(
-                speaker=speaker["name"],
-                voice_config=types.VoiceConfig(
-                    prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                        voice_name=speaker["voice"]
-                    )
-                )
-            )
-        )
+    # Fail fast on a missing API key before doing any work
+    require_credentials()
     
     try:
-        # Generate multi-speaker speech
-        response = client.models.generate_content(
-            model="gemini-2.5-flash-preview-tts",
-            contents=dialogue_text,
-            config=types.GenerateContentConfig(
-                response_modalities=["AUDIO"],
-                speech_config=types.SpeechConfig(
-                    multi_speaker_voice_config=types.MultiSpeakerVoiceConfig(
-                        speaker_voice_configs=speaker_voice_configs
-                    )
-                ),
-            )
-        )
-        
-        # Extract audio data from response
-        audio_data = response.candidates[0].content.parts[0].inline_data.data
+        voices = speaker_voices(speakers_config)
+        with synthesis_span("text_to_speech_multi_speaker", model, voices, len(dialogue_text)):
+            # Generate multi-speaker speech using the shared client and config
+            stats = CallStats()
+            audio_data = synthesize_pcm(dialogue_text, voices, model, stats=stats)
+            
+            # Save to WAV file
+            with phase("write"):
+                save_wave_file(output_file, audio_data)
         
-        # Save to WAV file
-        save_wave_file(output_file, audio_data)
-        
-        print(f"✅ Multi-speaker speech generated successfully!")
-        print(f"📄 Dialogue: {dialogue_text}")
-        print(f"🎤 Speakers: {', '.join([f'{s['name']} ({s['voice']})' for s in speakers_config])}")
-        print(f"💾 Saved to: {output_file}")
+        if verbose:
+            print(f"✅ Multi-speaker speech generated successfully!")
+            print(f"📄 Dialogue: {dialogue_text}")
+            speaker_list = ", ".join(f"{s['name']} ({s['voice']})" for s in speakers_config)
+            print(f"🎤 Speakers: {speaker_list}")
+            print(f"💾 Saved to: {output_file}")
+            _print_retry_stats(stats)
+        return audio_data
         
     except Exception as e:
-        print(f"❌ Error generating multi-speaker speech: {e}")
+        if verbose:
+            print(f"❌ Error generating multi-speaker speech: {e}")
         raise
 
 
+async def synthesize_pcm_async(contents, voices, model=DEFAULT_MODEL, cache=None, stats=None, hedge=None):
+    """
+    Async counterpart of synthesize_pcm using the backend's async path
+    (the SDK's async client for Gemini).
+
+    Cache lookups and writes run in the default executor so the event loop
+    never blocks on disk I/O.
+
+    Args:
+        contents (str): Prompt text (including any style instruction)
+        voices (str | tuple): Voice name or ((speaker, voice), ...) tuple
+        model (str): TTS model name
+        cache (AudioCache): Cache to use (default: the process-wide cache;
+                            pass False to bypass caching)
+        stats (CallStats): Optional object that receives retry counts and
+                           time spent backing off
+        hedge (bool | Hedger): Send a duplicate of attempts slower than the
+                               hedge delay; the losing attempt is cancelled
+
+    Returns:
+        bytes: 16-bit mono PCM at 24 kHz
+    """
+    loop = asyncio.get_running_loop()
+    if cache is None:
+        cache = get_default_cache()
+    if stats is None:
+        stats = CallStats()
+    with synthesis_span("synthesize_async", model, voices, len(contents)) as span:
+        key = None
+        if cache:
+            key = cache_key(model, contents, voices)
+            cached = await loop.run_in_executor(None, cache.get, key)
+            if cached is not None:
+                span.record_request(cached, cache_hit=True)
+                return cached
+
+        hedger = resolve_hedger(hedge)
+        if hedger:
+            audio_data = await call_with_retry_async(
+                _hedged_generate_async, hedger, contents, voices, model, stats=stats
+            )
+        else:
+            audio_data = await call_with_retry_async(
+                _scheduled_generate_async, contents, voices, model, stats=stats
+            )
+        span.record_request(audio_data, retries=stats.retries)
+        if cache:
+            await loop.run_in_executor(None, cache.put, key, audio_data)
+        return audio_data
+
+
+async def save_wave_file_async(filename, pcm_data, channels=1, rate=24000, sample_width=2):
+    """Write a WAV file from the default executor without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(
+        None, save_wave_file, filename, pcm_data, channels, rate, sample_width
+    )
+
+
+async def text_to_speech_simple_async(text, voice_name="kore", output_file=None, model=DEFAULT_MODEL, hedge=None):
+    """
+    Async counterpart of text_to_speech_simple.
+
+    Args:
+        text (str): Text to convert to speech
+        voice_name (str): Voice to use (default: "Kore")
+        output_file (str): Optional WAV file to write; None just returns the PCM
+        model (str): TTS model name
+        hedge (bool | Hedger): Hedge slow requests with a duplicate (see hedging.py)
+
+    Returns:
+        bytes: The synthesized PCM audio
+    """
+    require_credentials()
+    with synthesis_span("text_to_speech_simple_async", model, voice_name, len(text)):
+        audio_data = await synthesize_pcm_async(text, voice_name, model, hedge=hedge)
+        if output_file:
+            with phase("write"):
+                await save_wave_file_async(output_file, audio_data)
+    return audio_data
+
+
+async def text_to_speech_with_style_async(text, style_instruction, voice_name="kore", output_file=None,
+                                          model=DEFAULT_MODEL, hedge=None):
+    """
+    Async counterpart of text_to_speech_with_style.
+
+    Args:
+        text (str): Text to convert to speech
+        style_instruction (str): Style instruction (e.g., "Say cheerfully:")
+        voice_name (str): Voice to use
+        output_file (str): Optional WAV file to write
+        model (str): TTS model name
+        hedge (bool | Hedger): Hedge slow requests with a duplicate (see hedging.py)
+
+    Returns:
+        bytes: The synthesized PCM audio
+    """
+    full_prompt = f"{style_instruction} {text}"
+    return await text_to_speech_simple_async(full_prompt, voice_name, output_file, model, hedge)
+
+
+async def text_to_speech_multi_speaker_async(dialogue_text, speakers_config, output_file=None,
+                                             model=DEFAULT_MODEL):
+    """
+    Async counterpart of text_to_speech_multi_speaker.
+
+    Args:
+        dialogue_text (str | Dialogue): Dialogue text with speaker names
+        speakers_config (list): Exactly two {"name": ..., "voice": ...} dicts
+        output_file (str): Optional WAV file to write
+        model (str): TTS model name
+
+    Returns:
+        bytes: The synthesized PCM audio
+    """
+    _validate_speakers(speakers_config)
+    dialogue_text = Dialogue.for_speakers(dialogue_text, speakers_config).to_text()
+    require_credentials()
+    voices = speaker_voices(speakers_config)
+    with synthesis_span("text_to_speech_multi_speaker_async", model, voices, len(dialogue_text)):
+        audio_data = await synthesize_pcm_async(dialogue_text, voices, model)
+        if output_file:
+            with phase("write"):
+                await save_wave_file_async(output_file, audio_data)
+    return audio_data
+
+
+async def synthesize_batch_async(requests, model=DEFAULT_MODEL, max_concurrency=64, return_exceptions=False):
+    """
+    Synthesize many requests on one event loop with bounded concurrency.
+
+    Args:
+        requests (iterable): (contents, voices) pairs, where voices is a voice
+                             name or a speakers_config list / speaker_voices tuple
+        model (str): TTS model name
+        max_concurrency (int): Maximum number of requests in flight at once
+        return_exceptions (bool): Return exceptions in place of results
+                                  instead of raising the first one
+
+    Returns:
+        list: PCM bytes (or exceptions) in the same order as requests
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(contents, voices):
+        if isinstance(voices, list):
+            voices = speaker_voices(voices)
+        async with semaphore:
+            return await synthesize_pcm_async(contents, voices, model)
+
+    return await asyncio.gather(
+        *(run_one(contents, voices) for contents, voices in requests),
+        return_exceptions=return_exceptions,
+    )
+
+
 def create_dialogue_from_script(script_lines):
     """
     Helper function to create dialogue text from a list of script lines.
     
     Args:
-        script_lines (list): List of tuples with (speaker_name, text)
+        script_lines (list | Dialogue): List of tuples with (speaker_name, text)
                             [("Alice", "Hello there!"), ("Bob", "Hi Alice, how are you?")]
     
     Returns:
         str: Formatted dialogue text
     """
-    dialogue_parts = []
-    for speaker, text in script_lines:
-        dialogue_parts.append(f"{speaker}: {text}")
-    
-    return "\n".join(dialogue_parts)
+    return Dialogue.coerce(script_lines).to_text()
+
+
+def chunk_requests(script, voices, preamble="", max_chars=DEFAULT_MAX_CHARS, max_tokens=None):
+    """
+    Return the prompt of every request synthesize_chunked() would send.
+
+    Args:
+        script (str | Dialogue): Dialogue script in "Speaker: text" form
+        voices (str | tuple): Voice name or ((speaker, voice), ...) tuple
+        preamble (str): Style instruction prepended to every chunk
+        max_chars (int): Character budget per chunk
+        max_tokens (int): Optional token budget per chunk
+
+    Returns:
+        list: Prompt strings in script order
+
+    Raises:
+        ValueError: If voices is a tuple and the script uses a speaker without a voice
+    """
+    if isinstance(voices, str):
+        dialogue = Dialogue.coerce(script)
+    else:
+        dialogue = Dialogue.for_speakers(script, [{"name": name, "voice": voice} for name, voice in voices])
+    chunks = chunk_script(dialogue, max_chars=max_chars, max_tokens=max_tokens)
+    return [f"{preamble}{chunk}" if preamble else chunk for chunk in chunks]
+
+
+def fetch_chunks(script, voices, preamble="", model=DEFAULT_MODEL, max_chars=DEFAULT_MAX_CHARS, max_tokens=None,
+                 max_workers=4, spool=None):
+    """
+    Synthesize the chunks of a long script concurrently, without joining them.
+
+    Args:
+        script (str | Dialogue): Dialogue script in "Speaker: text" form
+        voices (str | tuple): Voice name or ((speaker, voice), ...) tuple
+        preamble (str): Style instruction prepended to every chunk
+        model (str): TTS model name
+        max_chars (int): Character budget per chunk
+        max_tokens (int): Optional token budget per chunk
+        max_workers (int): Maximum number of chunks synthesized at once
+        spool (PCMSpool): Optional spool that takes every chunk as soon as it
+                          arrives instead of holding it in the returned list
+
+    Returns:
+        tuple: (segments, report) where segments holds the PCM of every chunk
+               in script order (None with a spool) and report is a list of
+               dicts with "index", "chars" and "latency" (seconds) for every chunk
+    """
+    chunks = chunk_requests(script, voices, preamble, max_chars=max_chars, max_tokens=max_tokens)
+
+    def run_chunk(index):
+        start = time.perf_counter()
+        audio = synthesize_pcm(chunks[index], voices, model)
+        if spool is not None:
+            spool.put(index, audio)
+            audio = None
+        return audio, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+        results = list(executor.map(with_priority(run_chunk), range(len(chunks))))
+
+    report = [
+        {"index": index, "chars": len(chunks[index]) - len(preamble), "latency": latency}
+        for index, (_, latency) in enumerate(results)
+    ]
+    if spool is not None:
+        return None, report
+    return [audio for audio, _ in results], report
+
+
+def join_chunks(segments, postprocess=None):
+    """
+    Stitch chunk PCM into one clip.
+
+    Without post-processing each chunk is released as soon as it is copied
+    in, so peak memory stays close to the size of the stitched clip.
+
+    Args:
+        segments (list): PCM of every chunk in order (emptied in place when
+                         there is no post-processing)
+        postprocess (PostProcessor): Optional stage that trims, crossfades and
+                                     normalizes the chunks instead of a plain join
+
+    Returns:
+        bytes-like: The stitched PCM
+    """
+    if postprocess:
+        with phase("postprocess"):
+            return postprocess.process(segments)
+    buffer = PCMBuffer(sum(len(audio) for audio in segments))
+    buffer.drain(segments)
+    return buffer.view()
+
+
+def synthesize_chunked(script, voices, preamble="", model=DEFAULT_MODEL, max_chars=DEFAULT_MAX_CHARS,
+                       max_tokens=None, max_workers=4, postprocess=None):
+    """
+    Synthesize a long script as concurrent chunks split at speaker turns.
+
+    Each chunk is sent with the same style preamble, and the PCM is stitched
+    back together in script order.
+
+    Args:
+        script (str | Dialogue): Dialogue script in "Speaker: text" form
+        voices (str | tuple): Voice name or ((speaker, voice), ...) tuple
+        preamble (str): Style instruction prepended to every chunk
+        model (str): TTS model name
+        max_chars (int): Character budget per chunk
+        max_tokens (int): Optional token budget per chunk
+        max_workers (int): Maximum number of chunks synthesized at once
+        postprocess (PostProcessor): Optional stage that trims, crossfades and
+                                     normalizes the chunks instead of a plain join
+
+    Returns:
+        tuple: (pcm, report) where pcm is a bytes-like view of the stitched
+               audio and report is a list of dicts with "index", "chars"
+               and "latency" (seconds) for every chunk
+    """
+    segments, report = fetch_chunks(script, voices, preamble, model, max_chars, max_tokens, max_workers)
+    return join_chunks(segments, postprocess), report
+
+
+def synthesize_chunked_to_file(script, voices, output_file, preamble="", model=DEFAULT_MODEL,
+                               max_chars=DEFAULT_MAX_CHARS, max_tokens=None, max_workers=4,
+                               memory_budget=0, postprocess=None):
+    """
+    Synthesize a long script straight into a WAV file with bounded memory.
+
+    Chunks are synthesized concurrently as in synthesize_chunked(), but every
+    finished chunk goes into a PCMSpool that keeps at most memory_budget
+    bytes in memory and spills the rest next to the output file. The WAV is
+    then assembled with kernel-side copies (see spool.py), so peak memory
+    does not grow with the length of the script.
+
+    With postprocess, the assembled WAV is post-processed file to file,
+    block by block (postprocess.process_wave_file): silence is trimmed and
+    the level normalized over the whole file, but chunk joins are not
+    crossfaded.
+
+    Args:
+        script (str | Dialogue): Dialogue script in "Speaker: text" form
+        voices (str | tuple): Voice name or ((speaker, voice), ...) tuple
+        output_file (str): Output WAV filename
+        preamble (str): Style instruction prepended to every chunk
+        model (str): TTS model name
+        max_chars (int): Character budget per chunk
+        max_tokens (int): Optional token budget per chunk
+        max_workers (int): Maximum number of chunks synthesized at once
+        memory_budget (int): Bytes of chunk PCM kept in memory
+        postprocess (PostProcessor): Optional trim/normalize stage
+
+    Returns:
+        tuple: (report, stats) where report is the per-chunk list returned by
+               synthesize_chunked() and stats holds the spool counters, the
+               "bytes" written and, with postprocess, the "postprocess" report
+    """
+    # Spilling next to the output keeps the final copy on one filesystem
+    with PCMSpool(memory_budget, os.path.dirname(os.path.abspath(output_file))) as spool:
+        _, report = fetch_chunks(script, voices, preamble, model, max_chars, max_tokens, max_workers, spool=spool)
+        stats = write_spooled_wave(spool, output_file, postprocess)
+    return report, stats
+
+
+def write_spooled_wave(spool, output_file, postprocess=None):
+    """
+    Assemble a filled PCMSpool into a WAV file, post-processing it file to file.
+
+    The spool is closed once the WAV is assembled, before post-processing.
 
+    Args:
+        spool (PCMSpool): Spool holding every chunk of the output
+        output_file (str): Output WAV filename
+        postprocess (PostProcessor): Optional trim/normalize stage
+
+    Returns:
+        dict: The spool counters, the "bytes" written and, with postprocess,
+              the "postprocess" report
+    """
+    target = output_file
+    if postprocess:
+        fd, target = tempfile.mkstemp(suffix=".wav", dir=os.path.dirname(os.path.abspath(output_file)))
+        os.close(fd)
+    try:
+        with phase("write"):
+            written = spool.write_wave(target)
+        stats = dict(spool.stats(), bytes=written)
+        spool.close()
+        if postprocess:
+            with phase("postprocess"):
+                stats["postprocess"] = process_wave_file(target, output_file, postprocess)
+    finally:
+        if target != output_file:
+            os.remove(target)
+    return stats
 
-def create_full_paper_presentation(paper_name, full_script, output_file):
+
+# Narrators and style shared by every full paper presentation
+PAPER_SPEAKERS = [
+    {"name": "Narrator 1", "voice": "kore"},
+    {"name": "Narrator 2", "voice": "charon"},
+]
+PAPER_STYLE_PREAMBLE = (
+    "Make both narrators sound professional and informative, "
+    "suitable for an academic presentation: "
+)
+# Style for one narrator's turn rendered on its own (see incremental_render.py)
+PAPER_TURN_STYLE_PREAMBLE = (
+    "Read this line in a professional and informative voice, "
+    "suitable for an academic presentation: "
+)
+
+
+def create_full_paper_presentation(paper_name, full_script, output_file, verbose=None,
+                                   max_chunk_chars=DEFAULT_MAX_CHARS, max_workers=4, postprocess=None,
+                                   memory_budget=None):
     """Create a full paper presentation from the complete script.
 
+    The script is split at speaker turns into chunks of at most
+    max_chunk_chars characters, which are synthesized concurrently and
+    stitched into one WAV. With a memory budget the chunks are assembled
+    on disk (see synthesize_chunked_to_file()) instead of in memory.
+
     Args:
         paper_name (str): Name of the paper.
-        full_script (str): Complete script text.
+        full_script (str | Dialogue): Complete script text.
         output_file (str): Output WAV filename.
-    """
-    print(f"📄 Creating full presentation: {paper_name}")
+        verbose (bool): Print progress messages and the per-chunk report.
+        max_chunk_chars (int): Character budget per chunk.
+        max_workers (int): Maximum number of chunks synthesized at once.
+        postprocess (PostProcessor): Trim/crossfade/normalize stage (default:
+            get_default_postprocessor(); False disables it).
+        memory_budget (int): Bytes of chunk PCM kept in memory before spilling
+            to disk (default: get_memory_budget(); False assembles in memory).
 
-    speakers = [
-        {"name": "Narrator 1", "voice": "kore"},
-        {"name": "Narrator 2", "voice": "charon"},
-    ]
+    Returns:
+        bytes-like: The PCM audio that was written, or None when it was
+            assembled on disk.
+    """
+    verbose = _resolve_verbose(verbose)
+    if postprocess is None:
+        postprocess = get_default_postprocessor()
+    if memory_budget is None:
+        memory_budget = get_memory_budget()
+    if verbose:
+        print(f"📄 Creating full presentation: {paper_name}")
 
-    styled_script = (
-        "Make both narrators sound professional and informative, "
-        f"suitable for an academic presentation: {full_script}"
-    )
+    # Catch speaker labels without a voice before paying for any chunk
+    dialogue = Dialogue.for_speakers(full_script, PAPER_SPEAKERS).validate(PAPER_SPEAKERS)
+    require_credentials()
+    voices = speaker_voices(PAPER_SPEAKERS)
+    with synthesis_span("create_full_paper_presentation", DEFAULT_MODEL, voices, dialogue.chars) as span:
+        if memory_budget is not None and memory_budget is not False:
+            audio_data = None
+            report, stats = synthesize_chunked_to_file(
+                dialogue,
+                voices,
+                output_file,
+                preamble=PAPER_STYLE_PREAMBLE,
+                max_chars=max_chunk_chars,
+                max_workers=max_workers,
+                memory_budget=memory_budget,
+                postprocess=postprocess or None,
+            )
+            span.bytes = stats["bytes"]
+        else:
+            audio_data, report = synthesize_chunked(
+                dialogue,
+                voices,
+                preamble=PAPER_STYLE_PREAMBLE,
+                max_chars=max_chunk_chars,
+                max_workers=max_workers,
+                postprocess=postprocess or None,
+            )
+            span.set_audio(audio_data)
+            with phase("write"):
+                save_wave_file(output_file, audio_data)
 
-    text_to_speech_multi_speaker(styled_script, speakers, output_file)
-    print(f"✅ Full presentation saved as: {output_file}")
-    print()
+    if verbose:
+        for chunk in report:
+            print(f"   🧩 Chunk {chunk['index'] + 1}/{len(report)}: "
+                  f"{chunk['chars']} chars in {chunk['latency']:.2f}s")
+        if audio_data is None:
+            print(f"   💽 Assembled on disk: {stats['spilled_segments']}/{stats['segments']} chunks "
+                  f"spilled ({stats['spilled_bytes'] / 2**20:.1f} MB), "
+                  f"copied with {', '.join(stats['copy_methods']) or 'plain writes'}")
+        if postprocess:
+            print_postprocess_report(stats["postprocess"] if audio_data is None else postprocess.last_report)
+        print(f"✅ Full presentation saved as: {output_file}")
+        print()
+    return audio_data
 
 
 def main():
@@ -323,6 +1159,11 @@ def main():
     print("   • tech_discussion.wav - Multi-speaker tech talk")
     print("   • casual_chat.wav - Multi-speaker casual conversation")
     print("   • styled_conversation.wav - Multi-speaker with style control")
+    print()
+    print_cache_stats()
+    print_key_pool_stats()
+    print_hedge_stats()
+    print_summary_table()
 
 
 if __name__ == "__main__":
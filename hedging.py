@@ -0,0 +1,290 @@
+"""
+Hedged requests to cut tail latency.
+
+A hedged call sends the request, and if it has not finished after the
+hedge delay, sends a duplicate; whichever succeeds first wins. The hedge
+delay adapts to the traffic: it is a high percentile (p95 by default) of
+the recently observed latency of requests of comparable length (lengths
+are bucketed by powers of two), so only the slow tail is duplicated. No
+hedges are sent for a length bucket until it has min_samples
+observations.
+
+Hedges are capped as a fraction of traffic with a token bucket: every
+request adds `budget` tokens (up to max_burst) and every hedge spends one,
+so over time at most budget * requests extra requests are sent.
+
+A hedge needs capacity of its own. synthesize_pcm() takes the primary's
+scheduler slot before the hedge clock starts and sends a hedge only if
+another slot is free right away (see scheduler.py), so hedges never queue
+behind the requests they are meant to overtake and queue waits never
+count as request latency.
+
+In async code the losing request is cancelled. Threads cannot be
+cancelled, so a losing synchronous request runs to completion in the
+background and its result is dropped.
+
+Hedging is opt-in: pass hedge=True (the process-wide Hedger) or a Hedger
+to synthesize_pcm(), text_to_speech_simple() or their async counterparts.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from metrics import _percentile
+
+
+DEFAULT_PERCENTILE = 95
+DEFAULT_BUDGET = 0.05
+DEFAULT_MIN_SAMPLES = 20
+DEFAULT_WINDOW = 200
+
+
+def _noop():
+    pass
+
+
+def _bucket(size):
+    # 0-63 characters share bucket 0, then one bucket per doubling
+    return max(0, int(size).bit_length() - 6)
+
+
+class Hedger:
+    """Adaptive hedge delays, a hedge budget and hedge counters."""
+
+    def __init__(self, percentile=DEFAULT_PERCENTILE, budget=DEFAULT_BUDGET, min_samples=DEFAULT_MIN_SAMPLES,
+                 window=DEFAULT_WINDOW, min_delay=0.01, max_burst=10, max_workers=64):
+        """
+        Args:
+            percentile (float): Latency percentile after which a hedge is sent
+            budget (float): Most hedges as a fraction of requests
+            min_samples (int): Observations needed in a length bucket before hedging
+            window (int): Recent latencies kept per length bucket
+            min_delay (float): Shortest hedge delay in seconds
+            max_burst (int): Most hedges that can be saved up and sent back to back
+            max_workers (int): Threads for synchronous attempts
+        """
+        if not 0 <= budget <= 1:
+            raise ValueError("budget must be between 0 and 1")
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.window = window
+        self.min_delay = min_delay
+        self.max_burst = max_burst
+        self.max_workers = max_workers
+        self._latencies = {}
+        self._tokens = 0.0
+        self._executor = None
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "hedges_fired": 0, "hedges_won": 0, "budget_denied": 0, "capacity_denied": 0}
+
+    def observe(self, size, seconds):
+        """Record the latency of one successful request of the given size."""
+        with self._lock:
+            samples = self._latencies.get(_bucket(size))
+            if samples is None:
+                samples = self._latencies[_bucket(size)] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def hedge_delay(self, size):
+        """Return seconds to wait before hedging a request of this size, or None if not warmed up."""
+        with self._lock:
+            samples = list(self._latencies.get(_bucket(size), ()))
+        if len(samples) < self.min_samples:
+            return None
+        return max(self.min_delay, _percentile(samples, self.percentile))
+
+    def _start_request(self):
+        with self._lock:
+            self.counters["requests"] += 1
+            self._tokens = min(self.max_burst, self._tokens + self.budget)
+
+    def _spend(self, admit):
+        # Returns the hedge's release callable, or None when no hedge may be sent
+        with self._lock:
+            if self._tokens < 1:
+                self.counters["budget_denied"] += 1
+                return None
+        release = admit() if admit else _noop
+        with self._lock:
+            if release is None:
+                self.counters["capacity_denied"] += 1
+                return None
+            self._tokens -= 1
+            self.counters["hedges_fired"] += 1
+            return release
+
+    def _won(self):
+        with self._lock:
+            self.counters["hedges_won"] += 1
+
+    def _timed(self, func, args, size):
+        start = time.perf_counter()
+        result = func(*args)
+        self.observe(size, time.perf_counter() - start)
+        return result
+
+    async def _timed_async(self, func, args, size):
+        start = time.perf_counter()
+        result = await func(*args)
+        self.observe(size, time.perf_counter() - start)
+        return result
+
+    def _submit(self, func, args, size):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hedge")
+        # Each attempt keeps the caller's priority class and metrics span
+        return self._executor.submit(contextvars.copy_context().run, self._timed, func, args, size)
+
+    def call(self, func, *args, size=0, admit=None, release=None):
+        """
+        Call func(*args), sending a duplicate if it runs past the hedge delay.
+
+        func is timed from the moment it is called, so it should make the
+        request without queueing for capacity first: acquire the primary's
+        capacity before call() and pass its release, and let admit() provide
+        the hedge's. Each attempt holds its capacity until it finishes, even
+        after losing.
+
+        Args:
+            func (callable): Function making one API request
+            size (int): Request size used to pick comparable latencies, e.g. characters
+            admit (callable): Called before sending a hedge; returns a function
+                              releasing the capacity the hedge holds, or None
+                              when none is free right away (the hedge is skipped)
+            release (callable): Releases the primary's capacity once the primary finishes
+
+        Returns:
+            The result of whichever attempt succeeded first
+
+        Raises:
+            Exception: The primary attempt's error if every attempt failed
+        """
+        release = release or _noop
+        self._start_request()
+        delay = self.hedge_delay(size)
+        if delay is None:
+            try:
+                return self._timed(func, args, size)
+            finally:
+                release()
+        try:
+            primary = self._submit(func, args, size)
+        except BaseException:
+            release()
+            raise
+        primary.add_done_callback(lambda _: release())
+        done, _ = wait([primary], timeout=delay)
+        release_hedge = None if done else self._spend(admit)
+        if release_hedge is None:
+            return primary.result()
+        hedge = self._submit(func, args, size)
+        # Also runs if the hedge loses: the thread finishes its request in the background
+        hedge.add_done_callback(lambda _: release_hedge())
+        pending = [primary, hedge]
+        errors = []
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            # Prefer the primary when both finished together
+            for attempt in [attempt for attempt in pending if attempt in done]:
+                pending.remove(attempt)
+                if attempt.exception() is None:
+                    if attempt is hedge:
+                        self._won()
+                    return attempt.result()
+                errors.append((attempt is not primary, attempt.exception()))
+        raise min(errors, key=lambda item: item[0])[1]
+
+    async def call_async(self, func, *args, size=0, admit=None, release=None):
+        """Async counterpart of call(); the losing attempt is cancelled."""
+        release = release or _noop
+        self._start_request()
+        delay = self.hedge_delay(size)
+        if delay is None:
+            try:
+                return await self._timed_async(func, args, size)
+            finally:
+                release()
+        primary = asyncio.ensure_future(self._timed_async(func, args, size))
+        primary.add_done_callback(lambda _: release())
+        hedge = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            release_hedge = None if done else self._spend(admit)
+            if release_hedge is None:
+                return await primary
+            hedge = asyncio.ensure_future(self._timed_async(func, args, size))
+            # A callback, not a finally, so a hedge cancelled before it started is released too
+            hedge.add_done_callback(lambda _: release_hedge())
+            pending = [primary, hedge]
+            errors = []
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in [attempt for attempt in pending if attempt in done]:
+                    pending.remove(attempt)
+                    if attempt.exception() is None:
+                        if attempt is hedge:
+                            self._won()
+                        return attempt.result()
+                    errors.append((attempt is not primary, attempt.exception()))
+            raise min(errors, key=lambda item: item[0])[1]
+        finally:
+            for attempt in (primary, hedge):
+                if attempt is not None and not attempt.done():
+                    attempt.cancel()
+
+    def stats(self):
+        """Return request and hedge counters plus the current hedge delay per length bucket."""
+        with self._lock:
+            stats = dict(self.counters)
+            buckets = {bucket: list(samples) for bucket, samples in self._latencies.items()}
+        stats["hedge_delays"] = {
+            f"<{64 << bucket}": max(self.min_delay, _percentile(samples, self.percentile))
+            for bucket, samples in sorted(buckets.items()) if len(samples) >= self.min_samples
+        }
+        return stats
+
+
+_hedger = None
+_hedger_lock = threading.Lock()
+
+
+def get_hedger():
+    """Return the process-wide Hedger used by hedge=True."""
+    global _hedger
+    with _hedger_lock:
+        if _hedger is None:
+            _hedger = Hedger()
+        return _hedger
+
+
+def set_hedger(hedger):
+    """Install the process-wide Hedger (None builds a default one on next use)."""
+    global _hedger
+    with _hedger_lock:
+        _hedger = hedger
+
+
+def resolve_hedger(hedge):
+    """Map a hedge argument (None/False, True or a Hedger) to a Hedger or None."""
+    if hedge is True:
+        return get_hedger()
+    return hedge or None
+
+
+def print_hedge_stats(hedger=None):
+    """Print hedges fired and won, if any request was hedged."""
+    hedger = hedger or _hedger
+    if hedger is None:
+        return
+    stats = hedger.stats()
+    if not stats["requests"]:
+        return
+    print(f"🔀 Hedging: {stats['hedges_fired']} hedges fired for {stats['requests']} requests, "
+          f"{stats['hedges_won']} won, {stats['budget_denied']} held back by the budget, "
+          f"{stats['capacity_denied']} by a full scheduler")
@@ -0,0 +1,184 @@
+"""
+Incremental re-rendering of edited scripts.
+
+Every turn is rendered on its own, as a single-voice request in its
+speaker's voice, and stored in a content-addressed segment store under a
+hash of (model, style context + turn text, voice). When a script is
+edited, only turns whose hash is not in the store are synthesized again;
+the final WAV is rebuilt from stored segments.
+
+A small sidecar file next to the output (<output>.turns.json) records the
+segment keys of the previous render so each run can report which turns
+were added, changed or removed.
+
+Because each request holds one speaker's text and no speaker label, the
+preamble should be a single-speaker style instruction (for papers,
+PAPER_TURN_STYLE_PREAMBLE rather than the two-narrator
+PAPER_STYLE_PREAMBLE).
+"""
+
+import difflib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from audio_cache import AudioCache, cache_key
+from dialogue_engine import as_script_lines, build_voice_map
+from gemini_tts_example import DEFAULT_MODEL, join_chunks, require_credentials, save_wave_file, synthesize_pcm
+from postprocess import get_default_postprocessor
+from scheduler import with_priority
+
+
+DEFAULT_SEGMENT_DIR = ".tts_segments"
+# 16-bit mono PCM at 24 kHz
+BYTES_PER_SECOND = 24000 * 2
+
+_segment_store = None
+
+
+def get_segment_store():
+    """Return the default per-turn segment store (GEMINI_TTS_SEGMENT_DIR or .tts_segments)."""
+    global _segment_store
+    if _segment_store is None:
+        # Segments are the source of truth for incremental renders, so never evict them
+        _segment_store = AudioCache(
+            os.getenv("GEMINI_TTS_SEGMENT_DIR", DEFAULT_SEGMENT_DIR), max_bytes=float("inf")
+        )
+    return _segment_store
+
+
+def _sidecar_path(output_file):
+    return f"{output_file}.turns.json"
+
+
+def _load_previous_keys(output_file):
+    try:
+        with open(_sidecar_path(output_file), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return []
+
+
+def _save_keys(output_file, keys):
+    path = _sidecar_path(output_file)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(keys, f)
+    os.replace(tmp_path, path)
+
+
+def diff_turns(previous_keys, keys):
+    """
+    Summarize how a script's turns changed since the previous render.
+
+    Args:
+        previous_keys (list): Segment keys of the previous render
+        keys (list): Segment keys of the current script
+
+    Returns:
+        dict: Counts of "unchanged", "added", "changed" and "removed" turns
+    """
+    summary = {"unchanged": 0, "added": 0, "changed": 0, "removed": 0}
+    matcher = difflib.SequenceMatcher(a=previous_keys, b=keys, autojunk=False)
+    for tag, a_start, a_end, b_start, b_end in matcher.get_opcodes():
+        old_count = a_end - a_start
+        new_count = b_end - b_start
+        if tag == "equal":
+            summary["unchanged"] += new_count
+        elif tag == "insert":
+            summary["added"] += new_count
+        elif tag == "delete":
+            summary["removed"] += old_count
+        else:
+            summary["changed"] += min(old_count, new_count)
+            summary["added"] += max(0, new_count - old_count)
+            summary["removed"] += max(0, old_count - new_count)
+    return summary
+
+
+def render_incremental(script, speakers_config, output_file, preamble="", model=DEFAULT_MODEL,
+                       store=None, max_workers=4, postprocess=None):
+    """
+    Render a script turn by turn, resynthesizing only turns that are new or edited.
+
+    Args:
+        script (str | list | Dialogue): "Speaker: text" dialogue text, (speaker, text) pairs
+                                        or a parsed Dialogue
+        speakers_config (list): {"name": ..., "voice": ...} for every speaker
+        output_file (str): Output WAV filename
+        preamble (str): Single-speaker style instruction prepended to every
+                        turn's text (part of the hash)
+        model (str): TTS model name
+        store (AudioCache): Segment store (default: get_segment_store())
+        max_workers (int): Maximum number of turns synthesized at once
+        postprocess (PostProcessor): Trim/crossfade/normalize stage applied when
+                                     assembling (default: get_default_postprocessor();
+                                     False disables it). Stored segments stay raw.
+
+    Returns:
+        dict: "turns", "reused_turns", "regenerated_turns", "reused_seconds",
+              "regenerated_seconds" and the diff summary under "diff"
+    """
+    store = store or get_segment_store()
+    if postprocess is None:
+        postprocess = get_default_postprocessor()
+    script_lines = as_script_lines(script)
+    voice_map = build_voice_map(speakers_config, script_lines)
+
+    requests = [(f"{preamble}{text}", voice_map[speaker]) for speaker, text in script_lines]
+    keys = [cache_key(model, contents, voice) for contents, voice in requests]
+
+    segments = {}
+    pending = []
+    for index, key in enumerate(keys):
+        if key in segments:
+            continue
+        audio = store.get(key)
+        if audio is None:
+            # Identical turns (same text and voice) only need one request
+            pending.append(index)
+            segments[key] = None
+        else:
+            segments[key] = audio
+
+    if pending:
+        require_credentials()
+
+        def render(index):
+            contents, voice = requests[index]
+            audio = synthesize_pcm(contents, voice, model, cache=False)
+            store.put(keys[index], audio)
+            return audio
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as executor:
+            for index, audio in zip(pending, executor.map(with_priority(render), pending)):
+                segments[keys[index]] = audio
+
+    regenerated = {keys[index] for index in pending}
+    total_bytes = sum(len(segments[key]) for key in keys)
+    reused_bytes = sum(len(segments[key]) for key in keys if key not in regenerated)
+    ordered = [segments[key] for key in keys]
+    segments.clear()
+    audio = join_chunks(ordered, postprocess)
+    save_wave_file(output_file, audio)
+
+    diff = diff_turns(_load_previous_keys(output_file), keys)
+    _save_keys(output_file, keys)
+    return {
+        "turns": len(keys),
+        "reused_turns": sum(1 for key in keys if key not in regenerated),
+        "regenerated_turns": sum(1 for key in keys if key in regenerated),
+        "reused_seconds": reused_bytes / BYTES_PER_SECOND,
+        "regenerated_seconds": (total_bytes - reused_bytes) / BYTES_PER_SECOND,
+        "diff": diff,
+    }
+
+
+def print_render_report(report):
+    """Print the reuse summary returned by render_incremental."""
+    diff = report["diff"]
+    print(f"♻️  Reused {report['reused_turns']}/{report['turns']} turns "
+          f"({report['reused_seconds']:.1f}s of audio), regenerated {report['regenerated_turns']} "
+          f"({report['regenerated_seconds']:.1f}s)")
+    print(f"   Turn diff: {diff['unchanged']} unchanged, {diff['changed']} changed, "
+          f"{diff['added']} added, {diff['removed']} removed")
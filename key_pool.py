@@ -0,0 +1,276 @@
+"""
+API key pool for spreading requests over several keys or projects.
+
+Every synthesis request leases a key from the pool. The pool hands out the
+key with the most remaining headroom under its own per-minute request and
+token limits, as measured over a sliding one-minute window of this
+process's requests. A key that answers with a quota error (429 /
+RESOURCE_EXHAUSTED) is drained: it gets no new requests until the
+server's Retry-After delay (or drain_seconds) has passed. Retries then
+fail over to another key straight away, without waiting out that delay.
+
+Keys are read from the environment, first match wins:
+
+- GEMINI_TTS_KEY_POOL: path to a JSON list of
+  {"key": ..., "name": ..., "rpm": ..., "tpm": ...} entries
+- GEMINI_API_KEYS: comma-separated keys without limits
+- GEMINI_API_KEY: a single key
+
+Per-key counters are available from get_key_pool().stats() and in the
+HTTP service's /health output.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from retry import RATE_LIMITED, classify_error, retry_after_seconds
+
+
+DEFAULT_DRAIN_SECONDS = 60.0
+WINDOW_SECONDS = 60.0
+
+
+def mask_key(api_key):
+    """Return a printable label for a key ("...wxyz")."""
+    return f"...{api_key[-4:]}" if len(api_key) > 4 else "..."
+
+
+class PooledKey:
+    """One API key with its limits, sliding-window usage and counters."""
+
+    def __init__(self, api_key, name=None, rpm=None, tpm=None):
+        """
+        Args:
+            api_key (str): API key
+            name (str): Label for stats (default: the masked key)
+            rpm (int): Requests per minute allowed on this key (None: unlimited)
+            tpm (int): Input tokens per minute allowed on this key (None: unlimited)
+        """
+        self.api_key = api_key
+        self.name = name or mask_key(api_key)
+        self.rpm = rpm
+        self.tpm = tpm
+        self.in_flight = 0
+        self.drained_until = 0.0
+        self.last_used = 0.0
+        self.requests = 0
+        self.tokens = 0
+        self.failures = 0
+        self.rate_limited = 0
+        self.drains = 0
+        self._window = deque()
+        self._window_tokens = 0
+
+    def _expire(self, now):
+        while self._window and self._window[0][0] <= now - WINDOW_SECONDS:
+            _, tokens = self._window.popleft()
+            self._window_tokens -= tokens
+
+    def headroom(self, now, tokens=0):
+        """
+        Fraction of this key's per-minute budget still free after a request of the given size.
+
+        Keys without limits always report 1.0; a value at or below 0 means the
+        request would exceed the key's quota.
+        """
+        self._expire(now)
+        fractions = [1.0]
+        if self.rpm:
+            fractions.append(1 - (len(self._window) + 1) / self.rpm)
+        if self.tpm:
+            fractions.append(1 - (self._window_tokens + tokens) / self.tpm)
+        return min(fractions)
+
+    def stats(self, now):
+        self._expire(now)
+        return {
+            "name": self.name,
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "requests": self.requests,
+            "tokens": self.tokens,
+            "failures": self.failures,
+            "rate_limited": self.rate_limited,
+            "drains": self.drains,
+            "in_flight": self.in_flight,
+            "requests_last_minute": len(self._window),
+            "tokens_last_minute": self._window_tokens,
+            "drained_for": max(0.0, self.drained_until - now),
+        }
+
+
+class KeyPool:
+    """Thread-safe pool that leases the key with the most headroom."""
+
+    def __init__(self, keys, drain_seconds=DEFAULT_DRAIN_SECONDS, clock=time.monotonic):
+        """
+        Args:
+            keys (list): PooledKey objects, API key strings or
+                         {"key", "name", "rpm", "tpm"} dicts
+            drain_seconds (float): How long a key rests after a quota error
+                                   without Retry-After
+            clock (callable): Monotonic clock (injectable for tests)
+        """
+        self.keys = [self._coerce(key) for key in keys]
+        self.drain_seconds = drain_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _coerce(key):
+        if isinstance(key, PooledKey):
+            return key
+        if isinstance(key, str):
+            return PooledKey(key)
+        return PooledKey(key["key"], key.get("name"), key.get("rpm"), key.get("tpm"))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def acquire(self, tokens=0):
+        """
+        Pick a key for one request and count it against the key's budget.
+
+        Drained keys are skipped; if every key is drained, the one that
+        recovers first is used. Ties go to the key with the fewest requests
+        in flight, then the least recently used.
+
+        Args:
+            tokens (int): Estimated input tokens of the request
+
+        Returns:
+            PooledKey: The leased key; hand it back with release()
+
+        Raises:
+            ValueError: If the pool has no keys
+        """
+        if not self.keys:
+            raise ValueError("Please set the GEMINI_API_KEY environment variable")
+        with self._lock:
+            now = self._clock()
+            available = [key for key in self.keys if key.drained_until <= now]
+            if available:
+                key = max(available, key=lambda k: (k.headroom(now, tokens), -k.in_flight, -k.last_used))
+            else:
+                key = min(self.keys, key=lambda k: k.drained_until)
+            key._window.append((now, tokens))
+            key._window_tokens += tokens
+            key.in_flight += 1
+            key.requests += 1
+            key.tokens += tokens
+            key.last_used = now
+            return key
+
+    def release(self, key, error=None):
+        """
+        Return a leased key, draining it if the request hit its quota.
+
+        Returns:
+            bool: True if the key was drained and another key is available
+                  right now, so a retry can fail over without waiting
+        """
+        with self._lock:
+            key.in_flight -= 1
+            if error is None:
+                return False
+            key.failures += 1
+            if classify_error(error) != RATE_LIMITED:
+                return False
+            key.rate_limited += 1
+            now = self._clock()
+            delay = retry_after_seconds(error)
+            key.drained_until = max(key.drained_until, now + (self.drain_seconds if delay is None else delay))
+            key.drains += 1
+            return any(other.drained_until <= now for other in self.keys)
+
+    @contextmanager
+    def lease(self, tokens=0):
+        """
+        Lease a key for the duration of a block.
+
+        A quota error raised in the block drains the key. When another key
+        can take the retry, the exception is marked with failover = True so
+        call_with_retry neither waits out the delay nor pauses other callers.
+
+        Yields:
+            PooledKey: The leased key
+        """
+        key = self.acquire(tokens)
+        error = None
+        try:
+            yield key
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            # Also runs when an abandoned stream closes the block with GeneratorExit
+            if self.release(key, error):
+                error.failover = True
+
+    def stats(self):
+        """Return per-key counters, in configuration order."""
+        with self._lock:
+            now = self._clock()
+            return [key.stats(now) for key in self.keys]
+
+
+def load_keys_from_env():
+    """Return key entries from GEMINI_TTS_KEY_POOL, GEMINI_API_KEYS or GEMINI_API_KEY."""
+    pool_file = os.getenv("GEMINI_TTS_KEY_POOL")
+    if pool_file:
+        with open(pool_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    keys = os.getenv("GEMINI_API_KEYS")
+    if keys:
+        return [key.strip() for key in keys.split(",") if key.strip()]
+    key = os.getenv("GEMINI_API_KEY")
+    return [key] if key else []
+
+
+_pool = None
+_pool_source = None
+_pool_pinned = False
+_pool_lock = threading.Lock()
+
+
+def get_key_pool():
+    """
+    Return the process-wide key pool.
+
+    Unless one was installed with set_key_pool(), the pool is built from the
+    environment and rebuilt when the key variables change.
+    """
+    global _pool, _pool_source
+    if _pool_pinned:
+        return _pool
+    source = tuple(os.getenv(name) for name in ("GEMINI_TTS_KEY_POOL", "GEMINI_API_KEYS", "GEMINI_API_KEY"))
+    with _pool_lock:
+        if _pool is None or source != _pool_source:
+            _pool = KeyPool(load_keys_from_env())
+            _pool_source = source
+        return _pool
+
+
+def set_key_pool(pool):
+    """Install a key pool (None goes back to reading the environment)."""
+    global _pool, _pool_source, _pool_pinned
+    with _pool_lock:
+        _pool = pool
+        _pool_source = None
+        _pool_pinned = pool is not None
+
+
+def print_key_pool_stats(pool=None):
+    """Print per-key usage counters."""
+    pool = pool or get_key_pool()
+    if len(pool) < 2:
+        return
+    print(f"🔑 Key pool: {len(pool)} keys")
+    for stats in pool.stats():
+        drained = f", drained {stats['drained_for']:.0f}s" if stats["drained_for"] > 0 else ""
+        print(f"   {stats['name']}: {stats['requests']} requests, {stats['tokens']} tokens, "
+              f"{stats['rate_limited']} quota errors{drained}")
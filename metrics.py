@@ -0,0 +1,339 @@
+"""
+Per-call timing and metrics for synthesis requests.
+
+Every synthesis call runs inside a span that records phase timings
+(config, queue, request, extract, postprocess, write), characters in, audio seconds and bytes
+out, model, voice(s), retries and outcome. Finished spans are emitted as
+plain dict events to every registered sink:
+
+- JsonLinesSink: appends one JSON object per call to a file
+- InMemoryAggregator: keeps totals and latencies and prints a summary table
+- PrometheusSink: renders counters/summaries in the Prometheus text format
+
+An InMemoryAggregator is always registered (see get_aggregator()), so batch
+runs can print a summary table at the end. Set GEMINI_TTS_METRICS_JSONL to a
+path to also log every call as JSON lines.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+PHASES = ("config", "queue", "request", "extract", "postprocess", "write")
+# 16-bit mono PCM at 24 kHz
+BYTES_PER_SECOND = 24000 * 2
+
+_current_span = contextvars.ContextVar("synthesis_span", default=None)
+_sinks = []
+_sinks_lock = threading.Lock()
+
+
+class SynthesisSpan:
+    """Mutable record of one synthesis call while it is in progress."""
+
+    def __init__(self, operation, model, voices, chars):
+        self.operation = operation
+        self.model = model
+        self.voices = voices
+        self.chars = chars
+        self.phases = {}
+        self.bytes = 0
+        self.error = None
+        self.retries = 0
+        self.requests = 0
+        self.cache_hits = 0
+        self.started = time.time()
+        self._start = time.perf_counter()
+        # Worker threads of a chunked call record into the same span
+        self._lock = threading.Lock()
+
+    @property
+    def outcome(self):
+        """"error", "cache_hit" if every request was served from the cache, else "ok"."""
+        if self.error is not None:
+            return "error"
+        if self.requests and self.cache_hits == self.requests:
+            return "cache_hit"
+        return "ok"
+
+    def add_phase(self, name, seconds):
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def record_request(self, audio, cache_hit=False, retries=0):
+        """Count one request of this call; its audio adds to the call's bytes."""
+        with self._lock:
+            self.requests += 1
+            self.cache_hits += bool(cache_hit)
+            self.retries += retries
+            self.bytes += len(audio)
+
+    def set_audio(self, audio):
+        """Set the call's final output (e.g. after joining and post-processing its requests)."""
+        self.bytes = len(audio)
+
+    def to_event(self):
+        voices = self.voices
+        if not isinstance(voices, str):
+            voices = {name: voice for name, voice in voices}
+        with self._lock:
+            return {
+                "timestamp": self.started,
+                "operation": self.operation,
+                "model": self.model,
+                "voices": voices,
+                "chars": self.chars,
+                "bytes": self.bytes,
+                "audio_seconds": self.bytes / BYTES_PER_SECOND,
+                "outcome": self.outcome,
+                "error": self.error,
+                "retries": self.retries,
+                "requests": self.requests,
+                "cache_hits": self.cache_hits,
+                "phases": dict(self.phases),
+                "total_seconds": time.perf_counter() - self._start,
+            }
+
+
+@contextmanager
+def synthesis_span(operation, model, voices, chars):
+    """
+    Time one synthesis call and emit its event when it finishes.
+
+    Nested calls in the same context (e.g. text_to_speech_simple calling
+    synthesize_pcm, or chunk workers started with
+    scheduler.with_priority()) join the outer span instead of emitting a
+    second event.
+
+    Yields:
+        SynthesisSpan: The active span
+    """
+    span = _current_span.get()
+    if span is not None:
+        yield span
+        return
+    span = SynthesisSpan(operation, model, voices, chars)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = type(e).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        emit(span.to_event())
+
+
+@contextmanager
+def join_span(span):
+    """Record the block's synthesis calls into span (e.g. one started in another thread)."""
+    if span is None:
+        yield
+        return
+    token = _current_span.set(span)
+    try:
+        yield
+    finally:
+        _current_span.reset(token)
+
+
+@contextmanager
+def phase(name):
+    """Add the time spent in the block to the current span (no-op outside a span)."""
+    span = _current_span.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if span is not None:
+            span.add_phase(name, time.perf_counter() - start)
+
+
+def current_span():
+    """Return the active SynthesisSpan, or None."""
+    return _current_span.get()
+
+
+def add_sink(sink):
+    """Register a sink; it receives every finished event via sink.emit(event)."""
+    with _sinks_lock:
+        _sinks.append(sink)
+    return sink
+
+
+def remove_sink(sink):
+    with _sinks_lock:
+        if sink in _sinks:
+            _sinks.remove(sink)
+
+
+def emit(event):
+    """Send an event to every registered sink; sink failures never break synthesis."""
+    with _sinks_lock:
+        sinks = list(_sinks)
+    for sink in sinks:
+        try:
+            sink.emit(event)
+        except Exception:
+            pass
+
+
+class JsonLinesSink:
+    """Appends each event as one JSON line to a file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def emit(self, event):
+        line = json.dumps(event, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+class InMemoryAggregator:
+    """Aggregates events per operation and renders a summary table."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.events = 0
+            self._rows = {}
+
+    def emit(self, event):
+        with self._lock:
+            self.events += 1
+            row = self._rows.setdefault(event["operation"], {
+                "calls": 0, "ok": 0, "cache_hit": 0, "error": 0, "chars": 0, "bytes": 0,
+                "audio_seconds": 0.0, "retries": 0, "latencies": [],
+                "phases": {name: 0.0 for name in PHASES},
+            })
+            row["calls"] += 1
+            row[event["outcome"]] = row.get(event["outcome"], 0) + 1
+            row["chars"] += event["chars"]
+            row["bytes"] += event["bytes"]
+            row["audio_seconds"] += event["audio_seconds"]
+            row["retries"] += event["retries"]
+            row["latencies"].append(event["total_seconds"])
+            for name, seconds in event["phases"].items():
+                row["phases"][name] = row["phases"].get(name, 0.0) + seconds
+
+    def snapshot(self):
+        """Return per-operation totals with p50/p95 latency instead of raw samples."""
+        with self._lock:
+            result = {}
+            for operation, row in self._rows.items():
+                summary = {key: value for key, value in row.items() if key != "latencies"}
+                summary["phases"] = dict(row["phases"])
+                summary["p50_seconds"] = _percentile(row["latencies"], 50)
+                summary["p95_seconds"] = _percentile(row["latencies"], 95)
+                summary["total_seconds"] = sum(row["latencies"])
+                result[operation] = summary
+            return result
+
+    def summary_table(self):
+        """Return a fixed-width table of calls, audio, latency and phase time per operation."""
+        snapshot = self.snapshot()
+        width = max([len("operation")] + [len(operation) for operation in snapshot])
+        phase_widths = {name: max(9, len(name) + 2) for name in PHASES}
+        header = (f"{'operation':<{width}} {'calls':>5} {'err':>4} {'hit':>4} {'retry':>5} {'chars':>8} "
+                  f"{'audio s':>8} {'p50 s':>6} {'p95 s':>6} "
+                  + " ".join(f"{name + ' s':>{phase_widths[name]}}" for name in PHASES))
+        lines = [header, "-" * len(header)]
+        for operation, row in sorted(snapshot.items()):
+            lines.append(
+                f"{operation:<{width}} {row['calls']:>5} {row['error']:>4} {row['cache_hit']:>4} "
+                f"{row['retries']:>5} {row['chars']:>8} {row['audio_seconds']:>8.1f} "
+                f"{row['p50_seconds']:>6.2f} {row['p95_seconds']:>6.2f} "
+                + " ".join(f"{row['phases'].get(name, 0.0):>{phase_widths[name]}.2f}" for name in PHASES)
+            )
+        return "\n".join(lines)
+
+
+class PrometheusSink(InMemoryAggregator):
+    """Aggregator that renders its totals in the Prometheus text exposition format."""
+
+    def __init__(self, prefix="gemini_tts"):
+        self.prefix = prefix
+        super().__init__()
+
+    def exposition(self):
+        p = self.prefix
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{val}"' for key, val in labels.items())
+                lines.append(f"{p}_{name}{{{label_text}}} {value}")
+
+        metric("requests_total", "counter", "Synthesis calls by operation and outcome.", [
+            ({"operation": op, "outcome": outcome}, row[outcome])
+            for op, row in sorted(snapshot.items()) for outcome in ("ok", "cache_hit", "error")
+        ])
+        metric("input_chars_total", "counter", "Characters sent for synthesis.",
+               [({"operation": op}, row["chars"]) for op, row in sorted(snapshot.items())])
+        metric("audio_seconds_total", "counter", "Seconds of audio produced.",
+               [({"operation": op}, row["audio_seconds"]) for op, row in sorted(snapshot.items())])
+        metric("audio_bytes_total", "counter", "PCM bytes produced.",
+               [({"operation": op}, row["bytes"]) for op, row in sorted(snapshot.items())])
+        metric("retries_total", "counter", "Retried attempts.",
+               [({"operation": op}, row["retries"]) for op, row in sorted(snapshot.items())])
+        metric("phase_seconds_total", "counter", "Time spent per phase.", [
+            ({"operation": op, "phase": name}, row["phases"].get(name, 0.0))
+            for op, row in sorted(snapshot.items()) for name in PHASES
+        ])
+        metric("call_seconds", "summary", "End-to-end call latency.", [
+            (labels, value)
+            for op, row in sorted(snapshot.items())
+            for labels, value in (
+                ({"operation": op, "quantile": "0.5"}, row["p50_seconds"]),
+                ({"operation": op, "quantile": "0.95"}, row["p95_seconds"]),
+            )
+        ])
+        for op, row in sorted(snapshot.items()):
+            lines.append(f'{p}_call_seconds_sum{{operation="{op}"}} {row["total_seconds"]}')
+            lines.append(f'{p}_call_seconds_count{{operation="{op}"}} {row["calls"]}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write the exposition atomically (e.g. for the node_exporter textfile collector)."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.exposition())
+        os.replace(tmp_path, path)
+
+
+_aggregator = add_sink(InMemoryAggregator())
+if os.getenv("GEMINI_TTS_METRICS_JSONL"):
+    add_sink(JsonLinesSink(os.getenv("GEMINI_TTS_METRICS_JSONL")))
+
+
+def get_aggregator():
+    """Return the always-registered in-memory aggregator."""
+    return _aggregator
+
+
+def print_summary_table(aggregator=None):
+    """Print the aggregator's summary table (nothing if no calls were recorded)."""
+    aggregator = aggregator or _aggregator
+    if aggregator.events:
+        print("📊 Synthesis summary")
+        print(aggregator.summary_table())
@@ -12,9 +12,15 @@ Usage examples:
 - Customer service scenarios
 """
 
-import os
-from gemini_tts_example import text_to_speech_multi_speaker, create_dialogue_from_script
+import argparse
+from gemini_tts_example import text_to_speech_multi_speaker, create_dialogue_from_script, require_credentials
+from dialogue_engine import text_to_speech_dialogue
 from dialogues import get_dialogue
+from audio_cache import print_cache_stats
+from key_pool import print_key_pool_stats
+from metrics import print_summary_table
+from planner import add_plan_arguments, plan_from_args, script_requests
+from run_manifest import run_demo_jobs
 
 
 def demo_podcast_conversation():
@@ -71,28 +77,15 @@ def demo_story_narration():
     
     script = get_dialogue("multi_speaker_demo", "story_narration")
     
-    dialogue = create_dialogue_from_script(script)
-    
     speakers = [
-        {"name": "Narrator", "voice": "Achird"},   # Friendly storyteller
-        {"name": "Alice", "voice": "Aoede"},      # Breezy, enthusiastic
-        {"name": "Ben", "voice": "Orus"}          # Firm, knowledgeable
-    ]
-    
-    # Note: This uses 3 speakers, but Gemini supports max 2, so we'll create two versions
-    print("⚠️  Note: Gemini supports max 2 speakers. Creating separate files for narrator and dialogue...")
-    
-    # Version 1: Just the dialogue between Alice and Ben
-    dialogue_only = create_dialogue_from_script([
-        line for line in script if line[0] != "Narrator"
-    ])
-    
-    dialogue_speakers = [
+        {"name": "Narrator", "voice": "achird"},   # Friendly storyteller
         {"name": "Alice", "voice": "aoede"},      # Breezy, enthusiastic
         {"name": "Ben", "voice": "orus"}          # Firm, knowledgeable
     ]
     
-    text_to_speech_multi_speaker(dialogue_only, dialogue_speakers, "story_dialogue_demo.wav")
+    # Gemini supports max 2 speakers per request, so the dialogue engine splits
+    # the story into runs of at most two speakers and stitches them back together
+    text_to_speech_dialogue(script, speakers, "story_narration_demo.wav")
     print()
 
 
@@ -111,37 +104,78 @@ def demo_interview():
     print()
 
 
+DEFAULT_MANIFEST = "multi_speaker_demo.manifest.json"
+
+
+def demo_jobs():
+    """Return (job_id, demo function, output file, inputs) for every demo, in run order."""
+    return [
+        ("podcast_conversation", demo_podcast_conversation, "podcast_demo.wav",
+         get_dialogue("multi_speaker_demo", "podcast_conversation")),
+        ("customer_service", demo_customer_service, "customer_service_demo.wav",
+         get_dialogue("multi_speaker_demo", "customer_service")),
+        ("teacher_student", demo_teacher_student, "teacher_student_demo.wav",
+         get_dialogue("multi_speaker_demo", "teacher_student")),
+        ("story_narration", demo_story_narration, "story_narration_demo.wav",
+         get_dialogue("multi_speaker_demo", "story_narration")),
+        ("interview", demo_interview, "interview_demo.wav",
+         get_dialogue("multi_speaker_demo", "interview")),
+    ]
+
+
 def main():
     """Run all multi-speaker demos."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip demos whose output still matches the run manifest")
+    parser.add_argument("--verify", action="store_true",
+                        help="Check existing WAVs against the run manifest without synthesizing")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST,
+                        help=f"Run manifest path (default: {DEFAULT_MANIFEST})")
+    add_plan_arguments(parser)
+    args = parser.parse_args()
+    
+    if args.verify:
+        run_demo_jobs(demo_jobs(), args.manifest, verify=True)
+        return
+    if args.plan:
+        # Demos run one after another; voices are only known inside each demo
+        plan_from_args(args, [(output, script_requests(inputs)) for _, _, output, inputs in demo_jobs()],
+                       request_concurrency=1)
+        return
+    
     print("🎭 Multi-Speaker Text-to-Speech Demos")
     print("=" * 50)
     print()
     
     # Check if API key is available
-    if not os.getenv("GEMINI_API_KEY"):
+    try:
+        require_credentials()
+    except ValueError:
         print("❌ Error: GEMINI_API_KEY environment variable not set!")
         print("Please set your API key and try again.")
         return
     
     try:
-        demo_podcast_conversation()
-        demo_customer_service()
-        demo_teacher_student()
-        demo_story_narration()
-        demo_interview()
+        run_demo_jobs(demo_jobs(), args.manifest, resume=args.resume)
         
         print("🎉 All multi-speaker demos completed!")
         print("\n📂 Generated files:")
         print("   • podcast_demo.wav - Tech podcast conversation")
         print("   • customer_service_demo.wav - Support call simulation")
         print("   • teacher_student_demo.wav - Educational interaction")
-        print("   • story_dialogue_demo.wav - Story character dialogue")
+        print("   • story_narration_demo.wav - Story with narrator and characters")
         print("   • interview_demo.wav - Job interview scenario")
         print("\n💡 Tip: You can use these patterns for:")
         print("   - Creating audiobooks with character voices")
         print("   - Generating training materials for customer service")
         print("   - Building educational content with interactive dialogues")
         print("   - Producing podcast-style content automatically")
+        print()
+        print_cache_stats()
+        print_key_pool_stats()
+        print()
+        print_summary_table()
         
     except Exception as e:
         print(f"❌ Error running demos: {e}")
@@ -0,0 +1,144 @@
+"""
+Request packing for many short single-voice utterances.
+
+IVR prompts, UI strings and short styled clips are a few seconds of audio
+each, so one request per item is dominated by round-trip latency. Packing
+sends up to max_items texts for the same voice as one request, separated
+by "[pause]" lines, and cuts the returned PCM back into per-item clips at
+the pauses (postprocess.split_on_pauses, vectorized with NumPy).
+
+If a packed response does not contain exactly one pause between every
+pair of items (the model merged or split a pause), that pack falls back
+to one request per item, so the output is always one clip per text.
+
+Usage:
+    clips, report = synthesize_packed(["Press one for sales.", "Press two for support."], "kore")
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from chunking import DEFAULT_MAX_CHARS
+from gemini_tts_example import DEFAULT_MODEL, _resolve_verbose, require_credentials, save_wave_file, synthesize_pcm
+from postprocess import split_on_pauses
+from scheduler import with_priority
+
+
+PAUSE_LINE = "\n\n[pause]\n\n"
+DEFAULT_MAX_ITEMS = 16
+DEFAULT_MIN_PAUSE_MS = 600
+
+
+def plan_packs(texts, max_items=DEFAULT_MAX_ITEMS, max_chars=DEFAULT_MAX_CHARS, style=None):
+    """
+    Group consecutive texts into packs under an item and character budget.
+
+    Args:
+        texts (list): Utterances in order
+        max_items (int): Most texts per request
+        max_chars (int): Character budget per request (pause lines and style included)
+        style (str): Style instruction pack_prompt() will prepend
+
+    Returns:
+        list: Packs, each a list of indexes into texts
+    """
+    if style:
+        max_chars -= len(style) + 1
+    packs = []
+    current = []
+    size = 0
+    for index, text in enumerate(texts):
+        added = len(text) + (len(PAUSE_LINE) if current else 0)
+        if current and (len(current) == max_items or size + added > max_chars):
+            packs.append(current)
+            current = []
+            added = len(text)
+            size = 0
+        current.append(index)
+        size += added
+    if current:
+        packs.append(current)
+    return packs
+
+
+def pack_prompt(texts, style=None):
+    """Join texts into one prompt with a pause line between every two items."""
+    body = PAUSE_LINE.join(text.strip() for text in texts)
+    return f"{style} {body}" if style else body
+
+
+def synthesize_packed(texts, voice="kore", model=DEFAULT_MODEL, style=None, max_items=DEFAULT_MAX_ITEMS,
+                      max_chars=DEFAULT_MAX_CHARS, min_pause_ms=DEFAULT_MIN_PAUSE_MS, max_workers=4):
+    """
+    Synthesize many short texts with one voice, packing them into few requests.
+
+    Args:
+        texts (list): Utterances in order
+        voice (str): Voice name shared by every text
+        model (str): TTS model name
+        style (str): Optional style instruction prepended to every request
+        max_items (int): Most texts per request
+        max_chars (int): Character budget per request
+        min_pause_ms (int): Shortest silence treated as the pause between items
+        max_workers (int): Maximum number of requests in flight
+
+    Returns:
+        tuple: (clips, report) where clips holds one bytes-like PCM clip per
+               text, in order, and report has "items", "packs", "requests"
+               and "fallback_packs"
+    """
+    packs = plan_packs(texts, max_items, max_chars, style)
+    clips = [None] * len(texts)
+    report = {"items": len(texts), "packs": len(packs), "requests": 0, "fallback_packs": 0}
+
+    def single(index):
+        contents = f"{style} {texts[index]}" if style else texts[index]
+        return synthesize_pcm(contents, voice, model)
+
+    def run_pack(pack):
+        if len(pack) == 1:
+            return [single(pack[0])], 1, False
+        audio = synthesize_pcm(pack_prompt([texts[index] for index in pack], style), voice, model)
+        segments = split_on_pauses(audio, len(pack), min_pause_ms)
+        if segments is not None:
+            return segments, 1, False
+        # The pauses did not line up with the items; pay for one request each
+        return [single(index) for index in pack], 1 + len(pack), True
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(packs)))) as executor:
+        for pack, (segments, requests, fell_back) in zip(packs, executor.map(with_priority(run_pack), packs)):
+            for index, segment in zip(pack, segments):
+                clips[index] = segment
+            report["requests"] += requests
+            report["fallback_packs"] += fell_back
+    return clips, report
+
+
+def text_to_speech_packed(texts, output_files, voice_name="kore", style=None, model=DEFAULT_MODEL, verbose=None,
+                          **kwargs):
+    """
+    Write one WAV per text, synthesized with request packing.
+
+    Args:
+        texts (list): Utterances in order
+        output_files (list): One output WAV filename per text
+        voice_name (str): Voice name shared by every text
+        style (str): Optional style instruction
+        model (str): TTS model name
+        verbose (bool): Print a summary line (default: module setting, see set_verbose)
+        **kwargs: Passed to synthesize_packed()
+
+    Returns:
+        dict: The synthesize_packed() report
+    """
+    if len(output_files) != len(texts):
+        raise ValueError("output_files must have one filename per text")
+    verbose = _resolve_verbose(verbose)
+    require_credentials()
+    clips, report = synthesize_packed(texts, voice_name, model, style, **kwargs)
+    for output_file, clip in zip(output_files, clips):
+        save_wave_file(output_file, clip)
+    if verbose:
+        fallback = f", {report['fallback_packs']} fell back to single calls" if report["fallback_packs"] else ""
+        print(f"📦 {report['items']} clips in {report['requests']} requests "
+              f"({report['packs']} packs{fallback})")
+    return report
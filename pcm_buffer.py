@@ -0,0 +1,173 @@
+"""Growable PCM assembly buffer for multi-part responses and stitched outputs."""
+
+import mmap
+import os
+import wave
+
+from wav_writer import wav_header
+
+
+# Most platforms cap a single writev() at 1024 iovecs
+_IOV_MAX = 1024
+
+
+def _allocate(capacity):
+    """Return a zeroed, writable block whose pages are only committed once written."""
+    # bytearray(n) zero-fills (and so touches) every page up front; an anonymous
+    # mapping is zeroed lazily by the kernel, so reserved capacity costs nothing
+    # until audio is copied into it
+    return mmap.mmap(-1, capacity) if capacity else bytearray()
+
+
+def iter_audio_parts(response):
+    """
+    Yield the inline audio data of every part of every candidate in a response.
+
+    Args:
+        response: GenerateContentResponse (or any object of the same shape)
+
+    Yields:
+        bytes: Inline data payloads in response order
+    """
+    for candidate in response.candidates or ():
+        if candidate.content is None:
+            continue
+        for part in candidate.content.parts or ():
+            if part.inline_data is not None and part.inline_data.data:
+                yield part.inline_data.data
+
+
+class PCMBuffer:
+    """
+    Collects PCM segments into a single preallocated (or growable) buffer.
+
+    Each appended segment is copied exactly once, straight into its final
+    position; the assembled audio is exposed as a memoryview and written to
+    disk with a single writeframes call, so joining N segments never
+    re-copies the audio that came before.
+    """
+
+    def __init__(self, capacity=0):
+        """
+        Args:
+            capacity (int): Bytes to preallocate; when the final size is known
+                            up front the buffer never has to grow
+        """
+        self._buf = _allocate(capacity)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def capacity(self):
+        return len(self._buf)
+
+    def reserve(self, capacity):
+        """Grow the underlying allocation to at least capacity bytes."""
+        if capacity > len(self._buf):
+            # Copy only the used prefix; the rest of the new block stays uncommitted
+            grown = _allocate(capacity)
+            grown[:self._size] = memoryview(self._buf)[:self._size]
+            self._buf = grown
+
+    def append(self, data):
+        """Copy one bytes-like segment to the end of the buffer."""
+        view = memoryview(data).cast("B")
+        end = self._size + len(view)
+        if end > len(self._buf):
+            # Amortized doubling keeps total copying linear in the output size
+            self.reserve(max(end, 2 * len(self._buf)))
+        self._buf[self._size:end] = view
+        self._size = end
+        return len(view)
+
+    def extend(self, segments):
+        """Append every segment from an iterable; returns bytes added."""
+        return sum(self.append(segment) for segment in segments)
+
+    def drain(self, segments):
+        """
+        Append every segment of a list, releasing each one as it is copied.
+
+        Entries of the list are replaced with None once copied, so the
+        segments and the assembled audio are never all held at the same time.
+
+        Args:
+            segments (list): Bytes-like PCM segments in order (emptied in place)
+
+        Returns:
+            int: Bytes added
+        """
+        added = 0
+        for index in range(len(segments)):
+            added += self.append(segments[index])
+            segments[index] = None
+        return added
+
+    def add_response(self, response):
+        """Append the audio of every inline-data part in every candidate of a response."""
+        return self.extend(iter_audio_parts(response))
+
+    def view(self):
+        """Return a zero-copy memoryview of the assembled audio."""
+        return memoryview(self._buf)[:self._size]
+
+    def to_bytes(self):
+        """Return an immutable copy of the assembled audio."""
+        return bytes(self.view())
+
+    def write_wave(self, filename, channels=1, rate=24000, sample_width=2):
+        """Write the assembled audio to a WAV file with one writeframes call."""
+        with wave.open(filename, "wb") as wf:
+            wf.setnchannels(channels)
+            wf.setsampwidth(sample_width)
+            wf.setframerate(rate)
+            wf.writeframes(self.view())
+
+
+def write_wave_segments(filename, segments, channels=1, rate=24000, sample_width=2):
+    """
+    Write a WAV file from PCM segments without joining them in memory.
+
+    The header and segments are handed to os.writev (gather write), so the
+    segments are never copied into an intermediate buffer. Falls back to
+    sequential writes where writev is unavailable.
+
+    Args:
+        filename (str): Output filename
+        segments (list): Bytes-like PCM segments in order
+        channels (int): Number of audio channels
+        rate (int): Sample rate in Hz
+        sample_width (int): Sample width in bytes
+
+    Returns:
+        int: Number of PCM bytes written
+    """
+    views = [memoryview(segment).cast("B") for segment in segments]
+    data_size = sum(len(view) for view in views)
+    iovecs = [wav_header(data_size, channels, rate, sample_width)] + [v for v in views if len(v)]
+    if data_size % 2:
+        iovecs.append(b"\x00")
+
+    with open(filename, "wb") as f:
+        if not hasattr(os, "writev"):
+            for iovec in iovecs:
+                f.write(iovec)
+            return data_size
+        fd = f.fileno()
+        pending = list(iovecs)
+        while pending:
+            batch = pending[:_IOV_MAX]
+            written = os.writev(fd, batch)
+            # Drop fully written buffers and trim a partially written one
+            consumed = 0
+            for index, iovec in enumerate(batch):
+                if written >= len(iovec):
+                    written -= len(iovec)
+                    consumed += 1
+                else:
+                    pending[index] = memoryview(iovec)[written:]
+                    break
+            del pending[:consumed]
+    return data_size
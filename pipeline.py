@@ -0,0 +1,236 @@
+"""
+Staged producer/consumer pipelines for multi-item synthesis runs.
+
+A Pipeline runs each item through a list of stages, e.g. network fetch,
+post-processing and file output. Every stage has its own worker threads
+and the stages are joined by bounded queues, so while one item is being
+written to disk the next is being post-processed and the one after that
+is still waiting on the network. At most max_in_flight items are inside
+the pipeline at once, which bounds the audio held in memory.
+
+A failing item is passed through the remaining stages untouched and its
+exception is raised (or returned) once the pipeline has drained, so one
+bad item never stalls the others.
+
+Every stage reports how long its workers were busy, how long they waited
+for input from the stage before (starved) and how long they waited for
+room in the queue to the stage after (blocked).
+
+Usage:
+    pipeline = Pipeline([Stage("fetch", fetch, workers=2), Stage("write", write)])
+    results = pipeline.run(items)
+    print_pipeline_stats(pipeline)
+"""
+
+import queue
+import threading
+import time
+
+from scheduler import with_priority
+
+
+DEFAULT_MAX_QUEUE = 2
+
+_DONE = object()
+
+
+class _Failure:
+    """An item whose stage raised; passed through the remaining stages as is."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error):
+        self.error = error
+
+
+class Stage:
+    """One pipeline step: a function applied to every item by a pool of workers."""
+
+    def __init__(self, name, func, workers=1, ordered=False):
+        """
+        Args:
+            name (str): Label used in stats
+            func (callable): Called with the previous stage's result for each item
+            workers (int): Threads running func
+            ordered (bool): Hand items to func in input order (needs a single worker),
+                            e.g. for appending chunks to one file
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if ordered and workers != 1:
+            raise ValueError("an ordered stage must have exactly one worker")
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.ordered = ordered
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.items = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.starved_seconds = 0.0
+        self.blocked_seconds = 0.0
+
+    def _add(self, items, errors, busy, starved, blocked):
+        with self._lock:
+            self.items += items
+            self.errors += errors
+            self.busy_seconds += busy
+            self.starved_seconds += starved
+            self.blocked_seconds += blocked
+
+    def stats(self, wall_seconds):
+        capacity = self.workers * wall_seconds
+        return {
+            "stage": self.name,
+            "workers": self.workers,
+            "items": self.items,
+            "errors": self.errors,
+            "busy_seconds": self.busy_seconds,
+            "starved_seconds": self.starved_seconds,
+            "blocked_seconds": self.blocked_seconds,
+            "utilization": self.busy_seconds / capacity if capacity > 0 else 0.0,
+        }
+
+
+class Pipeline:
+    """Runs items through stages connected by bounded queues."""
+
+    def __init__(self, stages, max_queue=DEFAULT_MAX_QUEUE, max_in_flight=None):
+        """
+        Args:
+            stages (list): Stage objects, in order
+            max_queue (int): Capacity of the queue in front of every stage
+            max_in_flight (int): Most items inside the pipeline at once
+                                 (default: every worker busy and every queue full)
+        """
+        if not stages:
+            raise ValueError("a pipeline needs at least one stage")
+        self.stages = stages
+        self.max_queue = max_queue
+        self.max_in_flight = max_in_flight or sum(stage.workers for stage in stages) + max_queue * len(stages)
+        self.wall_seconds = 0.0
+
+    def _work(self, position, func, inbox, outbox, finished):
+        stage = self.stages[position]
+        items = errors = 0
+        busy = starved = blocked = 0.0
+        waiting = {}
+        next_index = 0
+        while True:
+            start = time.perf_counter()
+            entry = inbox.get()
+            starved += time.perf_counter() - start
+            if entry is _DONE:
+                break
+            if stage.ordered:
+                waiting[entry[0]] = entry[1]
+                ready = []
+                while next_index in waiting:
+                    ready.append((next_index, waiting.pop(next_index)))
+                    next_index += 1
+            else:
+                ready = [entry]
+            for index, value in ready:
+                if not isinstance(value, _Failure):
+                    start = time.perf_counter()
+                    try:
+                        value = func(value)
+                    except Exception as e:
+                        value = _Failure(e)
+                        errors += 1
+                    busy += time.perf_counter() - start
+                    items += 1
+                start = time.perf_counter()
+                outbox.put((index, value))
+                blocked += time.perf_counter() - start
+        stage._add(items, errors, busy, starved, blocked)
+        finished(position, outbox)
+
+    def run(self, items, return_exceptions=False):
+        """
+        Push every item through the stages and wait for the last one.
+
+        Stage functions run in the caller's scheduler priority class.
+
+        Args:
+            items (iterable): Inputs of the first stage
+            return_exceptions (bool): Put exceptions in place of results instead
+                                      of raising the first one
+
+        Returns:
+            list: The last stage's result for every item, in input order
+        """
+        items = list(items)
+        for stage in self.stages:
+            stage.reset()
+        queues = [queue.Queue(maxsize=self.max_queue) for _ in self.stages] + [queue.Queue()]
+        admitted = threading.BoundedSemaphore(self.max_in_flight)
+        running = [stage.workers for stage in self.stages]
+        lock = threading.Lock()
+
+        def finished(position, outbox):
+            with lock:
+                running[position] -= 1
+                last = running[position] == 0
+            if last:
+                # Every worker of the next stage (or the collector) gets its own sentinel
+                following = self.stages[position + 1].workers if position + 1 < len(self.stages) else 1
+                for _ in range(following):
+                    outbox.put(_DONE)
+
+        def feed():
+            for index, item in enumerate(items):
+                admitted.acquire()
+                queues[0].put((index, item))
+            for _ in range(self.stages[0].workers):
+                queues[0].put(_DONE)
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=feed, name="pipeline-feed", daemon=True)]
+        for position, stage in enumerate(self.stages):
+            func = with_priority(stage.func)
+            threads.extend(
+                threading.Thread(
+                    target=self._work,
+                    args=(position, func, queues[position], queues[position + 1], finished),
+                    name=f"pipeline-{stage.name}",
+                    daemon=True,
+                )
+                for _ in range(stage.workers)
+            )
+        for thread in threads:
+            thread.start()
+
+        results = [None] * len(items)
+        while True:
+            entry = queues[-1].get()
+            if entry is _DONE:
+                break
+            index, value = entry
+            results[index] = value
+            admitted.release()
+        for thread in threads:
+            thread.join()
+        self.wall_seconds = time.perf_counter() - start
+
+        failures = [value for value in results if isinstance(value, _Failure)]
+        if failures and not return_exceptions:
+            raise failures[0].error
+        return [value.error if isinstance(value, _Failure) else value for value in results]
+
+    def stats(self):
+        """Return busy, starved and blocked time per stage for the last run."""
+        return [stage.stats(self.wall_seconds) for stage in self.stages]
+
+
+def print_pipeline_stats(pipeline):
+    """Print per-stage busy and waiting time for the last run."""
+    print(f"🏭 Pipeline stages ({pipeline.wall_seconds:.1f}s wall):")
+    for row in pipeline.stats():
+        print(f"   {row['stage']}: {row['items']} items on {row['workers']} workers, "
+              f"busy {row['busy_seconds']:.1f}s ({row['utilization']:.0%}), "
+              f"waiting for input {row['starved_seconds']:.1f}s, "
+              f"waiting for output {row['blocked_seconds']:.1f}s")
@@ -0,0 +1,439 @@
+"""
+Pre-flight planning for batch runs.
+
+A plan is built from the exact prompts a run would send (the same chunking
+and speaker-run splitting as the real code paths) without touching the
+network. For every job it estimates:
+
+- requests (chunks), and how many are already in the audio cache
+- input tokens (about 4 characters per token, like the chunk budgets)
+- audio duration, from a chars-per-second speech rate per voice
+- output tokens (audio is counted at 32 tokens per second)
+
+A schedule simulation then applies the concurrency of the run and the
+per-minute request/token quotas to estimate wall time and whether the run
+would be throttled.
+
+The speech-rate model defaults to 15 characters per second for every voice.
+Calibrate it from real runs logged with --metrics-jsonl:
+
+    python planner.py calibrate metrics.jsonl --output speech_rates.json
+    python full_papers_generator.py --all --plan --rates speech_rates.json --rpm 10
+"""
+
+import argparse
+import bisect
+import heapq
+import json
+
+from audio_cache import cache_key, get_default_cache
+from chunking import estimate_tokens
+from dialogue_engine import dialogue_requests
+from dialogue_model import Dialogue
+from gemini_tts_example import DEFAULT_MODEL, speaker_voices
+
+
+DEFAULT_CHARS_PER_SECOND = 15.0
+AUDIO_TOKENS_PER_SECOND = 32
+# Seconds of request latency: overhead + ratio * audio seconds
+DEFAULT_REQUEST_OVERHEAD = 1.0
+DEFAULT_GENERATION_RATIO = 0.3
+# Events that cover several upstream requests, so their latency is not per request
+_MULTI_REQUEST_OPERATIONS = {"create_full_paper_presentation"}
+
+
+def _voice_names(voices):
+    if isinstance(voices, str):
+        return [voices]
+    if isinstance(voices, dict):
+        return list(voices.values())
+    return [voice for _, voice in voices]
+
+
+class SpeechRateModel:
+    """Chars-per-second speech rates per voice plus a linear request latency model."""
+
+    def __init__(self, default_cps=DEFAULT_CHARS_PER_SECOND, voice_cps=None,
+                 request_overhead=DEFAULT_REQUEST_OVERHEAD, generation_ratio=DEFAULT_GENERATION_RATIO):
+        """
+        Args:
+            default_cps (float): Prompt characters per second of audio for unknown voices
+            voice_cps (dict): Voice name -> characters per second
+            request_overhead (float): Fixed seconds per request
+            generation_ratio (float): Request seconds per second of audio generated
+        """
+        self.default_cps = default_cps
+        self.voice_cps = {voice.casefold(): cps for voice, cps in (voice_cps or {}).items()}
+        self.request_overhead = request_overhead
+        self.generation_ratio = generation_ratio
+
+    def chars_per_second(self, voices):
+        """Speech rate for a voice, or the mean rate of a multi-speaker voice tuple."""
+        rates = [self.voice_cps.get(voice.casefold(), self.default_cps) for voice in _voice_names(voices)]
+        return sum(rates) / len(rates) if rates else self.default_cps
+
+    def audio_seconds(self, contents, voices):
+        return len(contents) / self.chars_per_second(voices)
+
+    def request_seconds(self, audio_seconds):
+        return self.request_overhead + self.generation_ratio * audio_seconds
+
+    def to_dict(self):
+        return {
+            "default_cps": self.default_cps,
+            "voice_cps": dict(sorted(self.voice_cps.items())),
+            "request_overhead": self.request_overhead,
+            "generation_ratio": self.generation_ratio,
+        }
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(**json.load(f))
+
+    @classmethod
+    def from_events(cls, events):
+        """
+        Calibrate from metrics events (see metrics.JsonLinesSink).
+
+        Speech rates are characters over audio seconds of successful calls,
+        per voice (a multi-speaker call counts towards each of its voices).
+        The latency model is a least-squares fit of request-phase seconds
+        against audio seconds over single-request calls; defaults are kept
+        when there is not enough data.
+
+        Args:
+            events (iterable): Event dicts
+
+        Returns:
+            SpeechRateModel: The calibrated model
+        """
+        chars = {}
+        seconds = {}
+        points = []
+        for event in events:
+            audio = event.get("audio_seconds") or 0
+            if event.get("outcome") != "ok" or audio <= 0:
+                continue
+            for voice in _voice_names(event["voices"]):
+                voice = voice.casefold()
+                chars[voice] = chars.get(voice, 0) + event["chars"]
+                seconds[voice] = seconds.get(voice, 0.0) + audio
+            request = event.get("phases", {}).get("request")
+            single = event.get("requests", 1) == 1 and event.get("operation") not in _MULTI_REQUEST_OPERATIONS
+            if request is not None and single:
+                points.append((audio, request))
+
+        model = cls()
+        if seconds:
+            model.voice_cps = {voice: chars[voice] / seconds[voice] for voice in chars}
+            model.default_cps = sum(chars.values()) / sum(seconds.values())
+        if len(points) >= 2:
+            n = len(points)
+            mean_x = sum(x for x, _ in points) / n
+            mean_y = sum(y for _, y in points) / n
+            var_x = sum((x - mean_x) ** 2 for x, _ in points)
+            if var_x > 0:
+                slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+                model.generation_ratio = max(0.0, slope)
+                model.request_overhead = max(0.0, mean_y - model.generation_ratio * mean_x)
+        return model
+
+    @classmethod
+    def from_metrics_jsonl(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_events(json.loads(line) for line in f if line.strip())
+
+
+class RateLimits:
+    """Quotas and concurrency the schedule has to respect (None means unlimited)."""
+
+    def __init__(self, rpm=None, tpm=None, rpd=None, job_concurrency=1, request_concurrency=4):
+        """
+        Args:
+            rpm (int): Requests per minute
+            tpm (int): Input tokens per minute
+            rpd (int): Requests per day
+            job_concurrency (int): Jobs run at once
+            request_concurrency (int): Requests in flight per job
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self.rpd = rpd
+        self.job_concurrency = max(1, job_concurrency)
+        self.request_concurrency = max(1, request_concurrency)
+
+
+def script_requests(script, speakers_config=None):
+    """
+    Return the (contents, voices) requests for one dialogue sent without chunking.
+
+    Scripts with more than two speakers are split into runs like
+    text_to_speech_dialogue() does. Without a speakers config the speaker
+    labels stand in for voices, so the default speech rate applies.
+
+    Args:
+        script (str | list | Dialogue): Dialogue text, (speaker, text) pairs or a Dialogue
+        speakers_config (list): Optional {"name": ..., "voice": ...} dicts
+
+    Returns:
+        list: (contents, voices) tuples
+    """
+    if speakers_config is None:
+        dialogue = Dialogue.coerce(script)
+        speakers_config = [{"name": speaker, "voice": speaker} for speaker in dialogue.speakers]
+    else:
+        dialogue = Dialogue.for_speakers(script, speakers_config)
+    if len(dialogue.speakers) > 2:
+        return dialogue_requests(dialogue, speakers_config)
+    return [(dialogue.to_text(), speaker_voices(speakers_config))]
+
+
+def plan_job(name, requests, rates=None, model=DEFAULT_MODEL, cache=None):
+    """
+    Estimate one job from the requests it would send.
+
+    Args:
+        name (str): Job name
+        requests (list): (contents, voices) tuples
+        rates (SpeechRateModel): Speech-rate model (default: uncalibrated)
+        model (str): TTS model name (part of the cache key)
+        cache (AudioCache): Cache to look requests up in (None: no lookups)
+
+    Returns:
+        dict: "name", "requests" (per-request estimates), "chunks", "cached",
+              "chars", "input_tokens", "audio_seconds" and "output_tokens"
+    """
+    rates = rates or SpeechRateModel()
+    estimates = []
+    for contents, voices in requests:
+        audio_seconds = rates.audio_seconds(contents, voices)
+        estimates.append({
+            "chars": len(contents),
+            "input_tokens": estimate_tokens(contents),
+            "audio_seconds": audio_seconds,
+            "output_tokens": round(audio_seconds * AUDIO_TOKENS_PER_SECOND),
+            "cached": bool(cache) and cache_key(model, contents, voices) in cache,
+        })
+    billed = [estimate for estimate in estimates if not estimate["cached"]]
+    return {
+        "name": name,
+        "requests": estimates,
+        "chunks": len(estimates),
+        "cached": len(estimates) - len(billed),
+        "chars": sum(estimate["chars"] for estimate in billed),
+        "input_tokens": sum(estimate["input_tokens"] for estimate in billed),
+        "audio_seconds": sum(estimate["audio_seconds"] for estimate in estimates),
+        "output_tokens": sum(estimate["output_tokens"] for estimate in billed),
+    }
+
+
+def _window_count(times, weights, start, end):
+    """Sum of weights whose time falls in (start, end]; times is sorted."""
+    return sum(weights[bisect.bisect_right(times, start):bisect.bisect_right(times, end)])
+
+
+def schedule(jobs, limits=None, rates=None):
+    """
+    Simulate a run: jobs start on free job slots, their uncached requests on
+    free request slots, and no request starts while a sliding one-minute
+    window is at its request or token quota.
+
+    Args:
+        jobs (list): plan_job() results, in run order
+        limits (RateLimits): Quotas and concurrency (default: unlimited, 1 job x 4 requests)
+        rates (SpeechRateModel): Latency model (default: uncalibrated)
+
+    Returns:
+        dict: "wall_seconds", "request_seconds" (summed latency), "throttled_seconds"
+              (summed time requests waited for quota), "peak_rpm", "peak_tpm" and
+              per-job "job_seconds" (start, end) tuples
+    """
+    limits = limits or RateLimits()
+    rates = rates or SpeechRateModel()
+    job_slots = [0.0] * limits.job_concurrency
+    starts = []
+    counts = []
+    tokens = []
+    request_seconds = 0.0
+    throttled = 0.0
+    job_seconds = []
+
+    for job in jobs:
+        job_start = heapq.heappop(job_slots)
+        workers = [job_start] * limits.request_concurrency
+        job_end = job_start
+        for request in job["requests"]:
+            if request["cached"]:
+                continue
+            ready = heapq.heappop(workers)
+            start = ready
+            while True:
+                if limits.rpm and _window_count(starts, counts, start - 60, start) >= limits.rpm:
+                    # Wait until the oldest request in the window ages out
+                    start = starts[bisect.bisect_right(starts, start - 60)] + 60
+                    continue
+                if limits.tpm and _window_count(starts, tokens, start - 60, start) \
+                        + request["input_tokens"] > limits.tpm:
+                    index = bisect.bisect_right(starts, start - 60)
+                    if index < len(starts) and starts[index] <= start:
+                        start = starts[index] + 60
+                        continue
+                break
+            throttled += start - ready
+            latency = rates.request_seconds(request["audio_seconds"])
+            request_seconds += latency
+            index = bisect.bisect_right(starts, start)
+            starts.insert(index, start)
+            counts.insert(index, 1)
+            tokens.insert(index, request["input_tokens"])
+            heapq.heappush(workers, start + latency)
+            job_end = max(job_end, start + latency)
+        job_seconds.append((job_start, job_end))
+        heapq.heappush(job_slots, job_end)
+
+    peak_rpm = max((_window_count(starts, counts, t - 60, t) for t in starts), default=0)
+    peak_tpm = max((_window_count(starts, tokens, t - 60, t) for t in starts), default=0)
+    return {
+        "wall_seconds": max((end for _, end in job_seconds), default=0.0),
+        "request_seconds": request_seconds,
+        "throttled_seconds": throttled,
+        "peak_rpm": peak_rpm,
+        "peak_tpm": peak_tpm,
+        "job_seconds": job_seconds,
+    }
+
+
+def build_plan(jobs, limits=None, rates=None, model=DEFAULT_MODEL, cache=None):
+    """
+    Plan a batch run without making any requests.
+
+    Args:
+        jobs (list): (name, requests) tuples, where requests are (contents, voices)
+        limits (RateLimits): Quotas and concurrency of the run
+        rates (SpeechRateModel): Speech-rate and latency model
+        model (str): TTS model name
+        cache (AudioCache): Audio cache to discount already-synthesized requests
+
+    Returns:
+        dict: "jobs" (plan_job() results), "totals", "schedule" (schedule() result)
+              and "limits"
+    """
+    limits = limits or RateLimits()
+    rates = rates or SpeechRateModel()
+    planned = [plan_job(name, requests, rates, model, cache) for name, requests in jobs]
+    totals = {
+        field: sum(job[field] for job in planned)
+        for field in ("chunks", "cached", "chars", "input_tokens", "audio_seconds", "output_tokens")
+    }
+    return {
+        "jobs": planned,
+        "totals": totals,
+        "schedule": schedule(planned, limits, rates),
+        "limits": limits,
+    }
+
+
+def estimate_cost(plan, input_price=None, output_price=None):
+    """Cost in the pricing currency, from prices per million input/output tokens (None if unpriced)."""
+    if input_price is None and output_price is None:
+        return None
+    totals = plan["totals"]
+    return (totals["input_tokens"] * (input_price or 0) + totals["output_tokens"] * (output_price or 0)) / 1e6
+
+
+def _format_duration(seconds):
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def print_plan(plan, input_price=None, output_price=None):
+    """Print the per-job estimates and the schedule of a build_plan() result."""
+    totals = plan["totals"]
+    timing = plan["schedule"]
+    limits = plan["limits"]
+    print("🧮 Dry run: nothing will be synthesized")
+    print(f"   {'job':<32} {'chunks':>6} {'cached':>6} {'in tok':>8} {'audio':>9} {'out tok':>8}")
+    for job in plan["jobs"]:
+        print(f"   {job['name'][:32]:<32} {job['chunks']:>6} {job['cached']:>6} {job['input_tokens']:>8} "
+              f"{_format_duration(job['audio_seconds']):>9} {job['output_tokens']:>8}")
+    print(f"   {'total':<32} {totals['chunks']:>6} {totals['cached']:>6} {totals['input_tokens']:>8} "
+          f"{_format_duration(totals['audio_seconds']):>9} {totals['output_tokens']:>8}")
+    requests = totals["chunks"] - totals["cached"]
+    print(f"📨 {requests} requests, {totals['input_tokens']} input tokens, "
+          f"{totals['output_tokens']} output tokens, {totals['audio_seconds'] / 60:.1f} audio minutes")
+    cost = estimate_cost(plan, input_price, output_price)
+    if cost is not None:
+        print(f"💰 Estimated cost: {cost:.4f}")
+
+    quota = ", ".join(
+        f"{value} {name}" for name, value in (("rpm", limits.rpm), ("tpm", limits.tpm)) if value
+    ) or "no quota"
+    print(f"🗓️  Schedule ({limits.job_concurrency} job(s) x {limits.request_concurrency} requests, {quota}): "
+          f"~{_format_duration(timing['wall_seconds'])} wall time")
+    print(f"   Peak {timing['peak_rpm']} requests and {timing['peak_tpm']} tokens in any minute")
+    if timing["throttled_seconds"] > 0:
+        print(f"⚠️  Requests wait {_format_duration(timing['throttled_seconds'])} in total for quota")
+    else:
+        print("✅ Fits within the per-minute quota")
+    if limits.rpd and requests > limits.rpd:
+        print(f"⚠️  {requests} requests exceed the daily quota of {limits.rpd}")
+
+
+def add_plan_arguments(parser):
+    """Add --plan and the quota/rate options it uses to an argparse parser."""
+    parser.add_argument("--plan", action="store_true",
+                        help="Estimate requests, tokens, audio duration and wall time without synthesizing")
+    parser.add_argument("--rpm", type=int, help="Requests-per-minute quota for --plan")
+    parser.add_argument("--tpm", type=int, help="Input-tokens-per-minute quota for --plan")
+    parser.add_argument("--rpd", type=int, help="Requests-per-day quota for --plan")
+    parser.add_argument("--rates", metavar="PATH",
+                        help="Speech-rate model from 'python planner.py calibrate' for --plan")
+    parser.add_argument("--price-input", type=float, metavar="PRICE",
+                        help="Price per million input tokens for --plan")
+    parser.add_argument("--price-output", type=float, metavar="PRICE",
+                        help="Price per million output tokens for --plan")
+
+
+def plan_from_args(args, jobs, job_concurrency=1, request_concurrency=4):
+    """
+    Build and print a plan from the options added by add_plan_arguments().
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+        jobs (list): (name, requests) tuples
+        job_concurrency (int): Jobs the CLI runs at once
+        request_concurrency (int): Requests each job keeps in flight
+
+    Returns:
+        dict: The plan
+    """
+    rates = SpeechRateModel.load(args.rates) if args.rates else SpeechRateModel()
+    limits = RateLimits(args.rpm, args.tpm, args.rpd, job_concurrency, request_concurrency)
+    plan = build_plan(jobs, limits, rates, cache=get_default_cache())
+    print_plan(plan, args.price_input, args.price_output)
+    return plan
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch run planning tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    calibrate = commands.add_parser("calibrate", help="Fit a speech-rate model from a metrics JSON Lines log")
+    calibrate.add_argument("metrics", help="File written by --metrics-jsonl / GEMINI_TTS_METRICS_JSONL")
+    calibrate.add_argument("--output", "-o", default="speech_rates.json",
+                           help="Where to write the model (default: speech_rates.json)")
+    args = parser.parse_args()
+
+    rates = SpeechRateModel.from_metrics_jsonl(args.metrics)
+    rates.save(args.output)
+    print(f"✅ Calibrated {len(rates.voice_cps)} voice(s), default {rates.default_cps:.1f} chars/s, "
+          f"latency {rates.request_overhead:.2f}s + {rates.generation_ratio:.2f}x audio -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
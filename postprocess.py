@@ -0,0 +1,543 @@
+"""
+Optional post-processing of synthesized 16-bit mono PCM.
+
+Stitched clips come back with uneven loudness, long leading/trailing
+silences and clicks where segments meet. PostProcessor fixes all three
+before the WAV write:
+
+- silence trimming: frames whose RMS is below a threshold are cut from the
+  start and end of every segment, keeping a short pad
+- normalization: one gain for the whole output, to a peak or RMS target
+  (RMS targets are limited so the peak never clips)
+- crossfades: a short linear crossfade at every join removes clicks
+
+find_pauses() and split_on_pauses() use the same frame analysis to cut a
+packed multi-utterance clip back into its items (see packing.py).
+
+All analysis runs block-wise over NumPy views of the PCM, so working memory
+is bounded by the block size rather than the clip length, and
+process_wave_file() streams file-to-file without loading the input.
+
+NumPy is only imported when a processing function is first called.
+Set GEMINI_TTS_POSTPROCESS=1 to enable the default processor for paper
+presentations and dialogues.
+"""
+
+import os
+import threading
+import time
+import wave
+
+from wav_writer import IncrementalWavWriter
+
+
+SAMPLE_RATE = 24000
+SAMPLE_WIDTH = 2
+BYTES_PER_SECOND = SAMPLE_RATE * SAMPLE_WIDTH
+DEFAULT_BLOCK_SECONDS = 10.0
+_FULL_SCALE = 32767.0
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("Audio post-processing requires numpy: pip install numpy") from e
+    return numpy
+
+
+def _samples(pcm):
+    """Return a zero-copy int16 array over bytes-like PCM (an odd trailing byte is ignored)."""
+    np = _numpy()
+    data = memoryview(pcm).cast("B")
+    return np.frombuffer(data[:len(data) - len(data) % SAMPLE_WIDTH], dtype="<i2")
+
+
+def db_to_amplitude(db):
+    """Convert dBFS to a linear int16 amplitude."""
+    return _FULL_SCALE * 10 ** (db / 20)
+
+
+def amplitude_to_db(amplitude):
+    """Convert a linear int16 amplitude to dBFS (-inf for silence)."""
+    np = _numpy()
+    return float(20 * np.log10(amplitude / _FULL_SCALE)) if amplitude > 0 else float("-inf")
+
+
+def _block_samples(block_seconds, frame_samples=1):
+    """Samples per block, rounded down to a whole number of frames."""
+    block = max(frame_samples, int(block_seconds * SAMPLE_RATE))
+    return block - block % frame_samples
+
+
+def _speech_bounds(blocks, frame_samples, threshold):
+    """
+    Scan int16 blocks (each a whole number of frames, except possibly the
+    last) and return (first, last) sample bounds of frames louder than
+    threshold, or None if every frame is silent.
+    """
+    np = _numpy()
+    first = last = None
+    offset = 0
+    for block in blocks:
+        frames = len(block) // frame_samples
+        if frames:
+            framed = block[:frames * frame_samples].reshape(frames, frame_samples).astype(np.float32)
+            rms = np.sqrt(np.mean(framed * framed, axis=1))
+            loud = np.flatnonzero(rms >= threshold)
+            if len(loud):
+                if first is None:
+                    first = offset + int(loud[0]) * frame_samples
+                last = offset + (int(loud[-1]) + 1) * frame_samples
+        tail = block[frames * frame_samples:]
+        if len(tail) and np.sqrt(np.mean(tail.astype(np.float32) ** 2)) >= threshold:
+            if first is None:
+                first = offset + frames * frame_samples
+            last = offset + len(block)
+        offset += len(block)
+    return None if first is None else (first, last)
+
+
+def _levels(blocks):
+    """Return (peak, rms, samples) over int16 blocks."""
+    np = _numpy()
+    peak = 0
+    squares = 0.0
+    count = 0
+    for block in blocks:
+        if not len(block):
+            continue
+        wide = block.astype(np.int32)
+        peak = max(peak, int(np.abs(wide).max()))
+        squares += float(np.dot(wide.astype(np.float64), wide))
+        count += len(block)
+    rms = (squares / count) ** 0.5 if count else 0.0
+    return peak, rms, count
+
+
+def _iter_blocks(samples, block_samples):
+    for start in range(0, len(samples), block_samples):
+        yield samples[start:start + block_samples]
+
+
+def speech_bounds(pcm, threshold_db=-45.0, frame_ms=20, pad_ms=50, block_seconds=DEFAULT_BLOCK_SECONDS):
+    """
+    Find the byte range of a clip that is not leading/trailing silence.
+
+    Args:
+        pcm (bytes-like): 16-bit mono PCM
+        threshold_db (float): Frames with RMS below this level (dBFS) are silent
+        frame_ms (int): Analysis frame length in milliseconds
+        pad_ms (int): Silence kept before the first and after the last loud frame
+        block_seconds (float): Audio analyzed per block
+
+    Returns:
+        tuple: (start, end) byte offsets; (0, 0) if the clip is entirely silent
+    """
+    samples = _samples(pcm)
+    frame_samples = max(1, SAMPLE_RATE * frame_ms // 1000)
+    bounds = _speech_bounds(
+        _iter_blocks(samples, _block_samples(block_seconds, frame_samples)),
+        frame_samples,
+        db_to_amplitude(threshold_db),
+    )
+    if bounds is None:
+        return 0, 0
+    pad = SAMPLE_RATE * pad_ms // 1000
+    start = max(0, bounds[0] - pad)
+    end = min(len(samples), bounds[1] + pad)
+    return start * SAMPLE_WIDTH, end * SAMPLE_WIDTH
+
+
+def trim_silence(pcm, threshold_db=-45.0, frame_ms=20, pad_ms=50, block_seconds=DEFAULT_BLOCK_SECONDS):
+    """
+    Cut leading and trailing silence from a clip.
+
+    Args:
+        pcm (bytes-like): 16-bit mono PCM
+        threshold_db (float): Frames with RMS below this level (dBFS) are silent
+        frame_ms (int): Analysis frame length in milliseconds
+        pad_ms (int): Silence kept at each end
+        block_seconds (float): Audio analyzed per block
+
+    Returns:
+        memoryview: Zero-copy view of the kept range
+    """
+    start, end = speech_bounds(pcm, threshold_db, frame_ms, pad_ms, block_seconds)
+    return memoryview(pcm).cast("B")[start:end]
+
+
+def _frame_rms(blocks, frame_samples):
+    """Return the RMS of every frame (a short last frame included) over int16 blocks."""
+    np = _numpy()
+    levels = []
+    for block in blocks:
+        frames = len(block) // frame_samples
+        if frames:
+            framed = block[:frames * frame_samples].reshape(frames, frame_samples).astype(np.float32)
+            levels.append(np.sqrt(np.mean(framed * framed, axis=1)))
+        tail = block[frames * frame_samples:]
+        if len(tail):
+            levels.append(np.sqrt(np.mean(tail.astype(np.float32) ** 2, keepdims=True)))
+    return np.concatenate(levels) if levels else np.zeros(0, dtype=np.float32)
+
+
+def find_pauses(pcm, min_pause_ms=600, threshold_db=-45.0, frame_ms=20, block_seconds=DEFAULT_BLOCK_SECONDS):
+    """
+    Find silent stretches between speech, e.g. to split a packed request.
+
+    Silence touching the start or end of the clip is not a pause.
+
+    Args:
+        pcm (bytes-like): 16-bit mono PCM
+        min_pause_ms (int): Shortest silence that counts as a pause
+        threshold_db (float): Frames with RMS below this level (dBFS) are silent
+        frame_ms (int): Analysis frame length in milliseconds
+        block_seconds (float): Audio analyzed per block
+
+    Returns:
+        list: (start, end) byte offsets of every pause, in order
+    """
+    np = _numpy()
+    samples = _samples(pcm)
+    frame_samples = max(1, SAMPLE_RATE * frame_ms // 1000)
+    rms = _frame_rms(_iter_blocks(samples, _block_samples(block_seconds, frame_samples)), frame_samples)
+    silent = np.concatenate(([False], rms < db_to_amplitude(threshold_db), [False]))
+    edges = np.flatnonzero(np.diff(silent.astype(np.int8)))
+    starts, ends = edges[0::2], edges[1::2]
+    min_frames = max(1, -(-min_pause_ms // frame_ms))
+    keep = (ends - starts >= min_frames) & (starts > 0) & (ends < len(rms))
+    byte_frame = frame_samples * SAMPLE_WIDTH
+    total = len(samples) * SAMPLE_WIDTH
+    return [
+        (int(start) * byte_frame, min(total, int(end) * byte_frame))
+        for start, end in zip(starts[keep], ends[keep])
+    ]
+
+
+def split_on_pauses(pcm, count, min_pause_ms=600, threshold_db=-45.0, frame_ms=20, pad_ms=50):
+    """
+    Split a clip into count segments at its pauses.
+
+    Args:
+        pcm (bytes-like): 16-bit mono PCM
+        count (int): Expected number of segments
+        min_pause_ms (int): Shortest silence that counts as a pause
+        threshold_db (float): Frames with RMS below this level (dBFS) are silent
+        frame_ms (int): Analysis frame length in milliseconds
+        pad_ms (int): Silence kept at each end of every segment
+
+    Returns:
+        list: count zero-copy memoryviews, or None if the clip does not have
+              exactly count - 1 pauses
+    """
+    pauses = find_pauses(pcm, min_pause_ms, threshold_db, frame_ms)
+    if len(pauses) != count - 1:
+        return None
+    view = memoryview(pcm).cast("B")
+    pad = SAMPLE_RATE * pad_ms // 1000 * SAMPLE_WIDTH
+    bounds = [0] + [edge for pause in pauses for edge in pause] + [len(view)]
+    segments = []
+    for start, end in zip(bounds[0::2], bounds[1::2]):
+        # Keep a little of the surrounding pause, like trim_silence does
+        segments.append(view[max(0, start - pad):min(len(view), end + pad)])
+    return segments
+
+
+def measure_levels(pcm, block_seconds=DEFAULT_BLOCK_SECONDS):
+    """
+    Measure the peak and RMS level of a clip.
+
+    Returns:
+        dict: "peak" and "rms" as int16 amplitudes, and "peak_db"/"rms_db" in dBFS
+    """
+    samples = _samples(pcm)
+    peak, rms, _ = _levels(_iter_blocks(samples, _block_samples(block_seconds)))
+    return {"peak": peak, "rms": rms, "peak_db": amplitude_to_db(peak), "rms_db": amplitude_to_db(rms)}
+
+
+def normalization_gain(peak, rms, mode="peak", target_db=-1.0, ceiling_db=-1.0):
+    """
+    Return the linear gain that brings a clip to the target level.
+
+    Args:
+        peak (float): Peak amplitude of the clip
+        rms (float): RMS amplitude of the clip
+        mode (str): "peak" or "rms"
+        target_db (float): Target peak or RMS level in dBFS
+        ceiling_db (float): Highest peak an RMS-normalized clip may reach
+
+    Returns:
+        float: Gain factor (1.0 for silent clips)
+    """
+    if mode == "peak":
+        return db_to_amplitude(target_db) / peak if peak else 1.0
+    if mode == "rms":
+        if not rms:
+            return 1.0
+        gain = db_to_amplitude(target_db) / rms
+        return min(gain, db_to_amplitude(ceiling_db) / peak) if peak else gain
+    raise ValueError(f"Unknown normalization mode: {mode}")
+
+
+def apply_gain(pcm, gain, out=None, block_seconds=DEFAULT_BLOCK_SECONDS):
+    """
+    Scale a clip by a constant gain, clipping to the int16 range.
+
+    Args:
+        pcm (bytes-like): 16-bit mono PCM
+        gain (float): Linear gain
+        out (bytearray): Destination of the same size (may be pcm itself)
+        block_seconds (float): Audio processed per block
+
+    Returns:
+        bytearray: The scaled PCM
+    """
+    np = _numpy()
+    samples = _samples(pcm)
+    if out is None:
+        out = bytearray(len(samples) * SAMPLE_WIDTH)
+    target = np.frombuffer(out, dtype="<i2")
+    block = _block_samples(block_seconds)
+    for start in range(0, len(samples), block):
+        scaled = samples[start:start + block].astype(np.float32) * np.float32(gain)
+        np.rint(scaled, out=scaled)
+        np.clip(scaled, -32768, 32767, out=scaled)
+        target[start:start + block] = scaled
+    return out
+
+
+def crossfade_join(segments, crossfade_ms=10):
+    """
+    Join PCM segments with a short linear crossfade at every boundary.
+
+    Each join overlaps the end of one segment with the start of the next,
+    so the output is shorter than the plain concatenation by one
+    crossfade per join (limited by the length of the shorter segment).
+
+    Args:
+        segments (list): Bytes-like 16-bit mono PCM segments in order
+        crossfade_ms (int): Crossfade length in milliseconds (0 for a plain join)
+
+    Returns:
+        bytearray: The joined PCM
+    """
+    np = _numpy()
+    arrays = [_samples(segment) for segment in segments]
+    fade = SAMPLE_RATE * crossfade_ms // 1000
+    overlaps = [0]
+    for previous, current in zip(arrays, arrays[1:]):
+        overlaps.append(min(fade, len(previous), len(current)))
+
+    out = bytearray((sum(len(a) for a in arrays) - sum(overlaps)) * SAMPLE_WIDTH)
+    target = np.frombuffer(out, dtype="<i2")
+    position = 0
+    for samples, overlap in zip(arrays, overlaps):
+        if overlap:
+            ramp = np.linspace(0.0, 1.0, overlap + 2, dtype=np.float32)[1:-1]
+            region = slice(position - overlap, position)
+            mixed = target[region] * (1 - ramp) + samples[:overlap] * ramp
+            target[region] = np.clip(np.rint(mixed), -32768, 32767)
+        rest = len(samples) - overlap
+        target[position:position + rest] = samples[overlap:]
+        position += rest
+    return out
+
+
+class PostProcessor:
+    """
+    Trim, crossfade and normalize synthesized segments before they are written.
+
+    One processor can be shared by concurrent callers; cumulative totals
+    (including throughput in audio-seconds per CPU-second) are kept under a
+    lock and returned by stats().
+    """
+
+    def __init__(self, trim=True, threshold_db=-45.0, pad_ms=150, normalize="peak", target_db=-1.0,
+                 ceiling_db=-1.0, crossfade_ms=10, frame_ms=20, block_seconds=DEFAULT_BLOCK_SECONDS):
+        """
+        Args:
+            trim (bool): Trim leading/trailing silence of every segment
+            threshold_db (float): RMS level (dBFS) below which a frame counts as silence
+            pad_ms (int): Silence kept at each end of a trimmed segment
+            normalize (str): "peak", "rms" or None
+            target_db (float): Target peak or RMS level in dBFS
+            ceiling_db (float): Peak limit for RMS normalization
+            crossfade_ms (int): Crossfade length at joins (0 disables crossfades)
+            frame_ms (int): Analysis frame length for trimming
+            block_seconds (float): Audio analyzed/scaled per block
+        """
+        self.trim = trim
+        self.threshold_db = threshold_db
+        self.pad_ms = pad_ms
+        self.normalize = normalize
+        self.target_db = target_db
+        self.ceiling_db = ceiling_db
+        self.crossfade_ms = crossfade_ms
+        self.frame_ms = frame_ms
+        self.block_seconds = block_seconds
+        self._lock = threading.Lock()
+        self._totals = {"calls": 0, "input_seconds": 0.0, "output_seconds": 0.0, "cpu_seconds": 0.0}
+        self.last_report = None
+
+    def settings(self):
+        """Return the processing parameters (e.g. for hashing a job's inputs)."""
+        return {
+            key: value for key, value in vars(self).items()
+            if not key.startswith("_") and key != "last_report"
+        }
+
+    def process(self, segments):
+        """
+        Post-process one clip or a list of segments into a single clip.
+
+        Args:
+            segments (bytes-like | list): PCM, or PCM segments to join in order
+
+        Returns:
+            memoryview: The processed PCM
+        """
+        if not isinstance(segments, (list, tuple)):
+            segments = [segments]
+        # Per-thread CPU time, so concurrent callers do not count each other's work
+        cpu_start = time.thread_time()
+        input_bytes = sum(len(memoryview(segment).cast("B")) for segment in segments)
+
+        if self.trim:
+            segments = [
+                trim_silence(segment, self.threshold_db, self.frame_ms, self.pad_ms, self.block_seconds)
+                for segment in segments
+            ]
+        trimmed_bytes = input_bytes - sum(len(segment) for segment in segments)
+        audio = crossfade_join(segments, self.crossfade_ms)
+
+        gain = 1.0
+        if self.normalize:
+            levels = measure_levels(audio, self.block_seconds)
+            gain = normalization_gain(levels["peak"], levels["rms"], self.normalize,
+                                      self.target_db, self.ceiling_db)
+            apply_gain(audio, gain, out=audio, block_seconds=self.block_seconds)
+
+        cpu_seconds = time.thread_time() - cpu_start
+        report = {
+            "segments": len(segments),
+            "input_seconds": input_bytes / BYTES_PER_SECOND,
+            "output_seconds": len(audio) / BYTES_PER_SECOND,
+            "trimmed_seconds": trimmed_bytes / BYTES_PER_SECOND,
+            "gain_db": amplitude_to_db(gain * _FULL_SCALE),
+            "cpu_seconds": cpu_seconds,
+            "throughput": _throughput(input_bytes / BYTES_PER_SECOND, cpu_seconds),
+        }
+        with self._lock:
+            self._totals["calls"] += 1
+            self._totals["input_seconds"] += report["input_seconds"]
+            self._totals["output_seconds"] += report["output_seconds"]
+            self._totals["cpu_seconds"] += cpu_seconds
+            self.last_report = report
+        return memoryview(audio)
+
+    def stats(self):
+        """Return cumulative totals and throughput (audio-seconds per CPU-second)."""
+        with self._lock:
+            totals = dict(self._totals)
+        totals["throughput"] = _throughput(totals["input_seconds"], totals["cpu_seconds"])
+        return totals
+
+
+def _throughput(audio_seconds, cpu_seconds):
+    return audio_seconds / cpu_seconds if cpu_seconds > 0 else float("inf")
+
+
+def process_wave_file(input_file, output_file, processor=None):
+    """
+    Post-process a 16-bit mono WAV file block by block.
+
+    The input is read three times (speech bounds, levels, scaled copy) so
+    memory stays bounded by processor.block_seconds regardless of file
+    length. Crossfades do not apply to a single file.
+
+    Args:
+        input_file (str): Source WAV filename
+        output_file (str): Destination WAV filename (must differ from input_file)
+        processor (PostProcessor): Settings to apply (default: PostProcessor())
+
+    Returns:
+        dict: Report with "input_seconds", "output_seconds", "trimmed_seconds",
+              "gain_db", "cpu_seconds" and "throughput"
+    """
+    np = _numpy()
+    processor = processor or PostProcessor()
+    cpu_start = time.thread_time()
+    frame_samples = max(1, SAMPLE_RATE * processor.frame_ms // 1000)
+    block = _block_samples(processor.block_seconds, frame_samples)
+
+    with wave.open(input_file, "rb") as wf:
+        if wf.getsampwidth() != SAMPLE_WIDTH or wf.getnchannels() != 1:
+            raise ValueError("Only 16-bit mono WAV files can be post-processed")
+        rate = wf.getframerate()
+        total = wf.getnframes()
+
+        def blocks(start, end):
+            wf.setpos(start)
+            position = start
+            while position < end:
+                count = min(block, end - position)
+                yield np.frombuffer(wf.readframes(count), dtype="<i2")
+                position += count
+
+        start, end = 0, total
+        if processor.trim:
+            bounds = _speech_bounds(blocks(0, total), frame_samples, db_to_amplitude(processor.threshold_db))
+            pad = rate * processor.pad_ms // 1000
+            start, end = (0, 0) if bounds is None else (max(0, bounds[0] - pad), min(total, bounds[1] + pad))
+
+        gain = 1.0
+        if processor.normalize:
+            peak, rms, _ = _levels(blocks(start, end))
+            gain = normalization_gain(peak, rms, processor.normalize, processor.target_db, processor.ceiling_db)
+
+        with IncrementalWavWriter(output_file, rate=rate, flush_each_write=False) as writer:
+            for samples in blocks(start, end):
+                writer.write(apply_gain(samples, gain, block_seconds=processor.block_seconds))
+
+    cpu_seconds = time.thread_time() - cpu_start
+    return {
+        "input_seconds": total / rate,
+        "output_seconds": (end - start) / rate,
+        "trimmed_seconds": (total - (end - start)) / rate,
+        "gain_db": amplitude_to_db(gain * _FULL_SCALE),
+        "cpu_seconds": cpu_seconds,
+        "throughput": _throughput(total / rate, cpu_seconds),
+    }
+
+
+_default_processor = None
+_default_processor_loaded = False
+
+
+def get_default_postprocessor():
+    """
+    Return the process-wide default PostProcessor, or None when disabled.
+
+    Enabled by GEMINI_TTS_POSTPROCESS=1 (or set_default_postprocessor()).
+    """
+    global _default_processor, _default_processor_loaded
+    if not _default_processor_loaded:
+        _default_processor_loaded = True
+        if os.getenv("GEMINI_TTS_POSTPROCESS", "0").lower() in ("1", "true", "yes", "on"):
+            _default_processor = PostProcessor()
+    return _default_processor
+
+
+def set_default_postprocessor(processor):
+    """Replace the default processor (None disables post-processing)."""
+    global _default_processor, _default_processor_loaded
+    _default_processor = processor
+    _default_processor_loaded = True
+
+
+def print_postprocess_report(report):
+    """Print a PostProcessor.last_report / process_wave_file report."""
+    print(f"🎚️  Post-processed {report['input_seconds']:.1f}s -> {report['output_seconds']:.1f}s "
+          f"(trimmed {report['trimmed_seconds']:.1f}s, gain {report['gain_db']:+.1f} dB) "
+          f"at {report['throughput']:.0f} audio-s per CPU-s")
@@ -0,0 +1,329 @@
+"""
+Quota-aware retries, backoff and a shared circuit breaker for TTS requests.
+
+Errors are classified as:
+- "rate_limited": HTTP 429 / RESOURCE_EXHAUSTED; retried after Retry-After
+  (or the server's RetryInfo delay) when given, otherwise after backoff
+- "retryable": 408, 5xx and transport errors (timeouts, dropped connections);
+  retried with jittered exponential backoff
+- "fatal": everything else (bad requests, auth, invalid voices); raised at once
+
+Quota errors on a key that a key pool could fail over from (see
+key_pool.py) are retried at once on another key instead.
+
+The circuit breaker is shared by every caller in the process. When the
+error rate over a sliding window crosses a threshold, or the server asks
+us to back off with Retry-After, all callers pause before their next
+attempt instead of hammering the API during a quota storm.
+"""
+
+import asyncio
+import email.utils
+import random
+import re
+import threading
+import time
+from collections import deque
+
+
+RETRYABLE = "retryable"
+RATE_LIMITED = "rate_limited"
+FATAL = "fatal"
+
+_RETRYABLE_STATUS = {408, 500, 502, 503, 504}
+_RETRYABLE_EXCEPTIONS = (ConnectionError, TimeoutError)
+
+
+def _status_code(exc):
+    code = getattr(exc, "code", None)
+    if isinstance(code, int):
+        return code
+    response = getattr(exc, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def classify_error(exc):
+    """
+    Classify an exception raised by a generate_content call.
+
+    Args:
+        exc (Exception): The raised exception
+
+    Returns:
+        str: RETRYABLE, RATE_LIMITED or FATAL
+    """
+    code = _status_code(exc)
+    if code == 429 or getattr(exc, "status", None) == "RESOURCE_EXHAUSTED":
+        return RATE_LIMITED
+    if code in _RETRYABLE_STATUS or (isinstance(code, int) and code >= 500):
+        return RETRYABLE
+    if code is not None:
+        # Other HTTP errors (400 bad request, 403 auth, 404 model) won't fix themselves
+        return FATAL
+    if isinstance(exc, _RETRYABLE_EXCEPTIONS):
+        return RETRYABLE
+    # httpx transport errors (timeouts, connect/read errors) without importing httpx
+    for cls in type(exc).__mro__:
+        if cls.__module__.startswith("httpx") and cls.__name__ in ("TransportError", "TimeoutException"):
+            return RETRYABLE
+    return FATAL
+
+
+def retry_after_seconds(exc):
+    """
+    Return the server-requested delay for an error, or None.
+
+    Looks at the Retry-After header (seconds or HTTP date) and at the
+    google.rpc.RetryInfo "retryDelay" detail in the error body.
+    """
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers:
+        value = headers.get("Retry-After") or headers.get("retry-after")
+        if value:
+            try:
+                return max(0.0, float(value))
+            except (TypeError, ValueError):
+                pass
+            try:
+                return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError, AttributeError):
+                # Malformed header: fall back to the error body, then to backoff
+                pass
+
+    try:
+        details = getattr(exc, "details", None)
+        if isinstance(details, dict):
+            details = details.get("error", details).get("details", [])
+        for detail in details if isinstance(details, list) else ():
+            if isinstance(detail, dict) and "retryDelay" in detail:
+                match = re.match(r"^\s*([\d.]+)s\s*$", str(detail["retryDelay"]))
+                if match:
+                    return float(match.group(1))
+    except (TypeError, ValueError, AttributeError):
+        pass
+    return None
+
+
+class RetryPolicy:
+    """Attempt limit and jittered exponential backoff schedule."""
+
+    def __init__(self, max_attempts=5, base_delay=1.0, max_delay=60.0, max_retry_after=300.0):
+        """
+        Args:
+            max_attempts (int): Total attempts per call, including the first
+            base_delay (float): Backoff before the first retry, in seconds
+            max_delay (float): Cap on any single backoff, in seconds
+            max_retry_after (float): Cap on honored Retry-After delays
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    def backoff(self, retry_number):
+        """Return a "full jitter" delay for the given retry (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** retry_number)))
+
+    def delay_for(self, exc, kind, retry_number):
+        """Return how long to wait before the next attempt after an error."""
+        delay = self.backoff(retry_number)
+        if kind == RATE_LIMITED:
+            server_delay = retry_after_seconds(exc)
+            if server_delay is not None:
+                delay = max(delay, min(server_delay, self.max_retry_after))
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Process-wide breaker that pauses every caller when errors spike.
+
+    Outcomes are tracked over a sliding time window; once at least min_calls
+    outcomes are recorded and the failure ratio reaches failure_ratio, the
+    breaker opens for cooldown seconds and every caller waits it out.
+    """
+
+    def __init__(self, failure_ratio=0.5, min_calls=8, window=30.0, cooldown=15.0, clock=time.monotonic):
+        self.failure_ratio = failure_ratio
+        self.min_calls = min_calls
+        self.window = window
+        self.cooldown = cooldown
+        self.trips = 0
+        self._clock = clock
+        self._events = deque()
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, success):
+        """Record the outcome of one attempt and open the breaker if needed."""
+        now = self._clock()
+        with self._lock:
+            self._events.append((now, success))
+            while self._events and self._events[0][0] < now - self.window:
+                self._events.popleft()
+            if success or len(self._events) < self.min_calls:
+                return
+            failures = sum(1 for _, ok in self._events if not ok)
+            if failures / len(self._events) >= self.failure_ratio:
+                self._open_until = max(self._open_until, now + self.cooldown)
+                self._events.clear()
+                self.trips += 1
+
+    def hold(self, seconds):
+        """Pause every caller for at least the given number of seconds."""
+        with self._lock:
+            self._open_until = max(self._open_until, self._clock() + seconds)
+
+    def remaining(self):
+        """Seconds until the breaker closes again (0 when closed)."""
+        with self._lock:
+            return max(0.0, self._open_until - self._clock())
+
+    @property
+    def is_open(self):
+        return self.remaining() > 0
+
+    def wait(self, sleep=time.sleep):
+        """Block while the breaker is open; returns the seconds spent waiting."""
+        waited = 0.0
+        remaining = self.remaining()
+        while remaining > 0:
+            sleep(remaining)
+            waited += remaining
+            remaining = self.remaining()
+        return waited
+
+    async def wait_async(self):
+        """Async counterpart of wait()."""
+        waited = 0.0
+        remaining = self.remaining()
+        while remaining > 0:
+            await asyncio.sleep(remaining)
+            waited += remaining
+            remaining = self.remaining()
+        return waited
+
+
+class CallStats:
+    """Per-call retry accounting filled in by call_with_retry."""
+
+    def __init__(self):
+        self.attempts = 0
+        self.retries = 0
+        self.backoff_seconds = 0.0
+        self.breaker_wait_seconds = 0.0
+        self.errors = []
+
+    def as_dict(self):
+        return {
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "backoff_seconds": self.backoff_seconds,
+            "breaker_wait_seconds": self.breaker_wait_seconds,
+            "errors": list(self.errors),
+        }
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+_default_breaker = CircuitBreaker()
+
+
+def get_circuit_breaker():
+    """Return the circuit breaker shared by every synthesis call in the process."""
+    return _default_breaker
+
+
+def configure_retries(policy=None, breaker=None):
+    """Replace the process-wide default retry policy and/or circuit breaker."""
+    global DEFAULT_RETRY_POLICY, _default_breaker
+    if policy is not None:
+        DEFAULT_RETRY_POLICY = policy
+    if breaker is not None:
+        _default_breaker = breaker
+
+
+def _after_failure(exc, retry_number, policy, breaker, stats):
+    """Record a failure; return the delay before the next attempt or re-raise."""
+    kind = classify_error(exc)
+    stats.errors.append(kind)
+    failover = getattr(exc, "failover", False)
+    if kind != FATAL and not failover:
+        # One exhausted key in a pool says nothing about the other keys
+        breaker.record(False)
+    if kind == FATAL or stats.attempts >= policy.max_attempts:
+        raise exc
+    if failover:
+        # The key pool drained the exhausted key and another one can take the retry now
+        stats.retries += 1
+        return 0.0
+    delay = policy.delay_for(exc, kind, retry_number)
+    if kind == RATE_LIMITED and retry_after_seconds(exc) is not None:
+        # The quota is shared, so make every caller respect the server's delay
+        breaker.hold(delay)
+    stats.retries += 1
+    stats.backoff_seconds += delay
+    return delay
+
+
+def call_with_retry(func, *args, policy=None, breaker=None, stats=None, sleep=time.sleep, **kwargs):
+    """
+    Call func(*args, **kwargs), retrying retryable and rate-limited errors.
+
+    Args:
+        func (callable): Function making one API request
+        policy (RetryPolicy): Attempt limit and backoff (default: DEFAULT_RETRY_POLICY)
+        breaker (CircuitBreaker): Shared breaker (default: get_circuit_breaker())
+        stats (CallStats): Optional object that receives attempt/backoff counts
+        sleep (callable): Sleep function (injectable for tests)
+
+    Returns:
+        The return value of func
+    """
+    policy = policy or DEFAULT_RETRY_POLICY
+    breaker = breaker or get_circuit_breaker()
+    stats = stats if stats is not None else CallStats()
+    retry_number = 0
+    while True:
+        stats.breaker_wait_seconds += breaker.wait(sleep)
+        stats.attempts += 1
+        try:
+            result = func(*args, **kwargs)
+        except Exception as exc:
+            delay = _after_failure(exc, retry_number, policy, breaker, stats)
+            sleep(delay)
+            retry_number += 1
+            continue
+        breaker.record(True)
+        return result
+
+
+async def call_with_retry_async(func, *args, policy=None, breaker=None, stats=None, **kwargs):
+    """
+    Async counterpart of call_with_retry; func must return an awaitable.
+
+    Args:
+        func (callable): Coroutine function making one API request
+        policy (RetryPolicy): Attempt limit and backoff (default: DEFAULT_RETRY_POLICY)
+        breaker (CircuitBreaker): Shared breaker (default: get_circuit_breaker())
+        stats (CallStats): Optional object that receives attempt/backoff counts
+
+    Returns:
+        The awaited result of func
+    """
+    policy = policy or DEFAULT_RETRY_POLICY
+    breaker = breaker or get_circuit_breaker()
+    stats = stats if stats is not None else CallStats()
+    retry_number = 0
+    while True:
+        stats.breaker_wait_seconds += await breaker.wait_async()
+        stats.attempts += 1
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as exc:
+            delay = _after_failure(exc, retry_number, policy, breaker, stats)
+            await asyncio.sleep(delay)
+            retry_number += 1
+            continue
+        breaker.record(True)
+        return result
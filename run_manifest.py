@@ -0,0 +1,248 @@
+"""
+Checkpoint manifest for resumable batch runs.
+
+After every finished job the manifest records the job's input hash and the
+output WAV's path, size, duration and SHA-256. The manifest is rewritten
+atomically (temp file + os.replace), so a crash, quota error or Ctrl-C
+never leaves it half-written and every job finished before the
+interruption stays recorded.
+
+- resume: jobs whose inputs are unchanged and whose output still matches
+  the recorded size and duration are skipped
+- verify: existing outputs are checked against the manifest (including
+  their checksum) without synthesizing anything
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+import wave
+
+
+MANIFEST_VERSION = 1
+
+# check() results
+OK = "ok"
+NOT_RECORDED = "not_recorded"
+STALE = "stale"
+OUTPUT_MISSING = "output_missing"
+CHANGED = "changed"
+CORRUPT = "corrupt"
+
+
+def input_hash(*parts):
+    """
+    Hash everything that determines a job's audio (script, voices, model, settings).
+
+    Args:
+        *parts: JSON-serializable values
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def function_job_hash(func, *inputs):
+    """Hash a demo job from its function source plus any data it loads."""
+    return input_hash(inspect.getsource(func), *inputs)
+
+
+def wav_info(path):
+    """
+    Read size and duration from a WAV file.
+
+    Raises:
+        wave.Error, EOFError: If the file is not a complete PCM WAV
+    """
+    size = os.path.getsize(path)
+    with wave.open(path, "rb") as wf:
+        frames = wf.getnframes()
+        rate = wf.getframerate()
+        data_size = frames * wf.getnchannels() * wf.getsampwidth()
+    if size < data_size + 44:
+        raise wave.Error(f"{path} is truncated")
+    return {"size": size, "duration": frames / rate if rate else 0.0}
+
+
+def file_sha256(path, block_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class RunManifest:
+    """JSON manifest of finished jobs, shared by the threads of one run."""
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Manifest filename (created on the first recorded job)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._jobs = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        if data.get("version") != MANIFEST_VERSION:
+            return {}
+        return data.get("jobs", {})
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "jobs": self._jobs}, f, indent=2, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def entry(self, job_id):
+        """Return the recorded entry for a job, or None."""
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            return dict(entry) if entry else None
+
+    def jobs(self):
+        """Return the ids of every recorded job."""
+        with self._lock:
+            return sorted(self._jobs)
+
+    def record(self, job_id, job_hash, output_file):
+        """Record a finished job and rewrite the manifest atomically."""
+        info = wav_info(output_file)
+        entry = {
+            "input_hash": job_hash,
+            "output": output_file,
+            "size": info["size"],
+            "duration": info["duration"],
+            "sha256": file_sha256(output_file),
+            "completed_at": time.time(),
+        }
+        with self._lock:
+            self._jobs[job_id] = entry
+            self._save()
+        return entry
+
+    def forget(self, job_id):
+        with self._lock:
+            if self._jobs.pop(job_id, None) is not None:
+                self._save()
+
+    def check(self, job_id, job_hash=None, deep=False):
+        """
+        Check whether a job's recorded output is still valid.
+
+        Args:
+            job_id (str): Job identifier
+            job_hash (str): Current input hash (None skips the input check)
+            deep (bool): Also compare the file's SHA-256 with the recorded one
+
+        Returns:
+            str: OK, NOT_RECORDED, STALE, OUTPUT_MISSING, CHANGED or CORRUPT
+        """
+        entry = self.entry(job_id)
+        if entry is None:
+            return NOT_RECORDED
+        if job_hash is not None and entry["input_hash"] != job_hash:
+            return STALE
+        if not os.path.exists(entry["output"]):
+            return OUTPUT_MISSING
+        try:
+            info = wav_info(entry["output"])
+        except (wave.Error, EOFError):
+            return CORRUPT
+        if info["size"] != entry["size"] or abs(info["duration"] - entry["duration"]) > 1e-6:
+            return CHANGED
+        if deep and file_sha256(entry["output"]) != entry["sha256"]:
+            return CHANGED
+        return OK
+
+    def verify(self, job_hashes=None):
+        """
+        Deep-check every job without synthesizing anything.
+
+        Args:
+            job_hashes (dict): Optional job_id -> current input hash; jobs listed
+                               here but never recorded are reported as NOT_RECORDED
+
+        Returns:
+            dict: job_id -> check() status
+        """
+        job_ids = list(job_hashes) if job_hashes is not None else self.jobs()
+        return {
+            job_id: self.check(job_id, (job_hashes or {}).get(job_id), deep=True)
+            for job_id in job_ids
+        }
+
+
+def run_job(manifest, job_id, job_hash, output_file, func, resume=False):
+    """
+    Run one job unless resuming and its recorded output is still valid.
+
+    Args:
+        manifest (RunManifest): Manifest to check and update
+        job_id (str): Job identifier
+        job_hash (str): Input hash of the job
+        output_file (str): WAV file the job writes
+        func (callable): Performs the job
+        resume (bool): Skip the job when check() reports OK
+
+    Returns:
+        bool: True if the job ran, False if it was skipped
+    """
+    if resume and manifest.check(job_id, job_hash) == OK:
+        return False
+    func()
+    manifest.record(job_id, job_hash, output_file)
+    return True
+
+
+def print_verify_report(results, outputs=None):
+    """Print the statuses returned by RunManifest.verify()."""
+    icons = {OK: "✅", NOT_RECORDED: "⚪", STALE: "🔄", OUTPUT_MISSING: "❓", CHANGED: "⚠️ ", CORRUPT: "❌"}
+    for job_id, status in results.items():
+        label = outputs.get(job_id, job_id) if outputs else job_id
+        print(f"   {icons.get(status, '•')} {label}: {status}")
+    valid = sum(1 for status in results.values() if status == OK)
+    print(f"🔍 {valid}/{len(results)} outputs match the manifest")
+
+
+def run_demo_jobs(jobs, manifest_path, resume=False, verify=False):
+    """
+    Run demo jobs in order, checkpointing each one in a manifest.
+
+    Args:
+        jobs (list): (job_id, func, output_file, inputs) tuples; the job hash
+                     covers the function's source and the inputs
+        manifest_path (str): Manifest filename
+        resume (bool): Skip jobs whose output still matches
+        verify (bool): Only check existing outputs and print a report
+
+    Returns:
+        dict: job_id -> "ran", "skipped" or a verify status
+    """
+    manifest = RunManifest(manifest_path)
+    hashes = {job_id: function_job_hash(func, inputs) for job_id, func, _, inputs in jobs}
+    if verify:
+        results = manifest.verify(hashes)
+        print_verify_report(results, {job_id: output for job_id, _, output, _ in jobs})
+        return results
+
+    results = {}
+    for job_id, func, output_file, _ in jobs:
+        ran = run_job(manifest, job_id, hashes[job_id], output_file, func, resume)
+        if not ran:
+            print(f"⏭️  Skipping {output_file} (unchanged since last run)")
+        results[job_id] = "ran" if ran else "skipped"
+    return results
@@ -0,0 +1,318 @@
+"""
+Priority-aware scheduling of synthesis requests.
+
+Every backend request takes a slot from the process-wide scheduler before
+it is sent. Requests belong to a priority class (interactive, default or
+bulk, set with the priority() context manager) and slots are shared out by
+start-time fair queuing: each class's requests are stamped with a virtual
+start time that advances by cost / weight, so a class with weight 8 gets
+eight times the characters of a class with weight 1 while both are busy,
+and an idle class never builds up credit.
+
+Classes can also cap their own requests in flight, so a bulk batch can
+never take every slot. Chunked jobs take one slot per chunk, so a long
+paper yields to interactive requests between chunks instead of holding
+the queue for its whole run.
+
+Time spent waiting for a slot is recorded per class (get_scheduler().stats())
+and as the "queue" phase of the current metrics span.
+
+Environment:
+- GEMINI_TTS_MAX_CONCURRENCY: backend requests in flight across all classes (default: 32)
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+from metrics import _percentile, current_span, join_span, phase
+
+
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_PRIORITY = "default"
+# Wait samples kept per class for the percentiles
+WAIT_SAMPLES = 1024
+
+_current_priority = contextvars.ContextVar("synthesis_priority", default=DEFAULT_PRIORITY)
+
+
+class PriorityClass:
+    """One priority class with its share of the slots and its queue."""
+
+    def __init__(self, name, weight=1.0, max_concurrency=None):
+        """
+        Args:
+            name (str): Class name used with priority()
+            weight (float): Relative share of the slots while several classes are waiting
+            max_concurrency (int): Most requests of this class in flight (None: no cap)
+        """
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        self.name = name
+        self.weight = weight
+        self.max_concurrency = max_concurrency
+        self.queue = deque()
+        self.in_flight = 0
+        self.granted = 0
+        self.last_finish = 0.0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+
+    def has_room(self):
+        return self.max_concurrency is None or self.in_flight < self.max_concurrency
+
+    def stats(self):
+        waits = list(self._waits)
+        return {
+            "weight": self.weight,
+            "max_concurrency": self.max_concurrency,
+            "queued": len(self.queue),
+            "in_flight": self.in_flight,
+            "granted": self.granted,
+            "wait_seconds_total": self.wait_total,
+            "wait_p50_seconds": _percentile(waits, 50),
+            "wait_p95_seconds": _percentile(waits, 95),
+            "wait_max_seconds": self.wait_max,
+        }
+
+
+def default_classes(max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    """Return the interactive, default and bulk classes; bulk may use at most 3/4 of the slots."""
+    return [
+        PriorityClass("interactive", weight=8),
+        PriorityClass("default", weight=4),
+        PriorityClass("bulk", weight=1, max_concurrency=max(1, max_concurrency * 3 // 4)),
+    ]
+
+
+class _Ticket:
+    """One queued or running request."""
+
+    __slots__ = ("priority_class", "virtual_start", "enqueued", "granted", "wake")
+
+    def __init__(self, priority_class, virtual_start, enqueued, wake):
+        self.priority_class = priority_class
+        self.virtual_start = virtual_start
+        self.enqueued = enqueued
+        self.granted = False
+        self.wake = wake
+
+
+class SynthesisScheduler:
+    """Thread-safe weighted fair queue of request slots with per-class limits."""
+
+    def __init__(self, classes=None, max_concurrency=DEFAULT_MAX_CONCURRENCY, clock=time.perf_counter):
+        """
+        Args:
+            classes (list): PriorityClass objects (default: default_classes())
+            max_concurrency (int): Requests in flight across all classes
+            clock (callable): Monotonic clock (injectable for tests)
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.classes = {c.name: c for c in (classes or default_classes(max_concurrency))}
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self._virtual_time = 0.0
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def _class(self, name):
+        try:
+            return self.classes[name or _current_priority.get()]
+        except KeyError:
+            raise ValueError(f"Unknown priority class: {name or _current_priority.get()!r}") from None
+
+    def _submit(self, name, cost, wake, immediate=False):
+        priority_class = self._class(name)
+        with self._lock:
+            # Queued tickets of other classes are held back by their own limits, not by us
+            if immediate and (self.in_flight >= self.max_concurrency or not priority_class.has_room()
+                              or priority_class.queue):
+                return None
+            start = max(self._virtual_time, priority_class.last_finish)
+            priority_class.last_finish = start + max(cost, 1) / priority_class.weight
+            ticket = _Ticket(priority_class, start, self._clock(), wake)
+            priority_class.queue.append(ticket)
+            self._dispatch()
+        return ticket
+
+    def _dispatch(self):
+        # Called with the lock held: grant slots to the heads with the lowest virtual start
+        while self.in_flight < self.max_concurrency:
+            ready = [c for c in self.classes.values() if c.queue and c.has_room()]
+            if not ready:
+                return
+            priority_class = min(ready, key=lambda c: (c.queue[0].virtual_start, -c.weight))
+            ticket = priority_class.queue.popleft()
+            self._virtual_time = ticket.virtual_start
+            self.in_flight += 1
+            priority_class.in_flight += 1
+            priority_class.granted += 1
+            wait = self._clock() - ticket.enqueued
+            priority_class.wait_total += wait
+            priority_class.wait_max = max(priority_class.wait_max, wait)
+            priority_class._waits.append(wait)
+            ticket.granted = True
+            ticket.wake()
+
+    def _cancel(self, ticket):
+        with self._lock:
+            if not ticket.granted:
+                ticket.priority_class.queue.remove(ticket)
+                return
+        self.release(ticket)
+
+    def acquire(self, name=None, cost=1):
+        """
+        Wait for a slot.
+
+        Args:
+            name (str): Priority class (default: the one set with priority())
+            cost (int): Size of the request, e.g. its characters
+
+        Returns:
+            _Ticket: Hand it back with release()
+
+        Raises:
+            ValueError: If the priority class does not exist
+        """
+        granted = threading.Event()
+        ticket = self._submit(name, cost, granted.set)
+        try:
+            granted.wait()
+        except BaseException:
+            # Interrupted (e.g. KeyboardInterrupt): leave the queue or give the slot back
+            self._cancel(ticket)
+            raise
+        return ticket
+
+    def try_acquire(self, name=None, cost=1):
+        """
+        Take a slot only if one is free right now and no request of the class is waiting.
+
+        Returns:
+            _Ticket: Hand it back with release(), or None if the request would have to queue
+        """
+        return self._submit(name, cost, lambda: None, immediate=True)
+
+    async def acquire_async(self, name=None, cost=1):
+        """Async counterpart of acquire() that waits without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def wake():
+            loop.call_soon_threadsafe(lambda: granted.done() or granted.set_result(None))
+
+        ticket = self._submit(name, cost, wake)
+        try:
+            await granted
+        except asyncio.CancelledError:
+            self._cancel(ticket)
+            raise
+        return ticket
+
+    def release(self, ticket):
+        """Return a slot and hand it to the next request in line."""
+        with self._lock:
+            self.in_flight -= 1
+            ticket.priority_class.in_flight -= 1
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, name=None, cost=1):
+        """Hold a slot for the duration of a block; the wait is timed as the "queue" phase."""
+        with phase("queue"):
+            ticket = self.acquire(name, cost)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    @asynccontextmanager
+    async def slot_async(self, name=None, cost=1):
+        """Async counterpart of slot()."""
+        with phase("queue"):
+            ticket = await self.acquire_async(name, cost)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def stats(self):
+        """Return per-class counters and queue-wait percentiles."""
+        with self._lock:
+            return {name: c.stats() for name, c in self.classes.items()}
+
+
+@contextmanager
+def priority(name):
+    """Run the block's synthesis requests in the given priority class."""
+    token = _current_priority.set(name)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority():
+    """Return the priority class set for the current context."""
+    return _current_priority.get()
+
+
+def with_priority(func):
+    """
+    Wrap func so it runs in the caller's priority class and metrics span.
+
+    Context variables do not follow work into thread pools; wrap the
+    callable before handing it to an executor. Synthesis calls made by the
+    workers then join the caller's span (one event per top-level call)
+    instead of emitting events of their own.
+    """
+    name = _current_priority.get()
+    span = current_span()
+
+    def run(*args, **kwargs):
+        with priority(name), join_span(span):
+            return func(*args, **kwargs)
+
+    return run
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Return the process-wide scheduler, sized from GEMINI_TTS_MAX_CONCURRENCY."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = SynthesisScheduler(
+                max_concurrency=int(os.getenv("GEMINI_TTS_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
+            )
+        return _scheduler
+
+
+def set_scheduler(scheduler):
+    """Install a scheduler (None rebuilds the default on next use)."""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = scheduler
+
+
+def print_scheduler_stats(scheduler=None):
+    """Print queue waits per class, if any request had to wait."""
+    stats = (scheduler or get_scheduler()).stats()
+    if not any(row["wait_seconds_total"] > 0.001 for row in stats.values()):
+        return
+    print("🚦 Scheduler queue waits:")
+    for name, row in stats.items():
+        if row["granted"]:
+            print(f"   {name}: {row['granted']} requests, p50 {row['wait_p50_seconds']:.2f}s, "
+                  f"p95 {row['wait_p95_seconds']:.2f}s, max {row['wait_max_seconds']:.2f}s")
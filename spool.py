@@ -0,0 +1,202 @@
+"""
+Bounded-memory assembly of long outputs.
+
+A PCMSpool collects the segments of one output (e.g. the chunks of a
+book-length script, which finish out of order) and keeps them in memory
+only up to a byte budget. Segments beyond the budget are appended to a
+single unnamed temporary file as soon as they arrive, so the caller can
+drop its copy.
+
+write_wave() writes the WAV header and the in-memory segments with plain
+writes and copies the spilled ranges kernel-side with os.copy_file_range,
+falling back to os.sendfile and then to a read/write loop where the
+kernel or filesystem does not support it. Spilled audio never passes
+through user space, so peak memory stays flat however long the output is.
+
+Set GEMINI_TTS_MEMORY_BUDGET_MB (or call set_memory_budget()) to make
+create_full_paper_presentation() assemble through a spool.
+"""
+
+import errno
+import os
+import tempfile
+import threading
+
+from wav_writer import wav_header
+
+
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+# Block size of the read/write fallback
+_COPY_BLOCK = 1024 * 1024
+# Errors meaning "this copy method is unavailable here", not "the copy failed"
+_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF}
+
+
+def _write_all(fd, data):
+    view = memoryview(data).cast("B")
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _copy_with(method, src_fd, dst_fd, offset, length):
+    while length:
+        if method == "copy_file_range":
+            copied = os.copy_file_range(src_fd, dst_fd, length, offset)
+        elif method == "sendfile":
+            copied = os.sendfile(dst_fd, src_fd, offset, length)
+        else:
+            data = os.pread(src_fd, min(length, _COPY_BLOCK), offset)
+            _write_all(dst_fd, data)
+            copied = len(data)
+        if copied == 0:
+            raise OSError(errno.EIO, "spill file is shorter than recorded")
+        offset += copied
+        length -= copied
+
+
+def copy_range(src_fd, dst_fd, offset, length, methods=("copy_file_range", "sendfile", "read")):
+    """
+    Append length bytes at offset of src_fd to dst_fd's current position.
+
+    Tries each method in turn and falls back when the kernel or filesystem
+    does not support it (e.g. copy_file_range across filesystems on older
+    kernels). A fallback only happens before any byte was copied.
+
+    Returns:
+        str: The method that did the copy
+    """
+    for method in methods:
+        if method != "read" and not hasattr(os, method):
+            continue
+        start = os.lseek(dst_fd, 0, os.SEEK_CUR)
+        try:
+            _copy_with(method, src_fd, dst_fd, offset, length)
+            return method
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED or method == "read" or os.lseek(dst_fd, 0, os.SEEK_CUR) != start:
+                raise
+    raise OSError(errno.ENOSYS, "no copy method available")
+
+
+class PCMSpool:
+    """Ordered PCM segments held in memory up to a budget and spilled to a temp file beyond it."""
+
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET, directory=None):
+        """
+        Args:
+            memory_budget (int): Bytes of PCM kept in memory; later segments are spilled
+            directory (str): Directory for the spill file (default: the system temp dir)
+        """
+        self.memory_budget = memory_budget
+        self.directory = directory
+        self._segments = {}
+        self._spill = None
+        self._spill_size = 0
+        self._lock = threading.Lock()
+        self.memory_bytes = 0
+        self.spilled_bytes = 0
+        self.spilled_segments = 0
+        self.copy_methods = set()
+
+    def __len__(self):
+        """Total PCM bytes collected."""
+        return self.memory_bytes + self.spilled_bytes
+
+    def put(self, index, pcm):
+        """
+        Store the segment at position index; segments may arrive in any order.
+
+        Args:
+            index (int): Position of the segment in the output
+            pcm (bytes-like): 16-bit PCM
+        """
+        view = memoryview(pcm).cast("B")
+        with self._lock:
+            if index in self._segments:
+                raise ValueError(f"segment {index} was already added")
+            if self.memory_bytes + len(view) <= self.memory_budget:
+                self._segments[index] = ("memory", bytes(view))
+                self.memory_bytes += len(view)
+                return
+            if self._spill is None:
+                self._spill = tempfile.TemporaryFile(dir=self.directory, prefix="tts-spool-")
+            offset = self._spill_size
+            self._spill_size += len(view)
+            self._segments[index] = ("spill", (offset, len(view)))
+            self.spilled_bytes += len(view)
+            self.spilled_segments += 1
+        # Each segment owns its byte range, so concurrent spills can write unlocked
+        written = 0
+        while written < len(view):
+            written += os.pwrite(self._spill.fileno(), view[written:], offset + written)
+
+    def write_wave(self, filename, channels=1, rate=24000, sample_width=2):
+        """
+        Write every segment, in index order, to a WAV file.
+
+        Returns:
+            int: Number of PCM bytes written
+        """
+        data_size = len(self)
+        with open(filename, "wb", buffering=0) as f:
+            fd = f.fileno()
+            _write_all(fd, wav_header(data_size, channels, rate, sample_width))
+            for index in sorted(self._segments):
+                kind, value = self._segments[index]
+                if kind == "memory":
+                    _write_all(fd, value)
+                else:
+                    offset, length = value
+                    self.copy_methods.add(copy_range(self._spill.fileno(), fd, offset, length))
+            if data_size % 2:
+                _write_all(fd, b"\x00")
+        return data_size
+
+    def stats(self):
+        return {
+            "segments": len(self._segments),
+            "memory_bytes": self.memory_bytes,
+            "spilled_bytes": self.spilled_bytes,
+            "spilled_segments": self.spilled_segments,
+            "copy_methods": sorted(self.copy_methods),
+        }
+
+    def close(self):
+        """Drop the in-memory segments and delete the spill file."""
+        with self._lock:
+            self._segments.clear()
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_memory_budget = None
+_memory_budget_loaded = False
+
+
+def get_memory_budget():
+    """
+    Return the spool budget in bytes for long outputs, or None to assemble in memory.
+
+    Set by GEMINI_TTS_MEMORY_BUDGET_MB (or set_memory_budget()).
+    """
+    global _memory_budget, _memory_budget_loaded
+    if not _memory_budget_loaded:
+        _memory_budget_loaded = True
+        megabytes = os.getenv("GEMINI_TTS_MEMORY_BUDGET_MB")
+        if megabytes:
+            _memory_budget = int(float(megabytes) * 1024 * 1024)
+    return _memory_budget
+
+
+def set_memory_budget(budget):
+    """Set the spool budget in bytes (None assembles long outputs in memory)."""
+    global _memory_budget, _memory_budget_loaded
+    _memory_budget = budget
+    _memory_budget_loaded = True
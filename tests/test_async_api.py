@@ -0,0 +1,55 @@
+import asyncio
+import os
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import gemini_tts_example
+from audio_cache import set_default_cache
+
+
+class _FakeAsyncModels:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate_content(self, model, contents, config):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        part = SimpleNamespace(inline_data=SimpleNamespace(data=contents.encode()))
+        return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+
+
+class AsyncApiTestCase(unittest.TestCase):
+    def setUp(self):
+        self.models = _FakeAsyncModels()
+        client = SimpleNamespace(aio=SimpleNamespace(models=self.models))
+        patcher = mock.patch.object(gemini_tts_example, "get_client", return_value=client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        env = mock.patch.dict(os.environ, {"GEMINI_API_KEY": "test"})
+        env.start()
+        self.addCleanup(env.stop)
+        set_default_cache(None)
+        self.addCleanup(set_default_cache, None)
+
+    def test_batch_preserves_order_and_bounds_concurrency(self):
+        requests = [(f"line {i}", "kore") for i in range(20)]
+        results = asyncio.run(gemini_tts_example.synthesize_batch_async(requests, max_concurrency=4))
+        self.assertEqual(results, [f"line {i}".encode() for i in range(20)])
+        self.assertEqual(self.models.max_in_flight, 4)
+
+    def test_multi_speaker_validation(self):
+        with self.assertRaises(ValueError):
+            asyncio.run(gemini_tts_example.text_to_speech_multi_speaker_async(
+                "A: hi", [{"name": "A", "voice": "kore"}]))
+
+    def test_style_prefixes_prompt(self):
+        audio = asyncio.run(gemini_tts_example.text_to_speech_with_style_async("hello", "Say softly:"))
+        self.assertEqual(audio, b"Say softly: hello")
+
+
+if __name__ == "__main__":
+    unittest.main()
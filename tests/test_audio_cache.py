@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+from audio_cache import AudioCache, cache_key
+from gemini_tts_example import synthesize_pcm
+
+
+class AudioCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = AudioCache(self.tmp.name, max_bytes=1300)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_depends_on_every_field(self):
+        base = cache_key("m", "hello", "kore")
+        self.assertEqual(base, cache_key("m", "hello", "kore"))
+        self.assertNotEqual(base, cache_key("m2", "hello", "kore"))
+        self.assertNotEqual(base, cache_key("m", "hello!", "kore"))
+        self.assertNotEqual(base, cache_key("m", "hello", "puck"))
+        self.assertNotEqual(base, cache_key("m", "hello", "kore", "pcm_s16le/16000/1"))
+        self.assertNotEqual(
+            cache_key("m", "x", (("A", "kore"), ("B", "puck"))),
+            cache_key("m", "x", (("A", "puck"), ("B", "kore"))),
+        )
+
+    def test_hit_miss_stats(self):
+        self.assertIsNone(self.cache.get("ab" * 32))
+        self.cache.put("ab" * 32, b"\x01\x02")
+        self.assertEqual(self.cache.get("ab" * 32), b"\x01\x02")
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["bytes"]), (1, 1, 2))
+
+    def test_lru_eviction(self):
+        keys = [f"{i:02d}" * 32 for i in range(3)]
+        for i, key in enumerate(keys):
+            self.cache.put(key, b"x" * 400)
+            path = self.cache._path(key)
+            os.utime(path, (i, i))
+        # Touch the oldest entry so the middle one becomes least recently used
+        self.cache.get(keys[0])
+        self.cache.put("ff" * 32, b"y" * 400)
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertLessEqual(self.cache.stats()["bytes"], 1300)
+
+    def test_synthesize_served_from_cache_without_api_key(self):
+        key = cache_key("m", "hello", "kore")
+        self.cache.put(key, b"\x00\x01" * 8)
+        prev = os.environ.pop("GEMINI_API_KEY", None)
+        try:
+            self.assertEqual(synthesize_pcm("hello", "kore", "m", cache=self.cache), b"\x00\x01" * 8)
+        finally:
+            if prev is not None:
+                os.environ["GEMINI_API_KEY"] = prev
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+import wave
+from unittest import mock
+
+import gemini_tts_example
+from audio_cache import set_default_cache
+from backends import FakeBackend, LatencyModel
+from retry import (
+    DEFAULT_RETRY_POLICY,
+    CallStats,
+    CircuitBreaker,
+    RetryPolicy,
+    configure_retries,
+    get_circuit_breaker,
+)
+
+
+def _no_sleep(seconds):
+    pass
+
+
+class FakeBackendTestCase(unittest.TestCase):
+    def setUp(self):
+        set_default_cache(None)
+        self.addCleanup(set_default_cache, None)
+        self.addCleanup(gemini_tts_example.set_backend, None)
+        self.addCleanup(configure_retries, DEFAULT_RETRY_POLICY, get_circuit_breaker())
+        configure_retries(RetryPolicy(max_attempts=20, base_delay=0.0), CircuitBreaker(min_calls=1000))
+
+    def test_audio_length_scales_with_text(self):
+        backend = FakeBackend(latency=LatencyModel(base=0.0), sleep=_no_sleep)
+        short = backend.generate("x" * 15, "kore", "m")
+        long = backend.generate("x" * 150, "kore", "m")
+        self.assertAlmostEqual(len(short) / 48000, 1.0, delta=0.01)
+        self.assertAlmostEqual(len(long) / len(short), 10, delta=0.1)
+        self.assertEqual(b"".join(backend.stream("x" * 150, "kore", "m")), long)
+
+    def test_injected_failures_are_retried(self):
+        backend = FakeBackend(failure_rate=0.5, seed=3, latency=LatencyModel(base=0.0), sleep=_no_sleep)
+        gemini_tts_example.set_backend(backend)
+        stats = CallStats()
+        for _ in range(10):
+            gemini_tts_example.synthesize_pcm("hello there", "kore", stats=stats)
+        self.assertGreater(backend.failures, 0)
+        self.assertEqual(stats.retries, backend.failures)
+
+    def test_entry_points_run_without_api_key(self):
+        gemini_tts_example.set_backend(FakeBackend(latency=LatencyModel(base=0.0), sleep=_no_sleep))
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.dict(os.environ, {}, clear=True):
+            output = os.path.join(tmp, "out.wav")
+            gemini_tts_example.text_to_speech_multi_speaker(
+                "A: hi\nB: hello",
+                [{"name": "A", "voice": "kore"}, {"name": "B", "voice": "puck"}],
+                output,
+                verbose=False,
+            )
+            with wave.open(output, "rb") as wf:
+                self.assertGreater(wf.getnframes(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import random
+import time
+import unittest
+from unittest import mock
+
+import gemini_tts_example
+from chunking import chunk_script
+from dialogue_model import Dialogue
+from full_papers_generator import PAPERS
+
+
+class ChunkingTestCase(unittest.TestCase):
+    def test_turns_keep_continuation_lines(self):
+        script = "A: hello\nstill A\n\nB: Note: not a new turn\nA: bye"
+        self.assertEqual(
+            chunk_script(script, max_chars=1, speakers=["A", "B"]),
+            ["A: hello\nstill A", "B: Note: not a new turn", "A: bye"],
+        )
+        self.assertEqual(chunk_script("  Just one voice.\n"), ["Just one voice."])
+        self.assertEqual(chunk_script(""), [])
+
+    def test_chunks_respect_budget_and_turns(self):
+        script = PAPERS["gneiss_web"]["script"]
+        turns = [f"{speaker}: {text}" for speaker, text in Dialogue.parse(script).lines()]
+        chunks = chunk_script(script, max_chars=600)
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks:
+            pieces = chunk.split("\n\n")
+            self.assertTrue(all(piece in turns for piece in pieces))
+            self.assertTrue(len(chunk) <= 600 or len(pieces) == 1)
+        self.assertEqual("\n\n".join(chunks), "\n\n".join(turns))
+
+    def test_token_budget_and_case_insensitive_speakers(self):
+        script = PAPERS["code_comment"]["script"]
+        chunks = chunk_script(script, max_tokens=100, speakers=["Narrator 1", "Narrator 2"])
+        self.assertGreater(len(chunks), 2)
+
+    def test_synthesize_chunked_stitches_in_order(self):
+        def fake_synthesize(contents, voices, model):
+            time.sleep(random.random() / 100)
+            return contents.encode()
+
+        script = PAPERS["fineweb"]["script"]
+        with mock.patch.object(gemini_tts_example, "synthesize_pcm", fake_synthesize):
+            audio, report = gemini_tts_example.synthesize_chunked(
+                script, (("Narrator 1", "kore"), ("Narrator 2", "charon")),
+                preamble="Say: ", max_chars=300,
+            )
+        chunks = chunk_script(script, max_chars=300)
+        self.assertEqual(audio, "".join("Say: " + chunk for chunk in chunks).encode())
+        self.assertEqual([entry["index"] for entry in report], list(range(len(chunks))))
+
+
+if __name__ == "__main__":
+    unittest.main()
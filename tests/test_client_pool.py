@@ -0,0 +1,34 @@
+import unittest
+
+from gemini_tts_example import (
+    close_clients,
+    get_client,
+    get_speech_config,
+    speaker_voices,
+)
+
+
+class ClientPoolTestCase(unittest.TestCase):
+    def tearDown(self):
+        close_clients()
+
+    def test_client_reused_per_key(self):
+        first = get_client("key-a")
+        self.assertIs(first, get_client("key-a"))
+        self.assertIsNot(first, get_client("key-b"))
+
+    def test_speech_config_interned(self):
+        voices = speaker_voices([
+            {"name": "A", "voice": "kore"},
+            {"name": "B", "voice": "puck"},
+        ])
+        config = get_speech_config("model-x", voices)
+        self.assertIs(config, get_speech_config("model-x", voices))
+        self.assertIs(get_speech_config("model-x", "kore"), get_speech_config("model-x", "kore"))
+        self.assertIsNot(config, get_speech_config("model-y", voices))
+        speakers = config.speech_config.multi_speaker_voice_config.speaker_voice_configs
+        self.assertEqual([s.speaker for s in speakers], ["A", "B"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import dialogue_engine
+import gemini_tts_example
+from dialogue_engine import as_script_lines, plan_runs, synthesize_dialogue, text_to_speech_dialogue
+
+
+SCRIPT = [
+    ("Narrator", "Once upon a time."),
+    ("Alice", "Hello!"),
+    ("Narrator", "She waved."),
+    ("Ben", "Hi Alice."),
+    ("Alice", "Shall we go?"),
+    ("Ben", "Yes."),
+]
+SPEAKERS = [
+    {"name": "Narrator", "voice": "achird"},
+    {"name": "Alice", "voice": "aoede"},
+    {"name": "Ben", "voice": "orus"},
+]
+
+
+class DialogueEngineTestCase(unittest.TestCase):
+    def test_runs_have_at_most_two_speakers(self):
+        runs = plan_runs(SCRIPT)
+        self.assertEqual([len({s for s, _ in run}) for run in runs], [2, 2])
+        self.assertEqual([line for run in runs for line in run], SCRIPT)
+
+    def test_parses_dialogue_text(self):
+        self.assertEqual(as_script_lines("A: hi there\nB: hello: world"), [("A", "hi there"), ("B", "hello: world")])
+
+    def test_voices_consistent_and_order_preserved(self):
+        calls = []
+
+        def fake_synthesize(contents, voices, model):
+            calls.append(voices)
+            return contents.encode() + b"|"
+
+        script = [("Narrator", "Intro.")] + SCRIPT[1:]
+        with mock.patch.object(dialogue_engine, "synthesize_pcm", fake_synthesize):
+            audio, report = synthesize_dialogue(script + [("Ben", "Bye.")], SPEAKERS)
+
+        self.assertTrue(bytes(audio).startswith(b"Narrator: Intro.\nAlice: Hello!"))
+        expected = {s["name"]: s["voice"] for s in SPEAKERS}
+        for voices in calls:
+            for name, voice in voices:
+                self.assertEqual(voice, expected[name])
+        self.assertEqual(sum(run["turns"] for run in report), len(script) + 1)
+
+    def test_preamble_is_sent_with_every_run(self):
+        calls = []
+
+        def fake_synthesize(contents, voices, model):
+            calls.append(contents)
+            return b""
+
+        text = "Keep it light and quick:\n" + "\n".join(f"{speaker}: {line}" for speaker, line in SCRIPT)
+        with mock.patch.object(dialogue_engine, "synthesize_pcm", fake_synthesize):
+            synthesize_dialogue(text + "\nNarrator: The end.", SPEAKERS)
+        self.assertEqual(len(calls), 3)
+        self.assertTrue(calls[0].startswith("Keep it light and quick:\nNarrator: Once upon a time."))
+        self.assertTrue(calls[1].startswith("Keep it light and quick:\nBen: Hi Alice."))
+        # The closing single-voice run is read without labels
+        self.assertEqual(calls[2], "Keep it light and quick: The end.")
+
+    def test_single_speaker_run_uses_single_voice(self):
+        with mock.patch.object(dialogue_engine, "synthesize_pcm", lambda c, v, m: c.encode()):
+            audio, report = synthesize_dialogue([("Narrator", "One."), ("Narrator", "Two.")], SPEAKERS)
+        self.assertEqual(bytes(audio), b"One. Two.")
+        self.assertEqual(report[0]["speakers"], ["Narrator"])
+
+    def test_quiet_setting_silences_dialogue_output(self):
+        self.addCleanup(gemini_tts_example.set_verbose, gemini_tts_example._verbose)
+        gemini_tts_example.set_verbose(False)
+        out = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp, redirect_stdout(out), \
+                mock.patch.object(dialogue_engine, "require_credentials", lambda: None), \
+                mock.patch.object(dialogue_engine, "synthesize_pcm", lambda c, v, m: b"\x00\x00"):
+            text_to_speech_dialogue(SCRIPT, SPEAKERS, os.path.join(tmp, "dialogue.wav"), postprocess=False)
+        self.assertEqual(out.getvalue(), "")
+
+    def test_unknown_speaker(self):
+        with self.assertRaises(ValueError):
+            synthesize_dialogue([("Zed", "hi")], SPEAKERS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import unittest
+from unittest import mock
+
+from chunking import chunk_script
+from dialogue_model import Dialogue, Turn
+from full_papers_generator import PAPERS
+import gemini_tts_example
+from audio_cache import set_default_cache
+from backends import FakeBackend, LatencyModel
+from gemini_tts_example import PAPER_SPEAKERS, create_dialogue_from_script, text_to_speech_multi_speaker
+
+
+SPEAKERS = [{"name": "Alice", "voice": "kore"}, {"name": "Bob", "voice": "puck"}]
+
+
+class DialogueModelTestCase(unittest.TestCase):
+    def test_parse_keeps_preamble_and_continuation_lines(self):
+        text = "Make Alice sound excited and Bob sound calm about it:\nAlice: hi\nstill Alice\n\nBob: Note: ok"
+        dialogue = Dialogue.parse(text)
+
+        self.assertEqual(dialogue.preamble, "Make Alice sound excited and Bob sound calm about it:")
+        self.assertEqual(dialogue.lines(), [("Alice", "hi\nstill Alice"), ("Bob", "Note: ok")])
+        self.assertEqual(dialogue.speakers, ("Alice", "Bob"))
+        self.assertEqual(dialogue.turns[0].chars, len("Alice: hi\nstill Alice"))
+        self.assertIs(dialogue.to_text(), text)
+        self.assertFalse(hasattr(dialogue.turns[0], "__dict__"))
+
+    def test_validate_canonicalizes_labels_and_reports_missing_speakers(self):
+        dialogue = Dialogue.parse("ALICE: hi\nbob: hello")
+        canonical = dialogue.validate(SPEAKERS)
+        self.assertEqual(canonical.to_text(), "Alice: hi\nBob: hello")
+        self.assertIs(canonical.validate(SPEAKERS), canonical)
+
+        with self.assertRaises(ValueError) as cm:
+            Dialogue.parse("Alice: hi\nBobby: hello").validate(SPEAKERS)
+        self.assertIn("Bobby", str(cm.exception))
+
+    def test_separator_and_preamble_are_honored(self):
+        text = "Keep it calm:\nAlice: " + "a" * 40 + "\nBob: " + "b" * 40 + "\nAlice: bye"
+        dialogue = Dialogue.parse(text)
+        self.assertIs(dialogue.to_text(), text)
+        self.assertEqual(dialogue.to_text("\n\n"), "Keep it calm:\n" + "\n\n".join(
+            f"{speaker}: {line}" for speaker, line in dialogue.lines()))
+
+        for max_chars in (60, 100, 110):
+            with self.subTest(max_chars=max_chars):
+                chunks = dialogue.chunks(max_chars=max_chars)
+                self.assertEqual([turn for chunk in chunks for turn in chunk], dialogue.turns)
+                for chunk in chunks:
+                    self.assertTrue(len(chunk.to_text("\n\n")) <= max_chars or len(chunk) == 1)
+
+    def test_for_speakers_only_splits_on_configured_names(self):
+        for text in ("Read this warmly: Alice and Bob chat about the weather.",
+                     "Alice: Shopping list.\nStep 1: buy bread.\nBob: ok",
+                     "Just one paragraph without labels."):
+            with self.subTest(text=text):
+                self.assertIs(Dialogue.for_speakers(text, SPEAKERS).to_text(), text)
+        dialogue = Dialogue.for_speakers("alice: Step 1: buy bread.\nBOB: ok", SPEAKERS)
+        self.assertEqual(dialogue.lines(), [("Alice", "Step 1: buy bread."), ("Bob", "ok")])
+
+        for text, missing in (("Alice: hi\nCarol: hello", "Carol"),
+                              ("Alice: hi\nNarrator 3: one\nNarrator 3: two", "Narrator 3")):
+            with self.subTest(text=text), self.assertRaisesRegex(ValueError, missing):
+                Dialogue.for_speakers(text, SPEAKERS)
+
+    def test_multi_speaker_passes_instructions_and_prose_through(self):
+        set_default_cache(None)
+        self.addCleanup(set_default_cache, None)
+        backend = FakeBackend(latency=LatencyModel(base=0.0))
+        gemini_tts_example.set_backend(backend)
+        self.addCleanup(gemini_tts_example.set_backend, None)
+        text = "Read this warmly: Alice and Bob chat.\nAlice: Step 1: buy bread.\nBob: ok"
+        with mock.patch.object(gemini_tts_example, "save_wave_file"):
+            audio = text_to_speech_multi_speaker(text, SPEAKERS, verbose=False)
+        self.assertEqual(len(audio), backend.audio_bytes_for(text))
+
+    def test_mismatched_labels_fail_before_any_request(self):
+        with mock.patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"}), \
+                mock.patch("gemini_tts_example.synthesize_pcm") as synthesize:
+            with self.assertRaises(ValueError):
+                text_to_speech_multi_speaker("Alice: hi\nCarol: hello", SPEAKERS, verbose=False)
+        synthesize.assert_not_called()
+
+    def test_slicing_and_chunks_match_chunk_script(self):
+        script = PAPERS["gneiss_web"]["script"]
+        dialogue = Dialogue.parse(script).validate(PAPER_SPEAKERS)
+        self.assertEqual(dialogue[2:5].chars, dialogue.chars_between(2, 5))
+        self.assertEqual(dialogue[2:5].turns, dialogue.turns[2:5])
+        self.assertEqual(
+            [chunk.to_text("\n\n") for chunk in dialogue.chunks(max_chars=600)],
+            chunk_script(script, max_chars=600),
+        )
+        self.assertEqual(sum(dialogue.chars_by_speaker().values()),
+                         sum(len(turn.text) for turn in dialogue))
+
+    def test_script_lines_round_trip(self):
+        lines = [("Alice", "Hello there!"), ("Bob", "Hi Alice, how are you?")]
+        dialogue = Dialogue.from_lines(lines)
+        self.assertEqual(create_dialogue_from_script(dialogue), create_dialogue_from_script(lines))
+        self.assertEqual(Dialogue.parse(dialogue.to_text()).turns, [Turn("Alice", "Hello there!"),
+                                                                   Turn("Bob", "Hi Alice, how are you?")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import json
+import os
+import tempfile
+import unittest
+
+import dialogues
+from dialogues import CorpusStore, JsonCorpus, get_dialogue, iter_dialogues, open_corpus, write_corpus
+
+
+RECORDS = [
+    ("demo", "greeting", "Host: Hello!\nGuest: Hi there."),
+    ("demo", "script", [["Alice", "Hello"], ["Bob", "Hi"]]),
+    ("papers", "intro", "Narrator 1: Welcome.\nNarrator 2: Thanks."),
+]
+
+
+class CorpusStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.addCleanup(dialogues.set_corpus, None)
+
+    def test_single_file_and_sharded_layouts_return_the_same_records(self):
+        single = write_corpus(RECORDS, os.path.join(self.tmp, "corpus.jsonl"))
+        sharded = write_corpus(RECORDS, os.path.join(self.tmp, "shards"), shard_records=2)
+        self.assertEqual(len(sharded.shards), 2)
+        for store in (single, sharded):
+            reopened = open_corpus(store.path)
+            self.assertIsInstance(reopened, CorpusStore)
+            for section, key, dialogue in RECORDS:
+                self.assertEqual(reopened.get(section, key), dialogue)
+            self.assertEqual(reopened.sections(), ["demo", "papers"])
+            self.assertEqual([key for key, _ in reopened.iter_section("demo")], ["greeting", "script"])
+            with self.assertRaises(KeyError):
+                reopened.get("demo", "missing")
+            reopened.close()
+
+    def test_stale_index_is_rebuilt(self):
+        path = os.path.join(self.tmp, "corpus.jsonl")
+        write_corpus(RECORDS[:1], path).close()
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"section": "demo", "key": "late", "dialogue": "A: added"}) + "\n")
+        store = CorpusStore(path)
+        self.assertEqual(store.get("demo", "late"), "A: added")
+        store.close()
+
+    def test_default_corpus_and_lazy_iteration(self):
+        self.assertIsInstance(dialogues.get_corpus(), JsonCorpus)
+        self.assertTrue(get_dialogue("multi_speaker_demo", "podcast_conversation").startswith("Host:"))
+
+        dialogues.set_corpus(write_corpus(RECORDS, os.path.join(self.tmp, "corpus.jsonl")))
+        self.assertEqual(get_dialogue("papers", "intro"), RECORDS[2][2])
+        self.assertEqual(list(iter_dialogues("demo")), [tuple(r) for r in RECORDS[:2]])
+        self.assertEqual(len(list(iter_dialogues())), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
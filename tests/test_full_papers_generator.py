@@ -0,0 +1,107 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+import wave
+from contextlib import redirect_stdout
+from unittest import mock
+
+import full_papers_generator
+import gemini_tts_example
+from audio_cache import set_default_cache
+from backends import FakeBackend, LatencyModel
+from postprocess import PostProcessor, set_default_postprocessor
+from run_manifest import OK, RunManifest
+from spool import set_memory_budget
+
+
+class GenerateAllPapersTestCase(unittest.TestCase):
+    def test_concurrent_run_reports_in_paper_order(self):
+        outputs = [p["output"] for p in full_papers_generator.PAPERS.values()]
+
+        def fake_presentation(title, script, output, verbose=True):
+            # Later papers finish first to exercise ordering
+            time.sleep(0.01 * (len(outputs) - outputs.index(output)))
+            if output == "fineweb_full.wav":
+                raise RuntimeError("quota exceeded")
+
+        for jobs in (1, 3):
+            with self.subTest(jobs=jobs):
+                out = io.StringIO()
+                with mock.patch.object(full_papers_generator, "create_full_paper_presentation", fake_presentation), \
+                        redirect_stdout(out):
+                    results = full_papers_generator.generate_all_papers(jobs=jobs)
+
+                self.assertEqual(list(results), list(full_papers_generator.PAPERS))
+                self.assertFalse(results["fineweb"]["success"])
+                self.assertEqual(str(results["fineweb"]["error"]), "quota exceeded")
+                self.assertEqual(sum(r["success"] for r in results.values()), 4)
+                text = out.getvalue()
+                self.assertIn("Error generating fineweb_full.wav: quota exceeded", text)
+                self.assertIn("Speedup", text)
+                if jobs > 1:
+                    positions = [text.index(p["output"]) for p in full_papers_generator.PAPERS.values()]
+                    self.assertEqual(positions, sorted(positions))
+
+    def test_pipelined_run_writes_every_paper(self):
+        set_default_cache(None)
+        self.addCleanup(set_default_cache, None)
+        gemini_tts_example.set_backend(FakeBackend(latency=LatencyModel(base=0.0)))
+        self.addCleanup(gemini_tts_example.set_backend, None)
+        cwd = os.getcwd()
+        self.addCleanup(os.chdir, cwd)
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            manifest = RunManifest("manifest.json")
+            out = io.StringIO()
+            with redirect_stdout(out):
+                results = full_papers_generator.generate_all_papers(jobs=2, manifest=manifest, pipeline=True)
+
+            self.assertTrue(all(r["success"] for r in results.values()))
+            for key, paper in full_papers_generator.PAPERS.items():
+                with wave.open(paper["output"], "rb") as wav:
+                    self.assertGreater(wav.getnframes(), 0)
+                self.assertEqual(manifest.check(key, full_papers_generator.paper_job_hash(key)), OK)
+            self.assertIn("waiting for input", out.getvalue())
+            os.chdir(cwd)
+
+    def test_pipelined_run_with_memory_budget_assembles_on_disk(self):
+        set_default_cache(None)
+        self.addCleanup(set_default_cache, None)
+        gemini_tts_example.set_backend(FakeBackend(latency=LatencyModel(base=0.0)))
+        self.addCleanup(gemini_tts_example.set_backend, None)
+        set_default_postprocessor(PostProcessor())
+        self.addCleanup(set_default_postprocessor, None)
+        # A zero budget spills every chunk
+        set_memory_budget(0)
+        self.addCleanup(set_memory_budget, None)
+        cwd = os.getcwd()
+        self.addCleanup(os.chdir, cwd)
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            manifest = RunManifest("manifest.json")
+            with mock.patch.object(full_papers_generator, "write_spooled_wave",
+                                   wraps=gemini_tts_example.write_spooled_wave) as spooled, \
+                    redirect_stdout(io.StringIO()):
+                results = full_papers_generator.generate_all_papers(jobs=2, manifest=manifest, pipeline=True)
+            self.assertTrue(all(r["success"] for r in results.values()))
+            self.assertEqual(spooled.call_count, len(full_papers_generator.PAPERS))
+            pipelined = {}
+            for key, paper in full_papers_generator.PAPERS.items():
+                self.assertEqual(manifest.check(key, full_papers_generator.paper_job_hash(key)), OK)
+                with open(paper["output"], "rb") as f:
+                    pipelined[key] = f.read()
+
+            # The job hash says "spooled", so the audio must match a regular spooled run
+            with redirect_stdout(io.StringIO()):
+                self.assertTrue(full_papers_generator.generate_paper_audio("fineweb", verbose=False))
+            with open(full_papers_generator.PAPERS["fineweb"]["output"], "rb") as f:
+                self.assertEqual(f.read(), pipelined["fineweb"])
+            self.assertEqual(sorted(os.listdir(tmp)),
+                             sorted(["manifest.json"] + [p["output"] for p in full_papers_generator.PAPERS.values()]))
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+import asyncio
+import itertools
+import threading
+import time
+import unittest
+
+import gemini_tts_example
+from audio_cache import set_default_cache
+from backends import FakeBackend, LatencyModel
+from hedging import Hedger
+from scheduler import SynthesisScheduler, set_scheduler
+
+
+def warmed_hedger(latency=0.01, **kwargs):
+    hedger = Hedger(min_samples=5, budget=1.0, **kwargs)
+    for _ in range(5):
+        hedger.observe(10, latency)
+    return hedger
+
+
+def slow_then_fast(slow_seconds=1.0):
+    """Return a function whose first call is slow and later calls are fast."""
+    calls = itertools.count()
+
+    def request(value):
+        if next(calls) == 0:
+            time.sleep(slow_seconds)
+            return ("slow", value)
+        return ("fast", value)
+
+    return request
+
+
+class HedgerTestCase(unittest.TestCase):
+    def test_no_hedge_before_warm_up(self):
+        hedger = Hedger(min_samples=5)
+        self.assertIsNone(hedger.hedge_delay(10))
+        self.assertEqual(hedger.call(lambda: "ok", size=10), "ok")
+        self.assertEqual(hedger.stats()["hedges_fired"], 0)
+
+    def test_slow_request_is_hedged_and_hedge_wins(self):
+        hedger = warmed_hedger()
+        start = time.perf_counter()
+        self.assertEqual(hedger.call(slow_then_fast(), "x", size=10), ("fast", "x"))
+        self.assertLess(time.perf_counter() - start, 0.5)
+        stats = hedger.stats()
+        self.assertEqual((stats["requests"], stats["hedges_fired"], stats["hedges_won"]), (1, 1, 1))
+        self.assertIn("<64", stats["hedge_delays"])
+
+    def test_budget_caps_hedges(self):
+        hedger = warmed_hedger()
+        hedger.budget = 0.0
+        self.assertEqual(hedger.call(slow_then_fast(0.1), "x", size=10), ("slow", "x"))
+        stats = hedger.stats()
+        self.assertEqual((stats["hedges_fired"], stats["budget_denied"]), (0, 1))
+
+    def test_primary_error_raised_when_both_attempts_fail(self):
+        hedger = warmed_hedger()
+        calls = itertools.count()
+
+        def failing():
+            if next(calls) == 0:
+                time.sleep(0.1)
+                raise ValueError("primary")
+            raise KeyError("hedge")
+
+        with self.assertRaisesRegex(ValueError, "primary"):
+            hedger.call(failing, size=10)
+
+    def test_async_hedge_cancels_the_loser(self):
+        hedger = warmed_hedger()
+        cancelled = threading.Event()
+        calls = itertools.count()
+
+        async def request():
+            if next(calls) == 0:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+                return "slow"
+            return "fast"
+
+        async def scenario():
+            result = await hedger.call_async(request, size=10)
+            await asyncio.sleep(0)
+            return result
+
+        self.assertEqual(asyncio.run(scenario()), "fast")
+        self.assertTrue(cancelled.is_set())
+        self.assertEqual(hedger.stats()["hedges_won"], 1)
+
+
+class SlowFirstBackend(FakeBackend):
+    def __init__(self):
+        super().__init__(latency=LatencyModel(base=0.0))
+        self.calls = itertools.count()
+
+    def generate(self, contents, voices, model):
+        if next(self.calls) == 0:
+            time.sleep(1.0)
+        return super().generate(contents, voices, model)
+
+
+class HedgedSynthesisTestCase(unittest.TestCase):
+    def setUp(self):
+        set_default_cache(None)
+        self.addCleanup(set_default_cache, None)
+        self.backend = SlowFirstBackend()
+        gemini_tts_example.set_backend(self.backend)
+        self.addCleanup(gemini_tts_example.set_backend, None)
+
+    def test_synthesize_pcm_returns_the_hedged_audio(self):
+        hedger = warmed_hedger()
+        start = time.perf_counter()
+        audio = gemini_tts_example.synthesize_pcm("Hello there.", "kore", hedge=hedger)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(len(audio), self.backend.audio_bytes_for("Hello there."))
+        self.assertEqual(hedger.stats()["hedges_won"], 1)
+
+    def test_each_attempt_holds_its_own_slot_until_it_finishes(self):
+        scheduler = SynthesisScheduler(max_concurrency=2)
+        set_scheduler(scheduler)
+        self.addCleanup(set_scheduler, None)
+        hedger = warmed_hedger()
+        gemini_tts_example.synthesize_pcm("Hello there.", "kore", hedge=hedger)
+        self.assertEqual(hedger.stats()["hedges_won"], 1)
+        # The losing primary is still running and keeps its slot
+        self.assertEqual(scheduler.in_flight, 1)
+        deadline = time.perf_counter() + 3
+        while scheduler.in_flight and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(scheduler.in_flight, 0)
+
+    def test_hedging_is_off_by_default(self):
+        audio = gemini_tts_example.synthesize_pcm("Hello there.", "kore")
+        self.assertEqual(len(audio), self.backend.audio_bytes_for("Hello there."))
+        self.assertEqual(self.backend.stats()["requests"], 1)
+
+
+class SaturatedSchedulerTestCase(unittest.TestCase):
+    def setUp(self):
+        set_default_cache(None)
+        self.addCleanup(set_default_cache, None)
+        self.backend = FakeBackend(latency=LatencyModel(base=0.05, distribution="fixed"))
+        gemini_tts_example.set_backend(self.backend)
+        self.addCleanup(gemini_tts_example.set_backend, None)
+        self.scheduler = SynthesisScheduler(max_concurrency=1)
+        set_scheduler(self.scheduler)
+        self.addCleanup(set_scheduler, None)
+
+    def hold_only_slot(self, seconds):
+        ticket = self.scheduler.acquire()
+        timer = threading.Timer(seconds, self.scheduler.release, [ticket])
+        timer.start()
+        self.addCleanup(timer.join)
+
+    def test_queue_wait_neither_triggers_hedges_nor_counts_as_latency(self):
+        self.hold_only_slot(0.5)
+        hedger = warmed_hedger()
+        start = time.perf_counter()
+        gemini_tts_example.synthesize_pcm("Hello there.", "kore", hedge=hedger)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.5)
+
+        stats = hedger.stats()
+        # The request ran past the hedge delay, but no slot was free for a hedge
+        self.assertEqual((stats["hedges_fired"], stats["capacity_denied"]), (0, 1))
+        self.assertEqual(self.backend.stats()["requests"], 1)
+        self.assertLess(hedger.hedge_delay(10), 0.2)
+        self.assertEqual(self.scheduler.in_flight, 0)
+
+    def test_async_queue_wait_is_not_sampled(self):
+        self.hold_only_slot(0.5)
+        hedger = warmed_hedger()
+        asyncio.run(gemini_tts_example.synthesize_pcm_async("Hello there.", "kore", hedge=hedger))
+        self.assertEqual(hedger.stats()["hedges_fired"], 0)
+        self.assertLess(hedger.hedge_delay(10), 0.2)
+        self.assertEqual(self.scheduler.in_flight, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+import wave
+from unittest import mock
+
+import incremental_render
+from audio_cache import AudioCache
+from incremental_render import render_incremental
+
+
+SPEAKERS = [{"name": "Narrator 1", "voice": "kore"}, {"name": "Narrator 2", "voice": "charon"}]
+
+
+class IncrementalRenderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = AudioCache(os.path.join(self.tmp.name, "segments"))
+        self.output = os.path.join(self.tmp.name, "paper.wav")
+        self.calls = []
+
+        def fake_synthesize(contents, voice, model, cache=None):
+            self.calls.append(contents)
+            return contents.encode().ljust(480, b"\x00")
+
+        patcher = mock.patch.object(incremental_render, "synthesize_pcm", fake_synthesize)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        env = mock.patch.dict(os.environ, {"GEMINI_API_KEY": "test"})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def render(self, script):
+        return render_incremental(script, SPEAKERS, self.output, preamble="Say: ", store=self.store)
+
+    def test_only_changed_turns_are_resynthesized(self):
+        script = "Narrator 1: One.\n\nNARRATOR 2: Two.\n\nNarrator 1: Three."
+        first = self.render(script)
+        self.assertEqual(first["regenerated_turns"], 3)
+        self.assertEqual(first["diff"]["added"], 3)
+
+        self.calls.clear()
+        second = self.render(script.replace("Two.", "Two, edited.") + "\n\nNarrator 2: Four.")
+        self.assertEqual(self.calls, ["Say: Two, edited.", "Say: Four."])
+        self.assertEqual((second["reused_turns"], second["regenerated_turns"]), (2, 2))
+        self.assertAlmostEqual(second["reused_seconds"], 2 * 480 / 48000)
+        self.assertEqual(second["diff"], {"unchanged": 2, "added": 1, "changed": 1, "removed": 0})
+
+        with wave.open(self.output, "rb") as wf:
+            audio = wf.readframes(wf.getnframes())
+        self.assertEqual(len(audio), 4 * 480)
+        self.assertTrue(audio.startswith(b"Say: One."))
+
+    def test_unchanged_script_makes_no_requests(self):
+        script = [("Narrator 1", "Hello."), ("Narrator 2", "Hi.")]
+        self.render(script)
+        self.calls.clear()
+        report = self.render(script)
+        self.assertEqual(self.calls, [])
+        self.assertEqual(report["regenerated_seconds"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
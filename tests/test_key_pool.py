@@ -0,0 +1,107 @@
+import os
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import gemini_tts_example
+from audio_cache import set_default_cache
+from backends import FakeBackendError
+from key_pool import KeyPool, get_key_pool, set_key_pool
+from retry import CallStats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class KeyPoolTestCase(unittest.TestCase):
+    def test_routes_to_key_with_most_headroom(self):
+        clock = FakeClock()
+        pool = KeyPool([{"key": "small", "rpm": 2}, {"key": "large", "rpm": 10}], clock=clock)
+        names = []
+        for _ in range(8):
+            key = pool.acquire()
+            names.append(key.api_key)
+            pool.release(key)
+        self.assertEqual(names.count("small"), 1)
+        self.assertEqual(names.count("large"), 7)
+
+        clock.now += 61
+        stats = pool.stats()
+        self.assertEqual([s["requests"] for s in stats], [1, 7])
+        self.assertEqual([s["requests_last_minute"] for s in stats], [0, 0])
+
+    def test_quota_error_drains_key_and_marks_failover(self):
+        clock = FakeClock()
+        pool = KeyPool(["key-a", "key-b"], clock=clock)
+        with self.assertRaises(FakeBackendError) as cm:
+            with pool.lease() as key:
+                self.assertEqual(key.api_key, "key-a")
+                raise FakeBackendError(429, retry_after=30)
+        self.assertTrue(cm.exception.failover)
+
+        self.assertEqual({pool.acquire().api_key for _ in range(3)}, {"key-b"})
+        clock.now += 31
+        self.assertEqual(pool.acquire().api_key, "key-a")
+        self.assertEqual(pool.stats()[0]["rate_limited"], 1)
+
+    def test_malformed_retry_after_keeps_the_quota_error(self):
+        clock = FakeClock()
+        pool = KeyPool(["key-a", "key-b"], drain_seconds=20, clock=clock)
+        with self.assertRaises(FakeBackendError):
+            with pool.lease():
+                raise FakeBackendError(429, retry_after="soon")
+        self.assertEqual(pool.stats()[0]["drains"], 1)
+        clock.now += 19
+        self.assertEqual(pool.acquire().api_key, "key-b")
+
+    def test_empty_pool_raises(self):
+        with self.assertRaises(ValueError):
+            KeyPool([]).acquire()
+
+    def test_pool_follows_environment(self):
+        with mock.patch.dict(os.environ, {"GEMINI_API_KEYS": "k1, k2,k3"}):
+            self.assertEqual([key.api_key for key in get_key_pool().keys], ["k1", "k2", "k3"])
+        with mock.patch.dict(os.environ, {"GEMINI_API_KEY": "only"}):
+            os.environ.pop("GEMINI_API_KEYS", None)
+            self.assertEqual([key.api_key for key in get_key_pool().keys], ["only"])
+
+
+class PooledSynthesisTestCase(unittest.TestCase):
+    def setUp(self):
+        set_default_cache(None)
+        self.addCleanup(set_default_cache, None)
+        gemini_tts_example.set_backend(gemini_tts_example.GeminiBackend())
+        self.addCleanup(gemini_tts_example.set_backend, None)
+        self.pool = KeyPool(["exhausted", "fresh"])
+        set_key_pool(self.pool)
+        self.addCleanup(set_key_pool, None)
+
+    def test_synthesis_fails_over_without_waiting(self):
+        def generate_content(api_key):
+            def call(model, contents, config):
+                if api_key == "exhausted":
+                    raise FakeBackendError(429, retry_after=120)
+                part = SimpleNamespace(inline_data=SimpleNamespace(data=b"\x01\x00"))
+                return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+            return call
+
+        def get_client(api_key=None):
+            return SimpleNamespace(models=SimpleNamespace(generate_content=generate_content(api_key)))
+
+        stats = CallStats()
+        with mock.patch.object(gemini_tts_example, "get_client", get_client):
+            audio = gemini_tts_example.synthesize_pcm("hello", "kore", stats=stats)
+        self.assertEqual(bytes(audio), b"\x01\x00")
+        self.assertEqual(stats.retries, 1)
+        self.assertEqual(stats.backoff_seconds, 0.0)
+        self.assertEqual([s["requests"] for s in self.pool.stats()], [1, 1])
+        self.assertGreater(self.pool.stats()[0]["drained_for"], 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
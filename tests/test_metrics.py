@@ -0,0 +1,107 @@
+import json
+import os
+import tempfile
+import unittest
+
+import gemini_tts_example
+from audio_cache import AudioCache, set_default_cache
+from backends import FakeBackend, LatencyModel
+from metrics import (
+    InMemoryAggregator,
+    JsonLinesSink,
+    PrometheusSink,
+    add_sink,
+    phase,
+    remove_sink,
+    synthesis_span,
+)
+
+
+def _no_sleep(seconds):
+    pass
+
+
+class MetricsTestCase(unittest.TestCase):
+    def setUp(self):
+        set_default_cache(None)
+        self.addCleanup(set_default_cache, None)
+        self.addCleanup(gemini_tts_example.set_backend, None)
+        gemini_tts_example.set_backend(FakeBackend(latency=LatencyModel(base=0.0), sleep=_no_sleep))
+        self.aggregator = add_sink(InMemoryAggregator())
+        self.addCleanup(remove_sink, self.aggregator)
+
+    def test_nested_calls_emit_one_event_with_phases(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "out.wav")
+            audio = gemini_tts_example.text_to_speech_simple("x" * 30, "Kore", output, verbose=False)
+
+        snapshot = self.aggregator.snapshot()
+        self.assertEqual(list(snapshot), ["text_to_speech_simple"])
+        row = snapshot["text_to_speech_simple"]
+        self.assertEqual((row["calls"], row["ok"], row["chars"], row["bytes"]), (1, 1, 30, len(audio)))
+        self.assertAlmostEqual(row["audio_seconds"], 2.0, delta=0.01)
+        for name in ("config", "request", "extract", "write"):
+            self.assertIn(name, row["phases"])
+
+    def test_cache_hits_and_errors_are_counted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = AudioCache(tmp)
+            gemini_tts_example.synthesize_pcm("hello there", "Kore", cache=cache)
+            gemini_tts_example.synthesize_pcm("hello there", "Kore", cache=cache)
+        with self.assertRaises(RuntimeError):
+            with synthesis_span("failing", "m", "Kore", 3):
+                with phase("request"):
+                    raise RuntimeError("boom")
+
+        snapshot = self.aggregator.snapshot()
+        self.assertEqual((snapshot["synthesize"]["ok"], snapshot["synthesize"]["cache_hit"]), (1, 1))
+        self.assertEqual(snapshot["failing"]["error"], 1)
+        self.assertIn("synthesize", self.aggregator.summary_table())
+
+    def test_json_lines_and_prometheus_sinks(self):
+        prometheus = add_sink(PrometheusSink())
+        self.addCleanup(remove_sink, prometheus)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.jsonl")
+            sink = add_sink(JsonLinesSink(path))
+            try:
+                gemini_tts_example.synthesize_pcm("abc", (("A", "Kore"), ("B", "Puck")))
+            finally:
+                remove_sink(sink)
+            with open(path, encoding="utf-8") as f:
+                events = [json.loads(line) for line in f]
+
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["voices"], {"A": "Kore", "B": "Puck"})
+        exposition = prometheus.exposition()
+        self.assertIn('gemini_tts_requests_total{operation="synthesize",outcome="ok"} 1', exposition)
+        self.assertIn('gemini_tts_input_chars_total{operation="synthesize"} 3', exposition)
+
+    def test_chunked_call_is_one_row_and_cache_hit_needs_every_request(self):
+        names = [speaker["name"] for speaker in gemini_tts_example.PAPER_SPEAKERS]
+        script = "\n".join(f"{names[i % 2]}: Part {i} of a long reading." for i in range(30))
+        with tempfile.TemporaryDirectory() as tmp:
+            set_default_cache(AudioCache(os.path.join(tmp, "cache")))
+            output = os.path.join(tmp, "paper.wav")
+            for text in (script, script, script + f"\n{names[0]}: One more line."):
+                gemini_tts_example.create_full_paper_presentation(
+                    "Paper", text, output, verbose=False, max_chunk_chars=200, postprocess=False,
+                    memory_budget=False,
+                )
+                audio_bytes = os.path.getsize(output) - 44
+
+        snapshot = self.aggregator.snapshot()
+        self.assertEqual(list(snapshot), ["create_full_paper_presentation"])
+        row = snapshot["create_full_paper_presentation"]
+        # First run ok, second fully cached, third partly cached
+        self.assertEqual((row["calls"], row["ok"], row["cache_hit"]), (3, 2, 1))
+        self.assertGreater(row["phases"]["request"], 0)
+
+        table = self.aggregator.summary_table().splitlines()
+        self.assertEqual(len({len(line) for line in table}), 1)
+        self.assertTrue(table[2].startswith("create_full_paper_presentation "))
+        self.assertAlmostEqual(row["bytes"] / 3, audio_bytes, delta=audio_bytes * 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+import gemini_tts_example
+from audio_cache import set_default_cache
+from backends import FakeBackend, LatencyModel
+from packing import PAUSE_LINE, pack_prompt, plan_packs, synthesize_packed, text_to_speech_packed
+from postprocess import find_pauses
+
+TEXTS = [
+    "Press one for sales.",
+    "Press two for support.",
+    "Press three to hear these options again.",
+    "Goodbye.",
+    "Please hold while we connect your call.",
+]
+
+
+def _no_sleep(seconds):
+    pass
+
+
+class PackingTestCase(unittest.TestCase):
+    def setUp(self):
+        set_default_cache(None)
+        self.addCleanup(set_default_cache, None)
+        self.addCleanup(gemini_tts_example.set_backend, None)
+
+    def test_plan_respects_item_and_char_budgets(self):
+        self.assertEqual(plan_packs(TEXTS, max_items=2), [[0, 1], [2, 3], [4]])
+        packs = plan_packs(TEXTS, max_items=10, max_chars=60)
+        self.assertEqual([index for pack in packs for index in pack], list(range(len(TEXTS))))
+        for pack in packs[:-1]:
+            self.assertLessEqual(len(PAUSE_LINE.join(TEXTS[index] for index in pack)), 60)
+        style = "Say cheerfully:"
+        for pack in plan_packs(TEXTS, max_items=10, max_chars=60, style=style):
+            self.assertLessEqual(len(pack_prompt([TEXTS[index] for index in pack], style)), 60)
+
+    def test_packed_clips_match_single_calls(self):
+        backend = FakeBackend(latency=LatencyModel(base=0.0), sleep=_no_sleep)
+        gemini_tts_example.set_backend(backend)
+        clips, report = synthesize_packed(TEXTS, "kore")
+
+        self.assertEqual(report, {"items": 5, "packs": 1, "requests": 1, "fallback_packs": 0})
+        self.assertEqual(backend.stats()["requests"], 1)
+        for text, clip in zip(TEXTS, clips):
+            # Every clip keeps at most 50 ms of pause padding on each side
+            self.assertAlmostEqual(len(clip), backend.audio_bytes_for(text), delta=2 * 2400 + 1920)
+        self.assertEqual(len(find_pauses(backend.generate(pack_prompt(TEXTS), "kore", "m"))), 4)
+
+    def test_mismatched_pauses_fall_back_to_single_calls(self):
+        # Pauses too short to detect: the pack is resynthesized item by item
+        backend = FakeBackend(latency=LatencyModel(base=0.0), pause_seconds=0.1, sleep=_no_sleep)
+        gemini_tts_example.set_backend(backend)
+        clips, report = synthesize_packed(TEXTS[:3], "kore")
+
+        self.assertEqual(report["fallback_packs"], 1)
+        self.assertEqual(report["requests"], 4)
+        self.assertEqual([len(clip) for clip in clips], [backend.audio_bytes_for(text) for text in TEXTS[:3]])
+
+    def test_quiet_setting_silences_packed_summary(self):
+        gemini_tts_example.set_backend(FakeBackend(latency=LatencyModel(base=0.0), sleep=_no_sleep))
+        self.addCleanup(gemini_tts_example.set_verbose, gemini_tts_example._verbose)
+        gemini_tts_example.set_verbose(False)
+        out = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp, redirect_stdout(out):
+            text_to_speech_packed(TEXTS[:2], [os.path.join(tmp, f"{index}.wav") for index in range(2)])
+        self.assertEqual(out.getvalue(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+import wave
+from types import SimpleNamespace
+
+from gemini_tts_example import extract_audio, join_chunks
+from pcm_buffer import PCMBuffer, write_wave_segments
+
+
+def _part(data):
+    return SimpleNamespace(inline_data=SimpleNamespace(data=data))
+
+
+class PCMBufferTestCase(unittest.TestCase):
+    def test_growable_append(self):
+        buffer = PCMBuffer()
+        for i in range(100):
+            buffer.append(bytes([i]) * 3)
+        self.assertEqual(len(buffer), 300)
+        self.assertGreaterEqual(buffer.capacity, 300)
+        self.assertEqual(buffer.to_bytes(), b"".join(bytes([i]) * 3 for i in range(100)))
+
+    def test_collects_every_part_of_every_candidate(self):
+        response = SimpleNamespace(candidates=[
+            SimpleNamespace(content=SimpleNamespace(parts=[_part(b"ab"), SimpleNamespace(inline_data=None)])),
+            SimpleNamespace(content=None),
+            SimpleNamespace(content=SimpleNamespace(parts=[_part(b"cd"), _part(b"ef")])),
+        ])
+        self.assertEqual(bytes(extract_audio(response)), b"abcdef")
+        buffer = PCMBuffer(6)
+        buffer.add_response(response)
+        self.assertEqual(buffer.capacity, 6)
+        self.assertEqual(buffer.view(), b"abcdef")
+
+    def test_reserve_keeps_the_assembled_prefix(self):
+        buffer = PCMBuffer(4)
+        buffer.append(b"abc")
+        view = buffer.view()
+        buffer.reserve(1000)
+        self.assertEqual(buffer.capacity, 1000)
+        self.assertEqual(buffer.to_bytes(), b"abc")
+        # Views handed out before the growth stay valid
+        self.assertEqual(view, b"abc")
+
+    def test_join_chunks_releases_segments_as_it_copies(self):
+        segments = [os.urandom(100) for _ in range(4)]
+        expected = b"".join(segments)
+        self.assertEqual(join_chunks(segments), expected)
+        self.assertEqual(segments, [None] * 4)
+
+    def test_wave_outputs_match(self):
+        segments = [os.urandom(1000) for _ in range(5)]
+        with tempfile.TemporaryDirectory() as tmp:
+            buffer = PCMBuffer()
+            buffer.extend(segments)
+            buffer.write_wave(os.path.join(tmp, "a.wav"))
+            write_wave_segments(os.path.join(tmp, "b.wav"), segments)
+            for name in ("a.wav", "b.wav"):
+                with wave.open(os.path.join(tmp, name), "rb") as wf:
+                    self.assertEqual(wf.readframes(wf.getnframes()), b"".join(segments))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import random
+import threading
+import time
+import unittest
+
+from pipeline import Pipeline, Stage
+from scheduler import current_priority, priority
+
+
+class PipelineTestCase(unittest.TestCase):
+    def test_stages_overlap_and_report_busy_and_idle_time(self):
+        def fetch(item):
+            time.sleep(0.05)
+            return item * 2
+
+        def write(item):
+            time.sleep(0.05)
+            return item + 1
+
+        pipeline = Pipeline([Stage("fetch", fetch), Stage("write", write)])
+        self.assertEqual(pipeline.run(range(6)), [1, 3, 5, 7, 9, 11])
+        # One after another would take 0.6s; overlapped it is about 0.35s
+        self.assertLess(pipeline.wall_seconds, 0.5)
+
+        fetch_stats, write_stats = pipeline.stats()
+        self.assertEqual((fetch_stats["items"], write_stats["items"]), (6, 6))
+        self.assertGreaterEqual(fetch_stats["busy_seconds"], 0.29)
+        # The writer waits for the first fetch before it has anything to do
+        self.assertGreaterEqual(write_stats["starved_seconds"], 0.04)
+        self.assertGreater(fetch_stats["utilization"], 0.6)
+
+    def test_failures_pass_through_without_stopping_other_items(self):
+        def fetch(item):
+            if item == 2:
+                raise ValueError("bad item")
+            return item
+
+        written = []
+        pipeline = Pipeline([Stage("fetch", fetch, workers=2), Stage("write", written.append)])
+        results = pipeline.run(range(5), return_exceptions=True)
+        self.assertIsInstance(results[2], ValueError)
+        self.assertEqual(sorted(written), [0, 1, 3, 4])
+        self.assertEqual(pipeline.stats()[0]["errors"], 1)
+
+        with self.assertRaisesRegex(ValueError, "bad item"):
+            pipeline.run(range(5))
+
+    def test_ordered_stage_sees_items_in_input_order(self):
+        rng = random.Random(0)
+
+        def fetch(item):
+            time.sleep(rng.random() * 0.01)
+            return item
+
+        seen = []
+        pipeline = Pipeline([Stage("fetch", fetch, workers=4), Stage("append", seen.append, ordered=True)])
+        pipeline.run(range(30))
+        self.assertEqual(seen, list(range(30)))
+
+    def test_items_in_flight_are_bounded(self):
+        lock = threading.Lock()
+        state = {"inside": 0, "peak": 0}
+
+        def enter(item):
+            with lock:
+                state["inside"] += 1
+                state["peak"] = max(state["peak"], state["inside"])
+            return item
+
+        def leave(item):
+            time.sleep(0.005)
+            with lock:
+                state["inside"] -= 1
+            return item
+
+        pipeline = Pipeline([Stage("enter", enter, workers=2), Stage("leave", leave)], max_in_flight=3)
+        pipeline.run(range(20))
+        self.assertLessEqual(state["peak"], 3)
+
+    def test_stages_run_in_the_callers_priority_class(self):
+        pipeline = Pipeline([Stage("check", lambda item: current_priority())])
+        with priority("bulk"):
+            self.assertEqual(pipeline.run([1, 2]), ["bulk", "bulk"])
+
+    def test_ordered_stage_needs_one_worker(self):
+        with self.assertRaises(ValueError):
+            Stage("append", print, workers=2, ordered=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
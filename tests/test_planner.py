@@ -0,0 +1,83 @@
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+import full_papers_generator
+from audio_cache import AudioCache, cache_key
+from backends import FakeBackend
+from gemini_tts_example import DEFAULT_MODEL, set_backend
+from planner import RateLimits, SpeechRateModel, build_plan, plan_job, print_plan, schedule, script_requests
+
+
+class SpeechRateModelTestCase(unittest.TestCase):
+    def test_calibrates_per_voice_rates_and_latency(self):
+        events = [
+            {"operation": "synthesize", "outcome": "ok", "voices": "Kore", "chars": 300,
+             "audio_seconds": 20.0, "phases": {"request": 5.0}},
+            {"operation": "synthesize", "outcome": "ok", "voices": "puck", "chars": 100,
+             "audio_seconds": 10.0, "phases": {"request": 3.0}},
+            {"operation": "synthesize", "outcome": "error", "voices": "puck", "chars": 100,
+             "audio_seconds": 0.0, "phases": {"request": 30.0}},
+        ]
+        rates = SpeechRateModel.from_events(events)
+        self.assertEqual(rates.chars_per_second("kore"), 15.0)
+        self.assertEqual(rates.chars_per_second("Puck"), 10.0)
+        self.assertEqual(rates.chars_per_second((("A", "kore"), ("B", "puck"))), 12.5)
+        self.assertAlmostEqual(rates.generation_ratio, 0.2)
+        self.assertAlmostEqual(rates.request_overhead, 1.0)
+
+
+class ScheduleTestCase(unittest.TestCase):
+    def test_requests_per_minute_quota_delays_requests(self):
+        rates = SpeechRateModel(request_overhead=1.0, generation_ratio=0.0)
+        job = plan_job("job", [(f"line {i}", "kore") for i in range(6)], rates)
+
+        unlimited = schedule([job], RateLimits(request_concurrency=2), rates)
+        self.assertEqual(unlimited["wall_seconds"], 3.0)
+        self.assertEqual(unlimited["throttled_seconds"], 0.0)
+
+        limited = schedule([job], RateLimits(rpm=4, request_concurrency=2), rates)
+        self.assertEqual(limited["peak_rpm"], 4)
+        self.assertEqual(limited["wall_seconds"], 61.0)
+        self.assertGreater(limited["throttled_seconds"], 0)
+
+    def test_cached_requests_are_not_scheduled(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = AudioCache(tmp)
+            cache.put(cache_key(DEFAULT_MODEL, "hello", "kore"), b"\x00\x00")
+            job = plan_job("job", [("hello", "kore"), ("world", "kore")], cache=cache)
+        self.assertEqual((job["chunks"], job["cached"]), (2, 1))
+        self.assertEqual(job["chars"], 5)
+        self.assertEqual(cache.hits, 0)
+
+
+class PlanTestCase(unittest.TestCase):
+    def tearDown(self):
+        set_backend(None)
+
+    def test_paper_plan_matches_chunking_without_requests(self):
+        backend = FakeBackend()
+        set_backend(backend)
+        jobs = [(key, full_papers_generator.paper_requests(key)) for key in full_papers_generator.PAPERS]
+        plan = build_plan(jobs, RateLimits(rpm=10, job_concurrency=2))
+
+        self.assertEqual(plan["totals"]["chunks"], sum(len(requests) for _, requests in jobs))
+        self.assertGreater(plan["totals"]["audio_seconds"], 0)
+        self.assertLessEqual(plan["schedule"]["peak_rpm"], 10)
+        self.assertEqual(backend.stats()["requests"], 0)
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            print_plan(plan, input_price=0.5, output_price=10.0)
+        self.assertIn("wall time", out.getvalue())
+        self.assertIn("Estimated cost", out.getvalue())
+
+    def test_script_requests_split_three_speaker_scripts(self):
+        requests = script_requests("A: one\nB: two\nC: three\nA: four")
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(script_requests("A: one\nB: two")[0][1], (("A", "A"), ("B", "B")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import math
+import os
+import struct
+import tempfile
+import unittest
+import wave
+
+from postprocess import (
+    PostProcessor,
+    crossfade_join,
+    measure_levels,
+    process_wave_file,
+    speech_bounds,
+    trim_silence,
+)
+
+
+RATE = 24000
+
+
+def _tone(seconds, amplitude=8000, frequency=200):
+    count = int(seconds * RATE)
+    return struct.pack(f"<{count}h", *(
+        int(amplitude * math.sin(2 * math.pi * frequency * i / RATE)) for i in range(count)
+    ))
+
+
+def _silence(seconds):
+    return bytes(int(seconds * RATE) * 2)
+
+
+class PostProcessTestCase(unittest.TestCase):
+    def test_trim_keeps_pad_around_speech(self):
+        clip = _silence(1.0) + _tone(0.5) + _silence(2.0)
+        start, end = speech_bounds(clip, pad_ms=100)
+        self.assertAlmostEqual(start / 48000, 0.9, delta=0.03)
+        self.assertAlmostEqual(end / 48000, 1.6, delta=0.03)
+        self.assertEqual(len(trim_silence(_silence(1.0))), 0)
+        # Block size only bounds memory; results do not depend on it
+        self.assertEqual(speech_bounds(clip, pad_ms=100, block_seconds=0.05), (start, end))
+
+    def test_crossfade_shortens_each_join(self):
+        segments = [_tone(0.5), _tone(0.5), _tone(0.5)]
+        joined = crossfade_join(segments, crossfade_ms=10)
+        self.assertEqual(len(joined), 3 * len(segments[0]) - 2 * 240 * 2)
+        self.assertEqual(crossfade_join(segments, crossfade_ms=0), b"".join(segments))
+
+    def test_processor_normalizes_peak_and_reports_throughput(self):
+        processor = PostProcessor(normalize="peak", target_db=-3.0)
+        audio = processor.process([_silence(0.5) + _tone(1.0, amplitude=2000), _tone(1.0, amplitude=4000)])
+        self.assertAlmostEqual(measure_levels(audio)["peak_db"], -3.0, delta=0.1)
+        report = processor.last_report
+        self.assertGreater(report["trimmed_seconds"], 0.3)
+        self.assertGreater(report["gain_db"], 0)
+        self.assertGreater(processor.stats()["throughput"], 1)
+
+    def test_wave_file_matches_in_memory_processing(self):
+        clip = _silence(0.5) + _tone(1.0, amplitude=3000) + _silence(0.5)
+        processor = PostProcessor(normalize="rms", target_db=-20.0, block_seconds=0.1)
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "in.wav")
+            target = os.path.join(tmp, "out.wav")
+            with wave.open(source, "wb") as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(RATE)
+                wf.writeframes(clip)
+            report = process_wave_file(source, target, processor)
+            with wave.open(target, "rb") as wf:
+                written = wf.readframes(wf.getnframes())
+
+        self.assertEqual(written, bytes(processor.process(clip)))
+        self.assertAlmostEqual(report["output_seconds"], 1.3, delta=0.03)
+
+
+if __name__ == "__main__":
+    unittest.main()
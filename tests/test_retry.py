@@ -0,0 +1,124 @@
+import unittest
+from types import SimpleNamespace
+
+from retry import (
+    FATAL,
+    RATE_LIMITED,
+    RETRYABLE,
+    CallStats,
+    CircuitBreaker,
+    RetryPolicy,
+    call_with_retry,
+    classify_error,
+    retry_after_seconds,
+)
+
+
+class FakeAPIError(Exception):
+    def __init__(self, code, headers=None, details=None):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+        self.response = SimpleNamespace(headers=headers or {})
+        self.details = details
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class RetryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(min_calls=4, failure_ratio=0.5, cooldown=20.0, clock=self.clock)
+        self.policy = RetryPolicy(max_attempts=4, base_delay=0.5)
+
+    def call(self, func, stats=None):
+        return call_with_retry(func, policy=self.policy, breaker=self.breaker, stats=stats, sleep=self.clock.sleep)
+
+    def test_classification(self):
+        self.assertEqual(classify_error(FakeAPIError(429)), RATE_LIMITED)
+        self.assertEqual(classify_error(FakeAPIError(503)), RETRYABLE)
+        self.assertEqual(classify_error(FakeAPIError(400)), FATAL)
+        self.assertEqual(classify_error(TimeoutError()), RETRYABLE)
+        self.assertEqual(classify_error(ValueError("bad voice")), FATAL)
+
+    def test_retry_after_sources(self):
+        self.assertEqual(retry_after_seconds(FakeAPIError(429, headers={"Retry-After": "7"})), 7.0)
+        details = {"error": {"details": [{"@type": "type.googleapis.com/google.rpc.RetryInfo",
+                                          "retryDelay": "12s"}]}}
+        self.assertEqual(retry_after_seconds(FakeAPIError(429, details=details)), 12.0)
+        self.assertIsNone(retry_after_seconds(FakeAPIError(500)))
+
+    def test_malformed_retry_after_is_ignored(self):
+        self.assertIsNone(retry_after_seconds(FakeAPIError(429, headers={"Retry-After": "soon"})))
+        self.assertIsNone(retry_after_seconds(FakeAPIError(429, details={"error": "quota exceeded"})))
+        self.assertIsNone(retry_after_seconds(FakeAPIError(429, details={"error": {"details": "n/a"}})))
+        # A bad header still falls back to the error body
+        details = {"error": {"details": [{"retryDelay": "3s"}]}}
+        self.assertEqual(retry_after_seconds(FakeAPIError(429, {"Retry-After": "soon"}, details)), 3.0)
+
+    def test_malformed_retry_after_is_still_retried(self):
+        errors = [FakeAPIError(429, headers={"Retry-After": "soon"}, details={"error": "quota exceeded"})]
+
+        def flaky():
+            if errors:
+                raise errors.pop(0)
+            return b"pcm"
+
+        stats = CallStats()
+        self.assertEqual(self.call(flaky, stats), b"pcm")
+        self.assertEqual(stats.errors, [RATE_LIMITED])
+
+    def test_retries_then_succeeds_and_honors_retry_after(self):
+        errors = [FakeAPIError(503), FakeAPIError(429, headers={"Retry-After": "10"})]
+
+        def flaky():
+            if errors:
+                raise errors.pop(0)
+            return b"pcm"
+
+        stats = CallStats()
+        self.assertEqual(self.call(flaky, stats), b"pcm")
+        self.assertEqual((stats.attempts, stats.retries), (3, 2))
+        self.assertEqual(stats.errors, [RETRYABLE, RATE_LIMITED])
+        self.assertGreaterEqual(stats.backoff_seconds, 10.0)
+        self.assertGreaterEqual(self.clock.now, 10.0)
+
+    def test_fatal_errors_are_not_retried(self):
+        stats = CallStats()
+
+        def bad_request():
+            raise FakeAPIError(400)
+
+        with self.assertRaises(FakeAPIError):
+            self.call(bad_request, stats)
+        self.assertEqual(stats.attempts, 1)
+
+    def test_gives_up_after_max_attempts(self):
+        def always_down():
+            raise FakeAPIError(500)
+
+        stats = CallStats()
+        with self.assertRaises(FakeAPIError):
+            self.call(always_down, stats)
+        self.assertEqual(stats.attempts, 4)
+
+    def test_breaker_pauses_callers_when_error_rate_spikes(self):
+        for _ in range(4):
+            self.breaker.record(False)
+        self.assertTrue(self.breaker.is_open)
+        stats = CallStats()
+        self.assertEqual(self.call(lambda: "ok", stats), "ok")
+        self.assertEqual(stats.breaker_wait_seconds, 20.0)
+        self.assertEqual(self.breaker.trips, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
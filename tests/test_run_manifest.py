@@ -0,0 +1,90 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import full_papers_generator
+from gemini_tts_example import save_wave_file
+from run_manifest import (
+    CHANGED,
+    CORRUPT,
+    NOT_RECORDED,
+    OK,
+    OUTPUT_MISSING,
+    STALE,
+    RunManifest,
+    input_hash,
+    run_job,
+)
+
+
+class RunManifestTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cwd = os.getcwd()
+        os.chdir(tmp.name)
+        self.addCleanup(os.chdir, cwd)
+
+    def test_check_detects_stale_inputs_and_damaged_outputs(self):
+        manifest = RunManifest("run.manifest.json")
+        job_hash = input_hash("model", "Kore", "hello")
+        save_wave_file("a.wav", bytes(4800))
+        manifest.record("a", job_hash, "a.wav")
+
+        reloaded = RunManifest("run.manifest.json")
+        self.assertEqual(reloaded.entry("a")["duration"], 0.1)
+        self.assertEqual(reloaded.check("a", job_hash), OK)
+        self.assertEqual(reloaded.check("a", input_hash("model", "Kore", "edited")), STALE)
+        self.assertEqual(reloaded.check("b", job_hash), NOT_RECORDED)
+
+        save_wave_file("a.wav", b"\x01" * 4800)
+        self.assertEqual(reloaded.check("a", job_hash), OK)
+        self.assertEqual(reloaded.check("a", job_hash, deep=True), CHANGED)
+        with open("a.wav", "r+b") as f:
+            f.truncate(100)
+        self.assertEqual(reloaded.check("a", job_hash), CORRUPT)
+        os.remove("a.wav")
+        self.assertEqual(reloaded.verify(), {"a": OUTPUT_MISSING})
+
+    def test_run_job_skips_finished_jobs_on_resume(self):
+        manifest = RunManifest("run.manifest.json")
+        calls = []
+
+        def job():
+            calls.append(1)
+            save_wave_file("a.wav", bytes(480))
+
+        self.assertTrue(run_job(manifest, "a", "h1", "a.wav", job, resume=True))
+        self.assertFalse(run_job(manifest, "a", "h1", "a.wav", job, resume=True))
+        self.assertTrue(run_job(manifest, "a", "h2", "a.wav", job, resume=True))
+        self.assertTrue(run_job(manifest, "a", "h2", "a.wav", job))
+        self.assertEqual(len(calls), 3)
+
+    def test_resumed_paper_run_only_generates_unfinished_papers(self):
+        generated = []
+        failing = {"fineweb_full.wav"}
+
+        def fake_presentation(title, script, output, verbose=True):
+            if output in failing:
+                raise RuntimeError("quota exceeded")
+            generated.append(output)
+            save_wave_file(output, bytes(480))
+
+        with mock.patch.object(full_papers_generator, "create_full_paper_presentation", fake_presentation), \
+                redirect_stdout(io.StringIO()):
+            first = full_papers_generator.generate_all_papers(jobs=2, manifest=RunManifest("p.json"))
+            del generated[:]
+            failing.clear()
+            second = full_papers_generator.generate_all_papers(manifest=RunManifest("p.json"), resume=True)
+
+        self.assertFalse(first["fineweb"]["success"])
+        self.assertEqual(generated, ["fineweb_full.wav"])
+        self.assertTrue(all(result["success"] for result in second.values()))
+        self.assertEqual(sum(result["skipped"] for result in second.values()), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+import gemini_tts_example
+from audio_cache import set_default_cache
+from backends import FakeBackend, LatencyModel
+from metrics import synthesis_span
+from scheduler import PriorityClass, SynthesisScheduler, get_scheduler, priority, set_scheduler
+
+
+def _wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.001)
+
+
+class SchedulerTestCase(unittest.TestCase):
+    def queue(self, scheduler, name, cost, order):
+        def run():
+            with scheduler.slot(name, cost):
+                order.append(name)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        _wait_until(lambda: scheduler.stats()[name]["queued"] + scheduler.stats()[name]["granted"] >= 1)
+        return thread
+
+    def test_weighted_fair_queuing_serves_interactive_ahead_of_queued_bulk(self):
+        scheduler = SynthesisScheduler(max_concurrency=1)
+        order = []
+        blocker = scheduler.acquire("default")
+        threads = []
+        for _ in range(4):
+            threads.append(self.queue(scheduler, "bulk", 1000, order))
+            _wait_until(lambda: scheduler.stats()["bulk"]["queued"] == len(threads))
+        threads.append(self.queue(scheduler, "interactive", 100, order))
+        scheduler.release(blocker)
+        for thread in threads:
+            thread.join()
+        # Queued last, but its virtual start ties the first bulk chunk and its weight wins
+        self.assertEqual(order, ["interactive", "bulk", "bulk", "bulk", "bulk"])
+
+        stats = scheduler.stats()
+        self.assertEqual(stats["bulk"]["granted"], 4)
+        self.assertGreater(stats["bulk"]["wait_max_seconds"], stats["interactive"]["wait_max_seconds"])
+        self.assertEqual(stats["interactive"]["queued"], 0)
+
+    def test_per_class_limit_leaves_room_for_other_classes(self):
+        scheduler = SynthesisScheduler(
+            [PriorityClass("interactive", 8), PriorityClass("bulk", 1, max_concurrency=1)], max_concurrency=4
+        )
+        held = scheduler.acquire("bulk")
+        order = []
+        waiting = self.queue(scheduler, "bulk", 10, order)
+        self.assertEqual(scheduler.stats()["bulk"]["queued"], 1)
+
+        ticket = scheduler.acquire("interactive")
+        self.assertEqual(scheduler.stats()["interactive"]["in_flight"], 1)
+        scheduler.release(ticket)
+        scheduler.release(held)
+        waiting.join()
+        self.assertEqual(order, ["bulk"])
+        self.assertEqual(scheduler.in_flight, 0)
+
+    def test_try_acquire_takes_only_a_free_slot(self):
+        scheduler = SynthesisScheduler(
+            [PriorityClass("interactive", 8), PriorityClass("bulk", 1, max_concurrency=1)], max_concurrency=3
+        )
+        first = scheduler.try_acquire("bulk")
+        self.assertIsNotNone(first)
+        # The bulk cap is reached: bulk cannot take a slot, interactive can
+        self.assertIsNone(scheduler.try_acquire("bulk"))
+        waiter = self.queue(scheduler, "bulk", 1, [])
+        second = scheduler.try_acquire("interactive")
+        self.assertIsNotNone(second)
+        third = scheduler.acquire("interactive")
+        self.assertIsNone(scheduler.try_acquire("interactive"))
+        self.assertEqual(scheduler.stats()["interactive"]["queued"], 0)
+        for ticket in (first, second, third):
+            scheduler.release(ticket)
+        waiter.join()
+        self.assertEqual(scheduler.in_flight, 0)
+
+    def test_unknown_class_raises(self):
+        with self.assertRaises(ValueError):
+            SynthesisScheduler().acquire("urgent")
+
+    def test_cancelled_async_waiter_leaves_the_queue(self):
+        scheduler = SynthesisScheduler(max_concurrency=1)
+
+        async def scenario():
+            held = await scheduler.acquire_async("default")
+            waiter = asyncio.ensure_future(scheduler.acquire_async("bulk"))
+            await asyncio.sleep(0)
+            self.assertEqual(scheduler.stats()["bulk"]["queued"], 1)
+            waiter.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await waiter
+            scheduler.release(held)
+
+        asyncio.run(scenario())
+        self.assertEqual(scheduler.stats()["bulk"]["queued"], 0)
+        self.assertEqual(scheduler.in_flight, 0)
+
+    def test_interrupted_waiter_leaves_the_queue(self):
+        scheduler = SynthesisScheduler(max_concurrency=1)
+        held = scheduler.acquire("default")
+        with mock.patch.object(threading.Event, "wait", side_effect=KeyboardInterrupt), \
+                self.assertRaises(KeyboardInterrupt):
+            scheduler.acquire("bulk")
+        self.assertEqual(scheduler.stats()["bulk"]["queued"], 0)
+        scheduler.release(held)
+        self.assertEqual(scheduler.in_flight, 0)
+
+
+class ScheduledSynthesisTestCase(unittest.TestCase):
+    def setUp(self):
+        set_default_cache(None)
+        self.addCleanup(set_default_cache, None)
+        gemini_tts_example.set_backend(FakeBackend(latency=LatencyModel(base=0.0, per_char=0.0)))
+        self.addCleanup(gemini_tts_example.set_backend, None)
+        self.scheduler = SynthesisScheduler(max_concurrency=2)
+        set_scheduler(self.scheduler)
+        self.addCleanup(set_scheduler, None)
+
+    def test_chunked_workers_inherit_the_priority_class(self):
+        script = "\n".join(f"Narrator {i % 2 + 1}: Sentence number {i} of a long paper." for i in range(40))
+        with priority("bulk"):
+            _, report = gemini_tts_example.synthesize_chunked(
+                script, (("Narrator 1", "kore"), ("Narrator 2", "charon")), max_chars=200
+            )
+        stats = self.scheduler.stats()
+        self.assertGreater(len(report), 1)
+        self.assertEqual(stats["bulk"]["granted"], len(report))
+        self.assertEqual(stats["default"]["granted"], 0)
+
+    def test_async_synthesis_records_queue_phase(self):
+        with synthesis_span("test", "model", "kore", 5) as span:
+            with priority("interactive"):
+                asyncio.run(gemini_tts_example.synthesize_pcm_async("hello", "kore"))
+        self.assertEqual(self.scheduler.stats()["interactive"]["granted"], 1)
+        self.assertIn("queue", span.phases)
+
+    def test_default_scheduler_is_rebuilt_after_reset(self):
+        set_scheduler(None)
+        self.assertIsNot(get_scheduler(), self.scheduler)
+        self.assertEqual(set(get_scheduler().classes), {"interactive", "default", "bulk"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import errno
+import os
+import tempfile
+import unittest
+import wave
+from unittest import mock
+
+import gemini_tts_example
+from audio_cache import set_default_cache
+from backends import FakeBackend, LatencyModel
+from gemini_tts_example import PAPER_SPEAKERS, save_wave_file
+from postprocess import PostProcessor
+from spool import PCMSpool, copy_range
+
+
+def segment(index, size):
+    return bytes([index % 251]) * size
+
+
+class PCMSpoolTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def read(self, name):
+        with open(self.path(name), "rb") as f:
+            return f.read()
+
+    def test_matches_in_memory_write_with_out_of_order_segments(self):
+        segments = [segment(index, 1000 + 10 * index) for index in range(12)]
+        with PCMSpool(memory_budget=4000, directory=self.tmp.name) as spool:
+            for index in reversed(range(12)):
+                spool.put(index, segments[index])
+            self.assertLessEqual(spool.memory_bytes, 4000)
+            self.assertGreater(spool.spilled_segments, 0)
+            spool.write_wave(self.path("spooled.wav"))
+        save_wave_file(self.path("memory.wav"), b"".join(segments))
+        self.assertEqual(self.read("spooled.wav"), self.read("memory.wav"))
+
+    def test_zero_budget_spills_everything_and_pads_odd_sizes(self):
+        with PCMSpool(memory_budget=0, directory=self.tmp.name) as spool:
+            spool.put(0, b"\x01\x02\x03")
+            spool.put(1, memoryview(b"\x04\x05"))
+            written = spool.write_wave(self.path("odd.wav"))
+            stats = spool.stats()
+        self.assertEqual(written, 5)
+        self.assertEqual((stats["memory_bytes"], stats["spilled_segments"]), (0, 2))
+        self.assertTrue(self.read("odd.wav").endswith(b"\x01\x02\x03\x04\x05\x00"))
+
+    def test_duplicate_segment_raises(self):
+        with PCMSpool() as spool:
+            spool.put(0, b"\x00\x00")
+            with self.assertRaises(ValueError):
+                spool.put(0, b"\x00\x00")
+
+    def test_falls_back_when_kernel_copy_is_unsupported(self):
+        data = os.urandom(300_000)
+        with open(self.path("source"), "wb") as f:
+            f.write(data)
+
+        def unsupported(*args):
+            raise OSError(errno.EXDEV, "cross-device")
+
+        for patched, expected in (({"copy_file_range": unsupported}, "sendfile"),
+                                  ({"copy_file_range": unsupported, "sendfile": unsupported}, "read")):
+            with self.subTest(expected=expected), open(self.path("source"), "rb") as src, \
+                    open(self.path("copy"), "wb", buffering=0) as dst, mock.patch.multiple(os, **patched):
+                dst.write(b"head")
+                self.assertEqual(copy_range(src.fileno(), dst.fileno(), 1000, 250_000), expected)
+            self.assertEqual(self.read("copy"), b"head" + data[1000:251_000])
+
+
+class SpooledPresentationTestCase(unittest.TestCase):
+    def setUp(self):
+        set_default_cache(None)
+        self.addCleanup(set_default_cache, None)
+        gemini_tts_example.set_backend(FakeBackend(latency=LatencyModel(base=0.0)))
+        self.addCleanup(gemini_tts_example.set_backend, None)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_spooled_presentation_matches_in_memory_one(self):
+        names = [speaker["name"] for speaker in PAPER_SPEAKERS]
+        script = "\n".join(f"{names[i % 2]}: Part {i} of a very long reading." for i in range(60))
+        memory_file = os.path.join(self.tmp.name, "memory.wav")
+        spooled_file = os.path.join(self.tmp.name, "spooled.wav")
+
+        audio = gemini_tts_example.create_full_paper_presentation(
+            "Paper", script, memory_file, verbose=False, max_chunk_chars=300, postprocess=False, memory_budget=False
+        )
+        self.assertIsNotNone(audio)
+        result = gemini_tts_example.create_full_paper_presentation(
+            "Paper", script, spooled_file, verbose=False, max_chunk_chars=300, postprocess=False, memory_budget=0
+        )
+        self.assertIsNone(result)
+        with open(memory_file, "rb") as a, open(spooled_file, "rb") as b:
+            self.assertEqual(a.read(), b.read())
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ["memory.wav", "spooled.wav"])
+
+    def test_spooled_presentation_post_processes_file_to_file(self):
+        names = [speaker["name"] for speaker in PAPER_SPEAKERS]
+        script = "\n".join(f"{names[i % 2]}: Part {i} of a long reading." for i in range(20))
+        output = os.path.join(self.tmp.name, "processed.wav")
+        gemini_tts_example.create_full_paper_presentation(
+            "Paper", script, output, verbose=False, max_chunk_chars=300, postprocess=PostProcessor(),
+            memory_budget=0,
+        )
+        with wave.open(output, "rb") as wav:
+            self.assertGreater(wav.getnframes(), 0)
+        # The intermediate WAV is removed
+        self.assertEqual(os.listdir(self.tmp.name), ["processed.wav"])
+
+
+if __name__ == "__main__":
+    unittest.main()
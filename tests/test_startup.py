@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+CLI_MODULES = ["full_papers_generator", "multi_speaker_demo", "academic_papers_demo", "tts_server", "planner"]
+# Cumulative import time allowed per CLI module; the SDK alone takes several times this
+IMPORT_BUDGET_US = 250_000
+
+
+def _run_python(*args):
+    env = dict(os.environ)
+    env.pop("GEMINI_API_KEY", None)
+    env["PYTHONPATH"] = os.path.abspath(ROOT)
+    # Run elsewhere so cache directories are not created in the checkout
+    with tempfile.TemporaryDirectory() as cwd:
+        return subprocess.run(
+            [sys.executable, *args], cwd=cwd, env=env, capture_output=True, text=True, check=True
+        )
+
+
+def parse_importtime(stderr):
+    """Return module -> cumulative import time in microseconds from -X importtime output."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class StartupTestCase(unittest.TestCase):
+    def test_cli_imports_skip_the_sdk_and_stay_within_budget(self):
+        for module in CLI_MODULES:
+            with self.subTest(module=module):
+                times = parse_importtime(_run_python("-X", "importtime", "-c", f"import {module}").stderr)
+                self.assertFalse([name for name in times if name.startswith("google")])
+                self.assertLess(times[module], IMPORT_BUDGET_US)
+
+    def test_light_cli_paths_never_import_the_sdk(self):
+        check = (
+            "import sys, full_papers_generator; "
+            "sys.argv = ['full_papers_generator.py', '--all', '--plan']; "
+            "full_papers_generator.main(); "
+            "sys.argv = ['full_papers_generator.py', '--list']; "
+            "full_papers_generator.main(); "
+            "assert 'google.genai' not in sys.modules"
+        )
+        result = _run_python("-c", check)
+        self.assertIn("Available Papers", result.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
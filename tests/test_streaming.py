@@ -0,0 +1,61 @@
+import io
+import os
+import tempfile
+import unittest
+import wave
+from types import SimpleNamespace
+from unittest import mock
+
+import gemini_tts_example
+from wav_writer import IncrementalWavWriter
+
+
+def _response(data):
+    part = SimpleNamespace(inline_data=SimpleNamespace(data=data))
+    return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+
+
+class _NonSeekable(io.BytesIO):
+    def seekable(self):
+        return False
+
+
+class StreamingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_header_patched_on_close(self):
+        path = os.path.join(self.tmp.name, "out.wav")
+        with IncrementalWavWriter(path) as writer:
+            writer.write(b"\x01\x00" * 100)
+            writer.write(memoryview(b"\x02\x00" * 50))
+        with wave.open(path, "rb") as wf:
+            self.assertEqual(wf.getnframes(), 150)
+            self.assertEqual(wf.getframerate(), 24000)
+            self.assertEqual(wf.readframes(150), b"\x01\x00" * 100 + b"\x02\x00" * 50)
+
+    def test_non_seekable_target_keeps_streaming_header(self):
+        sink = _NonSeekable()
+        writer = IncrementalWavWriter(sink)
+        writer.write(b"\x00\x00" * 10)
+        writer.close()
+        self.assertEqual(sink.getvalue()[40:44], b"\xff\xff\xff\xff")
+        self.assertEqual(len(sink.getvalue()), 44 + 20)
+
+    def test_stream_to_wave_file(self):
+        chunks = [b"\x01\x00" * 240, b"\x02\x00" * 240, b"\x03\x00" * 240]
+        models = SimpleNamespace(generate_content_stream=lambda **kwargs: iter(map(_response, chunks)))
+        path = os.path.join(self.tmp.name, "stream.wav")
+        seen = []
+        with mock.patch.object(gemini_tts_example, "get_client", return_value=SimpleNamespace(models=models)):
+            stats = gemini_tts_example.stream_to_wave_file("hello", "kore", path, on_chunk=seen.append)
+        self.assertEqual(seen, chunks)
+        self.assertEqual(stats["bytes"], 1440)
+        self.assertAlmostEqual(stats["duration"], 0.03)
+        with wave.open(path, "rb") as wf:
+            self.assertEqual(wf.readframes(720), b"".join(chunks))
+
+
+if __name__ == "__main__":
+    unittest.main()
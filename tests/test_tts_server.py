@@ -0,0 +1,112 @@
+import http.client
+import json
+import threading
+import unittest
+import urllib.error
+import urllib.request
+
+import gemini_tts_example
+from audio_cache import set_default_cache
+from backends import FakeBackend, LatencyModel
+from tts_server import MAX_BODY_BYTES, SynthesisService, TTSServer
+
+
+def _post(url, payload):
+    request = urllib.request.Request(
+        f"{url}/synthesize", data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), e.read()
+
+
+class TTSServerTestCase(unittest.TestCase):
+    def start(self, latency=0.2, **service_kwargs):
+        set_default_cache(None)
+        self.addCleanup(set_default_cache, None)
+        self.backend = FakeBackend(latency=LatencyModel(base=latency, distribution="fixed"))
+        gemini_tts_example.set_backend(self.backend)
+        self.addCleanup(gemini_tts_example.set_backend, None)
+        server = TTSServer(("127.0.0.1", 0), SynthesisService(**service_kwargs), log_requests=False)
+        server.start_background()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def _concurrent(self, url, payloads):
+        results = [None] * len(payloads)
+
+        def worker(index):
+            results[index] = _post(url, payloads[index])
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(payloads))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_identical_in_flight_requests_share_one_upstream_call(self):
+        server = self.start()
+        results = self._concurrent(server.url, [{"text": "Welcome back!", "voice": "kore"}] * 8)
+
+        self.assertTrue(all(status == 200 for status, _, _ in results))
+        self.assertEqual(len({body for _, _, body in results}), 1)
+        self.assertTrue(results[0][2].startswith(b"RIFF"))
+        self.assertEqual(self.backend.stats()["requests"], 1)
+        self.assertEqual(sum(headers["X-TTS-Coalesced"] == "1" for _, headers, _ in results), 7)
+        self.assertEqual(server.service.stats()["coalesced"], 7)
+
+    def test_full_queue_is_rejected_with_503(self):
+        server = self.start(max_workers=1, max_queue=1)
+        results = self._concurrent(server.url, [{"text": f"Request {i}"} for i in range(6)])
+
+        statuses = sorted(status for status, _, _ in results)
+        self.assertIn(503, statuses)
+        self.assertGreaterEqual(statuses.count(200), 2)
+        rejected = [headers for status, headers, _ in results if status == 503]
+        self.assertEqual(rejected[0]["Retry-After"], "1")
+        self.assertEqual(server.service.stats()["in_progress"], 0)
+
+    def test_streamed_pcm_and_bad_requests(self):
+        server = self.start(latency=0.0)
+        payload = {"text": "Alice: Hi!\nBob: Hello!", "format": "pcm", "stream": True,
+                   "speakers": [{"name": "Alice", "voice": "kore"}, {"name": "Bob", "voice": "puck"}]}
+        status, headers, body = _post(server.url, payload)
+
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Transfer-Encoding"], "chunked")
+        self.assertEqual(len(body), self.backend.audio_bytes_for(payload["text"]))
+        prose = dict(payload, text="Read this warmly: Alice: Step 1: buy bread.\nBob: ok", stream=False)
+        self.assertEqual(_post(server.url, prose)[0], 200)
+        self.assertEqual(_post(server.url, dict(prose, text="Alice: hi\nCarol: yo"))[0], 400)
+        self.assertEqual(_post(server.url, {"text": ""})[0], 400)
+        self.assertEqual(_post(server.url, {"text": "hi", "format": "mp3"})[0], 400)
+
+    def test_malformed_fields_and_lengths_get_a_response(self):
+        server = self.start(latency=0.0)
+        for payload in (
+            {"text": "A: hi\nB: yo", "speakers": [{"name": "A"}, {"name": "B"}]},
+            {"text": "A: hi\nB: yo", "speakers": "AB"},
+            {"text": "hi", "style": ["calm"]},
+            {"text": "hi", "model": 3},
+        ):
+            with self.subTest(payload=payload):
+                self.assertEqual(_post(server.url, payload)[0], 400)
+
+        for length, expected in (("-1", 400), (str(MAX_BODY_BYTES + 1), 413)):
+            with self.subTest(length=length):
+                connection = http.client.HTTPConnection(server.server_address[0], server.server_address[1], timeout=5)
+                connection.putrequest("POST", "/synthesize")
+                connection.putheader("Content-Length", length)
+                connection.endheaders()
+                response = connection.getresponse()
+                self.assertEqual(response.status, expected)
+                connection.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
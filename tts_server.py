@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Local HTTP synthesis service.
+
+POST /synthesize with a JSON body:
+
+    {"text": "Hello!", "voice": "kore"}
+    {"text": "Alice: Hi!\\nBob: Hello!", "speakers": [{"name": "Alice", "voice": "kore"},
+                                                     {"name": "Bob", "voice": "puck"}]}
+
+Optional fields: "style" (prepended to the text), "model", "format"
+("wav" or "pcm") and "stream" (true to send chunks as they are generated,
+using chunked transfer encoding). GET /health returns counters as JSON,
+including per-key usage when several API keys are pooled.
+
+Identical requests that arrive while one is already being synthesized share
+that single upstream call (single-flight). At most max_workers upstream
+calls run at once, at most max_queue more wait for a worker, and anything
+beyond that is rejected with 503 and Retry-After instead of piling up.
+Streamed requests are never coalesced but still take a worker.
+
+Upstream calls run in the scheduler's "interactive" priority class (see
+scheduler.py), so they are served ahead of bulk batches sharing the
+process; /health includes the per-class queue waits. With --hedge, calls
+slower than the recent p95 latency are hedged with a duplicate request
+(see hedging.py) and /health reports hedges fired and won.
+
+Usage:
+    python tts_server.py [--port 8080] [--workers 8] [--queue 32]
+    GEMINI_TTS_BACKEND=fake python tts_server.py   # no API key needed
+"""
+
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from audio_cache import cache_key
+from dialogue_model import Dialogue
+from hedging import resolve_hedger
+from key_pool import get_key_pool
+from scheduler import get_scheduler, priority
+from gemini_tts_example import (
+    DEFAULT_MODEL,
+    _validate_speakers,
+    require_credentials,
+    speaker_voices,
+    stream_pcm,
+    synthesize_pcm,
+)
+from wav_writer import IncrementalWavWriter, wav_header
+
+
+DEFAULT_MAX_CHARS = 5000
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class PayloadTooLarge(ValueError):
+    """Raised when a request body exceeds MAX_BODY_BYTES."""
+
+
+def _check_speakers(speakers):
+    """Raise ValueError unless speakers is a list of {"name": str, "voice": str} objects."""
+    if not isinstance(speakers, list):
+        raise ValueError("'speakers' must be a list")
+    for speaker in speakers:
+        if not isinstance(speaker, dict) or not all(
+            isinstance(speaker.get(field), str) and speaker[field] for field in ("name", "voice")
+        ):
+            raise ValueError("Each speaker must be an object with string 'name' and 'voice'")
+
+
+class Overloaded(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+
+class AdmissionControl:
+    """Bounded worker concurrency with a bounded wait queue."""
+
+    def __init__(self, max_workers=8, max_queue=32):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._slots = threading.Semaphore(max_workers)
+        self._lock = threading.Lock()
+        self.admitted = 0
+
+    def acquire(self):
+        """Wait for a worker, or raise Overloaded if too many callers are already waiting."""
+        with self._lock:
+            if self.admitted >= self.max_workers + self.max_queue:
+                raise Overloaded(f"{self.admitted} requests in progress or queued")
+            self.admitted += 1
+        self._slots.acquire()
+
+    def release(self):
+        self._slots.release()
+        with self._lock:
+            self.admitted -= 1
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Collapse identical concurrent calls into one."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        """
+        Run func() once per key at a time; concurrent callers with the same key wait for it.
+
+        Returns:
+            tuple: (result, shared) where shared is True for callers that joined
+                   a call started by someone else
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+
+class SynthesisService:
+    """Request parsing, coalescing and admission control, independent of HTTP."""
+
+    def __init__(self, model=DEFAULT_MODEL, max_workers=8, max_queue=32, max_chars=DEFAULT_MAX_CHARS,
+                 priority_class="interactive", hedge=False):
+        """
+        Args:
+            model (str): Default TTS model
+            max_workers (int): Upstream calls allowed at once
+            max_queue (int): Calls allowed to wait for a worker before 503s
+            max_chars (int): Longest accepted text
+            priority_class (str): Scheduler priority class of upstream calls
+            hedge (bool | Hedger): Hedge slow upstream calls (see hedging.py)
+        """
+        self.model = model
+        self.priority_class = priority_class
+        self.hedger = resolve_hedger(hedge)
+        self.max_chars = max_chars
+        self.admission = AdmissionControl(max_workers, max_queue)
+        self.flights = SingleFlight()
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "upstream_calls": 0, "coalesced": 0, "rejected": 0, "errors": 0}
+
+    def count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+        stats.update(
+            in_progress=self.admission.admitted,
+            max_workers=self.admission.max_workers,
+            max_queue=self.admission.max_queue,
+            keys=get_key_pool().stats(),
+            scheduler=get_scheduler().stats(),
+        )
+        if self.hedger:
+            stats["hedging"] = self.hedger.stats()
+        return stats
+
+    def parse(self, body):
+        """
+        Turn a request body into (contents, voices, model).
+
+        Raises:
+            ValueError: If the request is malformed
+        """
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object")
+        text = body.get("text")
+        if not isinstance(text, str) or not text.strip():
+            raise ValueError("'text' must be a non-empty string")
+        if len(text) > self.max_chars:
+            raise ValueError(f"'text' is longer than {self.max_chars} characters")
+        if body.get("speakers") is not None:
+            _check_speakers(body["speakers"])
+            _validate_speakers(body["speakers"])
+            text = Dialogue.for_speakers(text, body["speakers"]).to_text()
+            voices = speaker_voices(body["speakers"])
+        else:
+            voices = body.get("voice", "kore")
+            if not isinstance(voices, str):
+                raise ValueError("'voice' must be a string")
+        style = body.get("style")
+        if style is not None and not isinstance(style, str):
+            raise ValueError("'style' must be a string")
+        model = body.get("model")
+        if model is not None and not isinstance(model, str):
+            raise ValueError("'model' must be a string")
+        contents = f"{style} {text}" if style else text
+        return contents, voices, model or self.model
+
+    def _upstream(self, contents, voices, model):
+        self.admission.acquire()
+        try:
+            self.count("upstream_calls")
+            with priority(self.priority_class):
+                return synthesize_pcm(contents, voices, model, hedge=self.hedger)
+        finally:
+            self.admission.release()
+
+    def synthesize(self, contents, voices, model):
+        """
+        Synthesize PCM, sharing the upstream call with identical in-flight requests.
+
+        Returns:
+            tuple: (pcm, shared)
+        """
+        key = cache_key(model, contents, voices)
+        audio, shared = self.flights.do(key, lambda: self._upstream(contents, voices, model))
+        if shared:
+            self.count("coalesced")
+        return audio, shared
+
+    def stream(self, contents, voices, model):
+        """Yield PCM chunks from one uncoalesced upstream stream, holding a worker throughout."""
+        self.admission.acquire()
+        try:
+            self.count("upstream_calls")
+            with priority(self.priority_class):
+                yield from stream_pcm(contents, voices, model)
+        finally:
+            self.admission.release()
+
+
+class _ChunkedWriter:
+    """File-like wrapper that frames writes with HTTP/1.1 chunked transfer encoding."""
+
+    def __init__(self, wfile):
+        self._wfile = wfile
+
+    def write(self, data):
+        if len(data):
+            self._wfile.write(f"{len(data):X}\r\n".encode("ascii"))
+            self._wfile.write(data)
+            self._wfile.write(b"\r\n")
+
+    def flush(self):
+        self._wfile.flush()
+
+    def seekable(self):
+        return False
+
+    def close(self):
+        self._wfile.write(b"0\r\n\r\n")
+        self._wfile.flush()
+
+
+class TTSRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "GeminiTTS/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.log_requests:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, self.server.service.stats())
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        service = self.server.service
+        if self.path != "/synthesize":
+            self._send_json(404, {"error": "not found"})
+            return
+        service.count("requests")
+        body_read = False
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if length < 0:
+                raise ValueError("Invalid Content-Length")
+            if length > MAX_BODY_BYTES:
+                raise PayloadTooLarge(f"Request body is larger than {MAX_BODY_BYTES} bytes")
+            data = self.rfile.read(length)
+            body_read = True
+            body = json.loads(data or b"null")
+            contents, voices, model = service.parse(body)
+            audio_format = body.get("format", "wav")
+            if audio_format not in ("wav", "pcm"):
+                raise ValueError("'format' must be 'wav' or 'pcm'")
+        except ValueError as e:
+            if not body_read:
+                # The body was never read, so the connection cannot be reused
+                self.close_connection = True
+            self._send_json(413 if isinstance(e, PayloadTooLarge) else 400, {"error": str(e)})
+            return
+
+        try:
+            if body.get("stream"):
+                self._stream(service, contents, voices, model, audio_format)
+                return
+            audio, shared = service.synthesize(contents, voices, model)
+        except Overloaded as e:
+            service.count("rejected")
+            self._send_json(503, {"error": f"Server busy: {e}"}, {"Retry-After": "1"})
+            return
+        except Exception as e:
+            service.count("errors")
+            self._send_json(502, {"error": f"Synthesis failed: {e}"})
+            return
+
+        header = wav_header(len(audio)) if audio_format == "wav" else b""
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/wav" if audio_format == "wav" else "audio/pcm")
+        self.send_header("Content-Length", str(len(header) + len(audio)))
+        self.send_header("X-TTS-Coalesced", "1" if shared else "0")
+        self.end_headers()
+        self.wfile.write(header)
+        self.wfile.write(audio)
+
+    def _stream(self, service, contents, voices, model, audio_format):
+        chunks = service.stream(contents, voices, model)
+        # Pull the first chunk before committing to a 200, so overload and
+        # upstream errors still get a proper status code
+        first = next(chunks, b"")
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/wav" if audio_format == "wav" else "audio/pcm")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        target = _ChunkedWriter(self.wfile)
+        try:
+            if audio_format == "wav":
+                # Sizes stay at the streaming placeholder; players read to the end of the stream
+                with IncrementalWavWriter(target) as writer:
+                    writer.write(first)
+                    for chunk in chunks:
+                        writer.write(chunk)
+            else:
+                target.write(first)
+                for chunk in chunks:
+                    target.write(chunk)
+        except Exception as e:
+            service.count("errors")
+            # Headers are out; dropping the connection is the only way to signal failure
+            self.close_connection = True
+            self.log_error("stream failed: %s", e)
+            return
+        target.close()
+
+
+class TTSServer(ThreadingHTTPServer):
+    """Threaded HTTP server bound to one SynthesisService."""
+
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 8080), service=None, log_requests=True):
+        self.service = service or SynthesisService()
+        self.log_requests = log_requests
+        super().__init__(address, TTSRequestHandler)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start_background(self):
+        """Serve from a daemon thread (e.g. in tests); stop with shutdown()."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Gemini TTS HTTP service")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Port (default: 8080)")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent upstream calls (default: 8)")
+    parser.add_argument("--queue", type=int, default=32,
+                        help="Requests allowed to wait for a worker before 503s (default: 32)")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help=f"TTS model (default: {DEFAULT_MODEL})")
+    parser.add_argument("--hedge", action="store_true",
+                        help="Send a duplicate request when a call runs past the recent p95 latency")
+    args = parser.parse_args()
+
+    try:
+        require_credentials()
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return
+
+    service = SynthesisService(args.model, args.workers, args.queue, hedge=args.hedge)
+    server = TTSServer((args.host, args.port), service)
+    hedging = ", hedging" if args.hedge else ""
+    print(f"🌐 Serving TTS on {server.url} ({args.workers} workers, queue {args.queue}{hedging})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
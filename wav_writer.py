@@ -0,0 +1,111 @@
+"""Incremental WAV writer for audio that arrives in chunks."""
+
+import struct
+
+
+_HEADER_SIZE = 44
+# Placeholder size used while streaming; also what non-seekable sinks keep
+_UNKNOWN_SIZE = 0xFFFFFFFF
+
+
+def wav_header(data_size, channels=1, rate=24000, sample_width=2):
+    """
+    Build a canonical 44-byte PCM WAV header.
+
+    Args:
+        data_size (int): Size of the data chunk in bytes
+        channels (int): Number of audio channels
+        rate (int): Sample rate in Hz
+        sample_width (int): Sample width in bytes
+
+    Returns:
+        bytes: RIFF/WAVE header
+    """
+    block_align = channels * sample_width
+    riff_size = _UNKNOWN_SIZE if data_size == _UNKNOWN_SIZE else 36 + data_size + data_size % 2
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", riff_size, b"WAVE",
+        b"fmt ", 16, 1, channels, rate, rate * block_align, block_align, sample_width * 8,
+        b"data", data_size,
+    )
+
+
+class IncrementalWavWriter:
+    """
+    WAV sink that appends PCM frames as they arrive.
+
+    The header is written up front with placeholder sizes and patched with
+    the real RIFF and data sizes on close. Non-seekable targets (pipes,
+    sockets, upload streams) keep the placeholder sizes, which most players
+    treat as "read until end of stream".
+
+    Usage:
+        with IncrementalWavWriter("out.wav") as writer:
+            for chunk in stream_pcm(...):
+                writer.write(chunk)
+    """
+
+    def __init__(self, target, channels=1, rate=24000, sample_width=2, flush_each_write=True):
+        """
+        Args:
+            target (str | file): Output filename, or a binary file object
+            channels (int): Number of audio channels
+            rate (int): Sample rate in Hz
+            sample_width (int): Sample width in bytes
+            flush_each_write (bool): Flush after every chunk so readers see audio immediately
+        """
+        if isinstance(target, (str, bytes)) or hasattr(target, "__fspath__"):
+            self._file = open(target, "wb")
+            self._owns_file = True
+        else:
+            self._file = target
+            self._owns_file = False
+        self.channels = channels
+        self.rate = rate
+        self.sample_width = sample_width
+        self.flush_each_write = flush_each_write
+        self.bytes_written = 0
+        self.closed = False
+        self._file.write(wav_header(_UNKNOWN_SIZE, channels, rate, sample_width))
+
+    @property
+    def duration(self):
+        """Seconds of audio written so far."""
+        return self.bytes_written / (self.rate * self.channels * self.sample_width)
+
+    def write(self, pcm_chunk):
+        """Append raw PCM bytes (any bytes-like object)."""
+        if self.closed:
+            raise ValueError("write to closed IncrementalWavWriter")
+        self._file.write(pcm_chunk)
+        self.bytes_written += len(memoryview(pcm_chunk).cast("B"))
+        if self.flush_each_write:
+            self._file.flush()
+
+    def close(self):
+        """Patch the header sizes (when the target is seekable) and close it."""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            data_size = self.bytes_written
+            if data_size % 2:
+                # RIFF chunks are word aligned
+                self._file.write(b"\x00")
+            seekable = getattr(self._file, "seekable", lambda: False)()
+            if seekable:
+                end = self._file.tell()
+                self._file.seek(0)
+                self._file.write(wav_header(data_size, self.channels, self.rate, self.sample_width))
+                self._file.seek(end)
+            self._file.flush()
+        finally:
+            if self._owns_file:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()